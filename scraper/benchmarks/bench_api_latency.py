@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark da latência dos handlers assíncronos sob carga mista
+
+Compara handlers que chamam o Database direto no event loop (comportamento
+anterior da API) com handlers que usam o AsyncDatabase. Clientes concorrentes
+listam conteúdos completos (consulta pesada), uma escritora grava lotes e uma
+sonda mede a latência de um handler trivial como /health. Os handlers rodam
+no mesmo event loop, como no uvicorn, em um banco temporário. No modo
+bloqueante a latência da listagem não inclui a espera na fila do loop, que
+aparece na sonda.
+
+Uso: python benchmarks/bench_api_latency.py [segundos] [clientes] [linhas]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.async_database import AsyncDatabase
+from models.database import Database
+from models.scraper import ScrapedContent
+
+def make_contents(prefix: str, count: int):
+    return [
+        ScrapedContent(
+            title=f"Artigo {prefix}/{i}",
+            url=f"https://blog.exemplo.com/{prefix}/{i}",
+            content_text="Texto do artigo. " * 400,
+            source_type="blog"
+        )
+        for i in range(count)
+    ]
+
+def percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+async def run(db: Database, adb: AsyncDatabase, use_facade: bool, seconds: float, clients: int):
+    """Executar a carga e retornar (latências da sonda, latências da listagem, gravações)"""
+
+    # Handlers equivalentes aos da API (get_client_contents, /health, gravação do scraper)
+    async def contents_handler():
+        if use_facade:
+            return await adb.get_contents_page("client_bench", 200)
+        return db.get_contents_page("client_bench", 200)
+
+    async def health_handler():
+        return {"status": "healthy"}
+
+    async def write_handler(batch):
+        if use_facade:
+            return await adb.save_contents_bulk(batch, "source_bench", "client_bench")
+        return db.save_contents_bulk(batch, "source_bench", "client_bench")
+
+    probe, listing = [], []
+    writes = 0
+    stop = time.perf_counter() + seconds
+
+    async def lister():
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            await contents_handler()
+            listing.append(time.perf_counter() - start)
+            await asyncio.sleep(0)
+
+    async def writer():
+        nonlocal writes
+        i = 0
+        while time.perf_counter() < stop:
+            await write_handler(make_contents(f"w{int(use_facade)}/{i}", 20))
+            writes += 20
+            i += 1
+            await asyncio.sleep(0.01)
+
+    async def prober():
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            # Tempo até o handler ser agendado e responder (fila do event loop incluída)
+            await asyncio.create_task(health_handler())
+            probe.append(time.perf_counter() - start)
+            await asyncio.sleep(0.005)
+
+    await asyncio.gather(prober(), writer(), *(lister() for _ in range(clients)))
+    return probe, listing, writes
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    rows = int(sys.argv[3]) if len(sys.argv) > 3 else 3000
+
+    # Os logs de cada gravação distorceriam a medição
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_PATH"] = str(Path(tmp) / "bench.db")
+        db = Database()
+        db.save_contents_bulk(make_contents("seed", rows), "source_bench", "client_bench")
+        adb = AsyncDatabase(db)
+
+        print(f"{seconds:.0f}s, {clients} clientes listando 200 conteúdos, 1 escritora, {rows} linhas iniciais")
+        for name, use_facade in (("Database no event loop", False), ("AsyncDatabase (pool)", True)):
+            probe, listing, writes = asyncio.run(run(db, adb, use_facade, seconds, clients))
+            print(
+                f"{name:24} /health p50 {percentile(probe, 0.5):7.1f}ms p99 {percentile(probe, 0.99):7.1f}ms | "
+                f"listagem p50 {percentile(listing, 0.5):7.1f}ms p99 {percentile(listing, 0.99):7.1f}ms "
+                f"{len(listing) / seconds:6.1f}/s | {writes / seconds:6.1f} gravações/s"
+            )
+        adb.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark do banco sob carga concorrente: leituras da API x gravações do scraper
+
+Compara o Database antigo (conexão nova por chamada, journal de rollback)
+com as conexões persistentes por thread em WAL. Threads escritoras gravam
+conteúdos com save_content enquanto threads leitoras listam conteúdos com
+get_contents_by_client, durante um tempo fixo, em um banco temporário.
+
+Uso: python benchmarks/bench_database.py [segundos] [escritoras] [leitoras]
+"""
+
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.database import Database
+from models.scraper import ScrapedContent
+
+class PerCallDatabase(Database):
+    """Comportamento anterior: uma conexão aberta e fechada a cada chamada"""
+
+    @contextmanager
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+def make_content(key: str) -> ScrapedContent:
+    return ScrapedContent(
+        title=f"Artigo {key}",
+        url=f"https://blog.exemplo.com/{key}",
+        content_text="Texto do artigo. " * 200,
+        source_type="blog"
+    )
+
+def seed(db: Database, count: int):
+    """Popular o banco antes da medição (o custo das leituras cresce com a tabela)"""
+    for i in range(count):
+        db.save_content(make_content(f"seed/{i}"), "source_bench", "client_bench")
+
+def run(db: Database, seconds: float, writers: int, readers: int):
+    """Executar a carga e retornar (gravações/s, leituras/s, erros)"""
+    counts = {'writes': 0, 'reads': 0, 'errors': 0}
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def writer(n: int):
+        i = 0
+        while time.perf_counter() < stop:
+            try:
+                db.save_content(make_content(f"{n}/{i}"), "source_bench", "client_bench")
+                key = 'writes'
+            except sqlite3.Error:
+                key = 'errors'
+            with lock:
+                counts[key] += 1
+            i += 1
+
+    def reader():
+        while time.perf_counter() < stop:
+            try:
+                db.get_contents_by_client("client_bench", limit=20)
+                key = 'reads'
+            except sqlite3.Error:
+                key = 'errors'
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts['writes'] / seconds, counts['reads'] / seconds, counts['errors']
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    # Os logs de cada gravação distorceriam a medição
+    logging.disable(logging.INFO)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, journal_mode, factory in (
+            ("Conexão por chamada (DELETE)", "DELETE", PerCallDatabase),
+            ("Persistente por thread (WAL)", "WAL", Database),
+        ):
+            os.environ["DATABASE_PATH"] = str(Path(tmp) / f"{journal_mode.lower()}.db")
+            os.environ["DB_JOURNAL_MODE"] = journal_mode
+            db = factory()
+            seed(db, 5000)
+            results[name] = run(db, seconds, writers, readers)
+            db.close()
+
+    print(f"{seconds:.0f}s, {writers} escritoras, {readers} leitoras")
+    for name, (writes, reads, errors) in results.items():
+        print(f"{name:30} {writes:8.1f} gravações/s {reads:9.1f} leituras/s {errors:5d} erros")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark do parser de datas
+
+Compara o parser antigo do WebScraper (regexes em sequência + dateutil)
+com utils.dates sobre strings de data no formato encontrado nas nossas fontes.
+
+Uso: python benchmarks/bench_dates.py [repetições]
+"""
+
+import re
+import sys
+import timeit
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.dates import DateParser
+
+# (domínio, string de data) como aparecem em meta tags, atributos datetime e feeds
+SAMPLES = [
+    ("g1.globo.com", "2024-03-12T10:30:00.000Z"),
+    ("g1.globo.com", "2024-03-12T13:05:41.374Z"),
+    ("www1.folha.uol.com.br", "12.mar.2024 às 10h30"),
+    ("www1.folha.uol.com.br", "5.fev.2024 às 7h02"),
+    ("www.estadao.com.br", "12 de março de 2024 | 10h30"),
+    ("www.estadao.com.br", "1º de abril de 2024 | 08h15"),
+    ("exame.com", "2024-03-12T10:30:00-03:00"),
+    ("www.infomoney.com.br", "12/03/2024 10h30"),
+    ("www.infomoney.com.br", "28/02/2024 18:45"),
+    ("feeds.feedburner.com", "Tue, 12 Mar 2024 10:30:00 -0300"),
+    ("feeds.feedburner.com", "Wed, 13 Mar 2024 08:00:00 GMT"),
+    ("techcrunch.com", "March 12, 2024"),
+    ("techcrunch.com", "2024-03-12T10:30:00+00:00"),
+    ("medium.com", "Mar 12, 2024"),
+    ("blog.wordpress.com", "2024/03/12"),
+    ("www.meioemensagem.com.br", "12 de março de 2024"),
+]
+
+def legacy_parse(date_str):
+    """Cópia do WebScraper._parse_date original"""
+    date_patterns = [
+        r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}',
+        r'\d{4}/\d{2}/\d{2}',
+        r'\d{2}/\d{2}/\d{4}',
+        r'\d{2}-\d{2}-\d{4}',
+        r'\w+ \d{1,2}, \d{4}',
+    ]
+
+    for pattern in date_patterns:
+        match = re.search(pattern, date_str)
+        if match:
+            try:
+                from dateutil.parser import parse
+                return parse(match.group())
+            except Exception:
+                continue
+
+    return None
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    parser = DateParser()
+
+    print(f"{'Amostra':<40} {'Antigo':<28} {'Novo'}")
+    print("-" * 100)
+    for domain, sample in SAMPLES:
+        old = legacy_parse(sample)
+        new = parser.parse(sample, domain)
+        print(f"{sample:<40} {str(old):<28} {new}")
+
+    parsed_old = sum(1 for _, sample in SAMPLES if legacy_parse(sample))
+    parsed_new = sum(1 for domain, sample in SAMPLES if parser.parse(sample, domain))
+
+    old_time = timeit.timeit(
+        lambda: [legacy_parse(sample) for _, sample in SAMPLES], number=repetitions
+    )
+    new_time = timeit.timeit(
+        lambda: [parser.parse(sample, domain) for domain, sample in SAMPLES], number=repetitions
+    )
+
+    total = repetitions * len(SAMPLES)
+    print("-" * 100)
+    print(f"Reconhecidas: antigo {parsed_old}/{len(SAMPLES)}, novo {parsed_new}/{len(SAMPLES)}")
+    print(f"Antigo: {old_time / total * 1e6:8.2f} µs/data")
+    print(f"Novo:   {new_time / total * 1e6:8.2f} µs/data ({old_time / new_time:.1f}x)")
+    print(f"Estatísticas: {parser.get_stats()}")
+
+if __name__ == "__main__":
+    main()
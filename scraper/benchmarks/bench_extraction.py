@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark da extração de artigos: threads x pool de processos
+
+Simula o pipeline do ScraperManager com o download já feito: N threads
+"fetchers" entregam HTML para extração, que roda na própria thread (GIL)
+ou no pool de processos de processors.extraction.
+
+Uso: python benchmarks/bench_extraction.py [páginas] [threads]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from processors.extraction import extract_page, get_extraction_pool, run_in_pool, shutdown_extraction_pool
+from scrapers.web_scraper import WebScraper
+
+def make_page(i: int) -> bytes:
+    """Página de artigo com estrutura típica de blog (~60 KB)"""
+    paragraphs = "".join(
+        f"<p>Parágrafo {j} do artigo {i}, com <a href='/tag/{j}'>links</a> e <strong>ênfase</strong>.</p>"
+        for j in range(400)
+    )
+    return f"""<html><head>
+        <title>Artigo {i} - Blog</title>
+        <meta name="description" content="Resumo do artigo {i}">
+        <meta name="keywords" content="marketing, conteúdo, seo">
+        <meta property="article:published_time" content="2024-03-12T10:30:00Z">
+    </head><body>
+        <header><nav>{"<a href='/'>menu</a>" * 50}</nav></header>
+        <article><h1 class="entry-title">Artigo número {i} do blog</h1>
+        <div class="entry-content">{paragraphs}</div></article>
+        <aside class="sidebar">{"<li>item</li>" * 100}</aside>
+        <footer>rodapé</footer>
+    </body></html>""".encode()
+
+def run_threads(pages, threads: int, extract) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda item: extract(*item), pages))
+    elapsed = time.perf_counter() - start
+    assert all(results), "extração falhou"
+    return elapsed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    pages = [(make_page(i), f"https://blog.exemplo.com/post/{i}") for i in range(count)]
+    scraper = WebScraper()
+
+    # Aquecer o pool (spawn dos workers e imports) fora da medição
+    pool = get_extraction_pool()
+    list(pool.map(extract_page, [pages[0][0]] * pool._max_workers, [pages[0][1]] * pool._max_workers))
+
+    local_time = run_threads(pages, threads, lambda html, url: scraper._extract_article_dict(html, url, False))
+    pool_time = run_threads(pages, threads, lambda html, url: run_in_pool(extract_page, html, url, False))
+    shutdown_extraction_pool()
+
+    print(f"CPUs: {os.cpu_count()}, threads fetchers: {threads}, páginas: {count}")
+    print(f"Threads (GIL):      {count / local_time:8.1f} páginas/s")
+    print(f"Pool de processos:  {count / pool_time:8.1f} páginas/s ({local_time / pool_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
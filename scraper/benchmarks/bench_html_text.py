@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark da conversão HTML -> texto das entradas de feed
+
+Compara BeautifulSoup(...).get_text(strip=True), usado antes pelo
+RSScraper, com utils.html_text.html_to_text sobre um corpus de summaries e
+contents no formato publicado por WordPress, Medium, Substack e portais.
+
+Uso: python benchmarks/bench_html_text.py [repetições]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bs4 import BeautifulSoup
+
+from utils.html_text import html_to_text
+
+PARAGRAPH = (
+    "<p>O mercado de <strong>marketing de conteúdo</strong> cresceu 12% em 2024, "
+    "segundo a <a href=\"https://exemplo.com/pesquisa?a=1&amp;b=2\">pesquisa anual</a> "
+    "da associação &ndash; e a tendência é de alta.&nbsp;Veja os detalhes.</p>\n"
+)
+
+CORPUS = [
+    # Summary curto em texto puro
+    "Resumo simples do artigo sem nenhuma marcação HTML.",
+    # Teaser do WordPress
+    "<p>As 10 tendências de SEO para 2024 [&#8230;]</p>\n"
+    "<p>The post <a rel=\"nofollow\" href=\"https://blog.exemplo.com/seo\">Tendências de SEO</a> "
+    "appeared first on <a rel=\"nofollow\" href=\"https://blog.exemplo.com\">Blog</a>.</p>",
+    # Medium: figura + parágrafos
+    "<div class=\"medium-feed-item\"><p class=\"medium-feed-image\"><a href=\"https://medium.com/p/1\">"
+    "<img src=\"https://cdn-images.medium.com/max/600/1.png\" width=\"600\"></a></p>"
+    "<p class=\"medium-feed-snippet\">Como construímos nosso pipeline de dados&#x2026;</p>"
+    "<p class=\"medium-feed-link\"><a href=\"https://medium.com/p/1\">Continue reading on Medium »</a></p></div>",
+    # content:encoded completo (Substack/portal) com script, lista e tabela
+    "<div>" + PARAGRAPH * 15 +
+    "<ul><li>Item um</li><li>Item &quot;dois&quot;</li><li>Item três</li></ul>"
+    "<script type=\"text/javascript\">window.dataLayer = window.dataLayer || [];</script>"
+    "<table><tr><th>Canal</th><th>Alcance</th></tr><tr><td>Blog</td><td>45%</td></tr></table>"
+    "<!-- publicidade --><blockquote>Citação de um especialista.</blockquote>" + PARAGRAPH * 15 + "</div>",
+]
+
+def legacy(html: str) -> str:
+    return BeautifulSoup(html, 'html.parser').get_text(strip=True)
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    for html in CORPUS:
+        print(f"{len(html):>6} bytes -> {html_to_text(html, ' ')[:90]!r}")
+
+    old_time = timeit.timeit(lambda: [legacy(html) for html in CORPUS], number=repetitions)
+    new_time = timeit.timeit(lambda: [html_to_text(html) for html in CORPUS], number=repetitions)
+
+    total = repetitions * len(CORPUS)
+    print("-" * 100)
+    print(f"BeautifulSoup.get_text: {old_time / total * 1e6:9.1f} µs/entrada")
+    print(f"html_to_text:           {new_time / total * 1e6:9.1f} µs/entrada ({old_time / new_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
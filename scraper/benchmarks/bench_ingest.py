@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark da gravação de conteúdos coletados: um commit por artigo x lote
+
+Compara o laço de save_content usado antes pelo ScraperManager (checagem,
+INSERT e commit por artigo) com save_contents_bulk (uma transação e
+executemany por fonte), nos modos de journal DELETE e WAL. Metade de cada
+lote é de URLs já gravadas, como numa nova coleta de um feed.
+
+Uso: python benchmarks/bench_ingest.py [artigos] [artigos por fonte]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.database import Database
+from models.scraper import ScrapedContent
+
+def make_batches(count: int, batch_size: int):
+    """Lotes por fonte; cada lote repete metade das URLs do anterior"""
+    batches = []
+    for start in range(0, count, batch_size // 2):
+        batches.append([
+            ScrapedContent(
+                title=f"Artigo {i}",
+                url=f"https://blog.exemplo.com/post/{i}",
+                content_text="Texto do artigo. " * 200,
+                source_type="rss"
+            )
+            for i in range(start, start + batch_size)
+        ])
+    return batches
+
+def per_article(db: Database, batches) -> int:
+    saved = 0
+    for batch in batches:
+        for content in batch:
+            if db.save_content(content, "source_bench", "client_bench"):
+                saved += 1
+    return saved
+
+def bulk(db: Database, batches) -> int:
+    saved = 0
+    for batch in batches:
+        saved += sum(1 for content_id in db.save_contents_bulk(batch, "source_bench", "client_bench") if content_id)
+    return saved
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    batches = make_batches(count, batch_size)
+
+    # Os logs de cada gravação distorceriam a medição
+    logging.disable(logging.INFO)
+
+    print(f"{count} artigos novos em lotes de {batch_size} ({sum(map(len, batches))} gravações)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for journal_mode, synchronous in (("DELETE", "FULL"), ("WAL", "NORMAL")):
+            os.environ["DB_JOURNAL_MODE"] = journal_mode
+            os.environ["DB_SYNCHRONOUS"] = synchronous
+            for name, save in (("save_content por artigo", per_article), ("save_contents_bulk", bulk)):
+                os.environ["DATABASE_PATH"] = str(Path(tmp) / f"{journal_mode}-{save.__name__}.db")
+                db = Database()
+                start = time.perf_counter()
+                saved = save(db, batches)
+                elapsed = time.perf_counter() - start
+                db.close()
+                print(f"{journal_mode:6} {name:25} {saved / elapsed:10.1f} artigos/s ({saved} novos)")
+
+if __name__ == "__main__":
+    main()
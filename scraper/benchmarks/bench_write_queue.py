@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark das gravações concorrentes: commit por operação x fila com commit em grupo
+
+Várias threads gravam o resultado de uma fonte (alguns artigos, marca
+d'água e data do scraping) ao mesmo tempo, como os workers do
+ScraperManager e do poller de feeds. No modo direto cada thread grava na
+sua conexão e faz o próprio commit; no modo fila as operações vão para a
+thread escritora do WriteQueue. Banco temporário em WAL, synchronous NORMAL
+e FULL (FULL faz um fsync por commit).
+
+Uso: python benchmarks/bench_write_queue.py [segundos] [threads] [artigos por operação]
+"""
+
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.database import Database
+from models.scraper import ScrapedContent, FeedState
+from models.write_queue import WriteQueue
+
+def make_contents(prefix: str, count: int):
+    return [
+        ScrapedContent(
+            title=f"Artigo {prefix}/{i}",
+            url=f"https://blog.exemplo.com/{prefix}/{i}",
+            content_text="Texto do artigo. " * 200,
+            source_type="rss"
+        )
+        for i in range(count)
+    ]
+
+def percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+def run(db: Database, write_queue, seconds: float, threads: int, articles: int):
+    """Executar a carga e retornar (operações, latências, erros)"""
+    counts = {'ops': 0, 'errors': 0}
+    latencies = []
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def worker(n: int):
+        i = 0
+        while time.perf_counter() < stop:
+            source_id = f"source_{n}"
+            contents = make_contents(f"{n}/{i}", articles)
+            state = FeedState(source_id=source_id, last_guid=str(i))
+            start = time.perf_counter()
+            try:
+                if write_queue is None:
+                    db.save_source_results(contents, source_id, "client_bench", state)
+                else:
+                    write_queue.submit(
+                        Database.save_source_results, contents, source_id, "client_bench", state
+                    ).result()
+                key = 'ops'
+            except sqlite3.Error:
+                key = 'errors'
+            elapsed = time.perf_counter() - start
+            with lock:
+                counts[key] += 1
+                latencies.append(elapsed)
+            i += 1
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return counts['ops'], latencies, counts['errors']
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    articles = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    # Os logs de cada gravação distorceriam a medição
+    logging.disable(logging.INFO)
+    # Erros de lock aparecem em vez de esperas longas
+    os.environ["DB_BUSY_TIMEOUT_MS"] = "1000"
+
+    print(f"{seconds:.0f}s, {threads} threads, {articles} artigos + marca d'água + data por operação")
+    with tempfile.TemporaryDirectory() as tmp:
+        for synchronous in ("NORMAL", "FULL"):
+            os.environ["DB_SYNCHRONOUS"] = synchronous
+            for name, queued in (("Commit por operação", False), ("WriteQueue (grupo)", True)):
+                os.environ["DATABASE_PATH"] = str(Path(tmp) / f"{synchronous}-{int(queued)}.db")
+                db = Database()
+                write_queue = WriteQueue(db) if queued else None
+                ops, latencies, errors = run(db, write_queue, seconds, threads, articles)
+                groups = write_queue.get_stats()['groups'] if write_queue else ops
+                if write_queue:
+                    write_queue.close()
+                db.close()
+                print(
+                    f"{synchronous:6} {name:20} {ops / seconds:8.1f} operações/s "
+                    f"p50 {percentile(latencies, 0.5):6.1f}ms p99 {percentile(latencies, 0.99):7.1f}ms "
+                    f"{groups / seconds:7.1f} commits/s {errors:4d} erros"
+                )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+BriefFlow Content Scraper - Compressão de conteúdos
+Comprime (ou descomprime) em lotes o content_text já gravado na tabela contents,
+ou o move para o armazenamento de corpos deduplicados (content_bodies)
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Adicionar diretorio src ao path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprimir o content_text existente em lotes")
+    parser.add_argument("--codec", choices=["zlib", "zstd"], help="Codec (default: CONTENT_COMPRESSION)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Linhas por transação")
+    parser.add_argument("--limit", type=int, help="Número máximo de linhas")
+    parser.add_argument("--train-dict", action="store_true", help="Treinar um dicionário zstd antes de comprimir")
+    parser.add_argument("--decompress", action="store_true", help="Voltar as linhas comprimidas para texto")
+    parser.add_argument("--body-store", action="store_true",
+                        help="Mover os textos para content_bodies (um registro por texto idêntico)")
+    parser.add_argument("--check", action="store_true",
+                        help="Verificar o banco e o índice de busca (o sqlite3 de linha de comando não lê contents_fts)")
+    args = parser.parse_args()
+
+    if args.codec:
+        os.environ["CONTENT_COMPRESSION"] = args.codec
+
+    from models.database import Database
+
+    print("Compressão de content_text")
+    print("=" * 50)
+
+    db = Database()
+    if args.check:
+        problems = db.check_integrity()
+        for problem in problems:
+            print(f"ERRO: {problem}")
+        print("Banco íntegro" if not problems else f"{len(problems)} problemas encontrados")
+        sys.exit(1 if problems else 0)
+
+    if args.train_dict and not args.decompress:
+        dict_id = db.train_compression_dictionary()
+        print(f"Dicionário: {dict_id if dict_id else 'não treinado (requer zstd e amostras)'}")
+
+    if args.body_store:
+        stats = db.move_bodies_to_store(args.batch_size, args.limit)
+        body_store = db.get_compression_stats()['body_store']
+        print("=" * 50)
+        print(f"Linhas movidas: {stats['rows']}")
+        print(f"Corpos novos: {stats['bodies']}")
+        print(f"Banco: {body_store['body_refs']} linhas referenciam {body_store['bodies']} corpos "
+              f"({body_store['body_bytes']} bytes)")
+        if not body_store['enabled']:
+            print("Defina CONTENT_BODY_STORE=true para que novas coletas também usem content_bodies")
+        return
+
+    try:
+        stats = db.recompress_contents(args.batch_size, args.decompress, args.limit)
+    except ValueError as e:
+        print(f"ERRO: {e}")
+        sys.exit(1)
+
+    totals = db.get_compression_stats()
+    print("=" * 50)
+    print(f"Linhas lidas: {stats['rows']}")
+    print(f"Alteradas: {stats['changed']}")
+    print(f"Bytes: {stats['bytes_before']} -> {stats['bytes_after']}")
+    print(f"Banco: {totals['compressed_rows']}/{totals['rows']} linhas comprimidas, taxa {totals['ratio']}x")
+    print("O espaço liberado é reaproveitado por novas linhas; um VACUUM devolve ao disco")
+    print("(depois de um VACUUM, reconstruir o índice de busca: Database.rebuild_search_index)")
+
+if __name__ == "__main__":
+    main()
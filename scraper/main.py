@@ -14,8 +14,8 @@ from datetime import datetime
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-# Importar sem prefixo src
-from api.server import app
+# Importar sem prefixo src (api.server só dentro de main: os workers do pool de
+# extração usam spawn e reimportam este módulo, e não devem montar a API)
 from utils.config import Config
 from utils.logger import setup_logger
 
@@ -41,6 +41,7 @@ def main():
     
     # Iniciar a API do scraper
     import uvicorn
+    from api.server import app
     
     logger.info("🌐 Iniciando servidor API do scraper")
     if config.is_development():
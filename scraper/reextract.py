@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+BriefFlow Content Scraper - Re-extração em lote
+Reaplica o extrator atual às páginas arquivadas e atualiza a tabela contents
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Adicionar diretorio src ao path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extrair conteúdos a partir do HTML arquivado")
+    parser.add_argument("--url-prefix", help="Re-extrair apenas URLs com este prefixo")
+    parser.add_argument("--limit", type=int, help="Número máximo de páginas")
+    parser.add_argument("--batch-size", type=int, help="Páginas por transação (default: REEXTRACT_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    from processors.extraction import shutdown_extraction_pool
+    from processors.reextract import Reextractor
+
+    print("Re-extração de páginas arquivadas")
+    print("=" * 50)
+
+    reextractor = Reextractor()
+    job = reextractor.create_job(
+        url_prefix=args.url_prefix,
+        limit=args.limit,
+        batch_size=args.batch_size
+    )
+
+    try:
+        reextractor.run(job)
+    finally:
+        shutdown_extraction_pool()
+
+    print("=" * 50)
+    print(f"Status: {job.status.value}")
+    print(f"Páginas: {job.pages}")
+    print(f"Atualizadas: {job.updated}")
+    print(f"Sem registro em contents: {job.skipped}")
+    print(f"Falhas de extração: {job.failed}")
+    print(f"Tempo: {job.elapsed:.1f}s ({job.pages_per_second} páginas/s)")
+
+    if job.error_message:
+        print(f"ERRO: {job.error_message}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+BriefFlow Content Scraper - Retenção de conteúdos
+Move conteúdos antigos para o arquivo comprimido e apaga os já analisados
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Adicionar diretorio src ao path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplicar as políticas de retenção de conteúdos")
+    parser.add_argument("--client-id", action="append", dest="client_ids",
+                        help="Restringir a este cliente (pode repetir)")
+    parser.add_argument("--batch-size", type=int, help="Conteúdos por transação (default: CONTENT_RETENTION_BATCH_SIZE)")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="Converter o banco para auto_vacuum incremental (VACUUM completo, com o scraper parado)")
+    args = parser.parse_args()
+
+    from models.database import Database
+    from processors.retention import ContentRetention
+
+    db = Database()
+
+    if args.enable_incremental_vacuum:
+        print("Convertendo o banco para auto_vacuum incremental...")
+        db.enable_incremental_vacuum()
+        stats = db.get_vacuum_stats()
+        print(f"auto_vacuum: {stats['auto_vacuum']}, tamanho: {stats['size_bytes']} bytes")
+        return
+
+    print("Retenção de conteúdos")
+    print("=" * 50)
+
+    retention = ContentRetention(db)
+    job = retention.create_job(client_ids=args.client_ids, batch_size=args.batch_size)
+    retention.run(job)
+
+    stats = db.get_vacuum_stats()
+    print("=" * 50)
+    print(f"Status: {job.status.value}")
+    print(f"Clientes: {job.clients}")
+    print(f"Arquivados: {job.archived}")
+    print(f"Apagados: {job.deleted}")
+    print(f"Apagados do arquivo: {job.deleted_from_archive}")
+    print(f"Mantidos (citados em pautas): {job.kept_for_briefs}")
+    print(f"Páginas devolvidas ao disco: {job.vacuumed_pages}")
+    print(f"Banco: {stats['size_bytes']} bytes ({stats['free_bytes']} livres, auto_vacuum {stats['auto_vacuum']})")
+    print(f"Tempo: {job.elapsed:.1f}s")
+
+    if job.error_message:
+        print(f"ERRO: {job.error_message}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,13 @@
 API REST do scraper
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import asyncio
+import time
+import uuid
 import sys
 from pathlib import Path
 
@@ -19,10 +21,18 @@ from models.scraper import (
     Source, Client, ScrapedContent, SourceType,
     ScrapeRequest, ScrapeResponse, SearchRequest, SearchResponse,
     AgentRequest, AgentResponse, MapRequest, MapResponse,
-    CrawlRequest, CrawlResponse
+    CrawlRequest, CrawlResponse, ReextractRequest,
+    RetentionPolicy, RetentionPolicyRequest, RetentionRequest,
+    OPMLImportRequest, OPMLImportResponse, FeedPollRequest,
+    SourceCreateRequest, SourceCreateResponse
 )
 from models.database import Database
+from models.async_database import AsyncDatabase
+from models.write_queue import get_write_queue
+from models.page_archive import get_page_archive
 from scrapers.scraper_manager import ScraperManager
+from scrapers.feed_poller import FeedPoller
+from scrapers.feed_discovery import feed_discovery
 from scrapers.web_scraper import WebScraper
 from scrapers.search_scraper import SearchScraper
 from scrapers.openai_agent_scraper import OpenAIAgentScraper
@@ -30,8 +40,14 @@ from scrapers.agent_scraper import AgentScraper
 from scrapers.anthropic_agent_scraper import AnthropicAgentScraper
 from scrapers.site_mapper import SiteMapper
 from scrapers.web_crawler import WebCrawler
+from processors.reextract import Reextractor
+from models.content_archive import get_content_archive
 from utils.config import Config
 from utils.logger import setup_logger
+from utils.resilience import circuit_breakers
+from utils.sessions import session_provider
+from utils.dns_cache import dns_cache
+from utils.opml import parse_opml
 
 logger = setup_logger()
 
@@ -54,6 +70,8 @@ app.add_middleware(
 
 # Inicializar componentes
 db = Database()
+# Consultas dos handlers fora do event loop
+adb = AsyncDatabase(db)
 scraper_manager = ScraperManager()
 web_scraper = WebScraper()
 search_scraper = SearchScraper()
@@ -62,6 +80,8 @@ agent_scraper = AgentScraper()
 anthropic_agent_scraper = AnthropicAgentScraper()
 site_mapper = SiteMapper()
 web_crawler = WebCrawler()
+reextractor = Reextractor(db)
+feed_poller = FeedPoller(db)
 
 # Endpoint para health check
 @app.get("/")
@@ -89,12 +109,22 @@ async def detailed_health_check():
         "active_tasks": len(scraper_manager.get_all_tasks())
     }
 
+# Endpoint para marcas d'água dos feeds RSS
+@app.get("/feed-states")
+async def get_feed_states():
+    """Obter a marca d'água e a contagem de entradas novas de cada feed"""
+    try:
+        return await adb.get_feed_states()
+    except Exception as e:
+        logger.error(f"❌ Erro ao obter marcas d'água dos feeds: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao obter marcas d'água dos feeds")
+
 # Endpoint para obter clientes
 @app.get("/clients", response_model=List[Client])
 async def get_clients():
     """Obter todos os clientes"""
     try:
-        clients = db.get_clients()
+        clients = await adb.get_clients()
         return clients
     except Exception as e:
         logger.error(f"❌ Erro ao obter clientes: {e}")
@@ -105,18 +135,111 @@ async def get_clients():
 async def get_client_sources(client_id: str):
     """Obter fontes de um cliente"""
     try:
-        sources = db.get_sources_by_client(client_id)
+        sources = await adb.get_sources_by_client(client_id)
         return sources
     except Exception as e:
         logger.error(f"❌ Erro ao obter fontes do cliente {client_id}: {e}")
         raise HTTPException(status_code=500, detail="Erro ao obter fontes do cliente")
 
+# Endpoint para criar uma fonte (com descoberta de feed para blogs/notícias)
+@app.post("/clients/{client_id}/sources", response_model=SourceCreateResponse)
+async def create_source(client_id: str, request: SourceCreateRequest):
+    """
+    Criar uma fonte para o cliente
+    
+    Para fontes blog/news, o feed do site é procurado (link rel=alternate e
+    caminhos comuns); se encontrado e **use_discovered_feed** for true, a
+    fonte é criada como RSS apontando para o feed.
+    """
+    url = request.url.strip()
+    if not url:
+        raise HTTPException(status_code=400, detail="URL é obrigatória")
+    
+    try:
+        if not any(client.id == client_id for client in await adb.get_clients()):
+            raise HTTPException(status_code=404, detail="Cliente não encontrado")
+        
+        discovered_feed = None
+        if request.type in [SourceType.BLOG, SourceType.NEWS]:
+            discovered_feed = await asyncio.to_thread(feed_discovery.discover, url)
+        
+        switched = bool(discovered_feed and request.use_discovered_feed)
+        source = Source(
+            id=str(uuid.uuid4()),
+            client_id=client_id,
+            name=request.name,
+            url=discovered_feed if switched else url,
+            type=SourceType.RSS if switched else request.type,
+            is_active=request.is_active
+        )
+        
+        if not await adb.save_sources_bulk([source]):
+            raise HTTPException(status_code=409, detail="Fonte já cadastrada para o cliente")
+        
+        logger.info(f"➕ Fonte criada: {source.name} ({source.type.value})")
+        return SourceCreateResponse(
+            source=source,
+            discovered_feed=discovered_feed,
+            switched_to_rss=switched
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao criar fonte para {client_id}: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao criar fonte")
+
+# Endpoint para importar fontes RSS em lote a partir de um OPML
+@app.post("/clients/{client_id}/sources/opml", response_model=OPMLImportResponse)
+async def import_opml(client_id: str, request: OPMLImportRequest):
+    """
+    Criar fontes RSS em lote a partir de um arquivo OPML
+    
+    - **opml**: Conteúdo XML exportado pelo leitor de feeds
+    - **is_active**: Criar as fontes já ativas
+    """
+    try:
+        feeds = parse_opml(request.opml)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        if not any(client.id == client_id for client in await adb.get_clients()):
+            raise HTTPException(status_code=404, detail="Cliente não encontrado")
+        
+        sources = [
+            Source(
+                id=str(uuid.uuid4()),
+                client_id=client_id,
+                name=feed['title'],
+                url=feed['xml_url'],
+                type=SourceType.RSS,
+                is_active=request.is_active
+            )
+            for feed in feeds
+        ]
+        created_ids = await adb.save_sources_bulk(sources)
+        
+        logger.info(f"📥 OPML importado para {client_id}: {len(created_ids)}/{len(feeds)} fontes criadas")
+        return OPMLImportResponse(
+            feeds_found=len(feeds),
+            created=len(created_ids),
+            skipped=len(feeds) - len(created_ids),
+            source_ids=created_ids
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao importar OPML para {client_id}: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao importar OPML")
+
 # Endpoint para obter todas as fontes ativas
 @app.get("/sources", response_model=List[Source])
 async def get_all_sources():
     """Obter todas as fontes ativas"""
     try:
-        sources = db.get_all_active_sources()
+        sources = await adb.get_all_active_sources()
         return sources
     except Exception as e:
         logger.error(f"❌ Erro ao obter fontes: {e}")
@@ -159,6 +282,30 @@ async def start_scraping(request: ScrapingRequest, background_tasks: BackgroundT
         logger.error(f"❌ Erro ao iniciar scraping: {e}")
         raise HTTPException(status_code=500, detail="Erro ao iniciar scraping")
 
+# Endpoints da varredura de feeds em massa
+@app.post("/poll-feeds")
+async def start_feed_poll(request: FeedPollRequest):
+    """
+    Varrer todos os feeds RSS ativos (ou dos clientes informados) concorrentemente
+    
+    - **client_ids**: Restringir aos feeds destes clientes
+    - **max_items**: Máximo de entradas por feed
+    """
+    try:
+        poll_id = feed_poller.start_poll(client_ids=request.client_ids, max_items=request.max_items)
+        return {"poll_id": poll_id, "status": "pending"}
+    except Exception as e:
+        logger.error(f"❌ Erro ao iniciar varredura de feeds: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao iniciar varredura de feeds")
+
+@app.get("/poll-feeds/{poll_id}")
+async def get_feed_poll_status(poll_id: str):
+    """Obter progresso e taxa (feeds/s) de uma varredura de feeds"""
+    run = feed_poller.get_run(poll_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Varredura não encontrada")
+    return run.to_dict()
+
 # Endpoint para obter status de tarefa
 @app.get("/tasks/{task_id}", response_model=TaskStatusResponse)
 async def get_task_status(task_id: str):
@@ -245,7 +392,8 @@ async def scrape_single_url(url: str):
         if not url or not url.strip():
             raise HTTPException(status_code=400, detail="URL é obrigatória")
         
-        content = scraper_manager.scrape_single_url(url.strip())
+        # Requisições com retries e extração: fora do event loop
+        content = await asyncio.to_thread(scraper_manager.scrape_single_url, url.strip())
         
         if not content:
             raise HTTPException(
@@ -274,13 +422,15 @@ async def test_source(url: str, source_type: SourceType):
         if not url or not url.strip():
             raise HTTPException(status_code=400, detail="URL é obrigatória")
         
-        result = scraper_manager.test_source(url.strip(), source_type)
+        # Descoberta de feed (vários candidatos + robots.txt): fora do event loop
+        result = await asyncio.to_thread(scraper_manager.test_source, url.strip(), source_type)
         
         return {
             "success": result["success"],
             "message": result["message"],
             "sample_content": result.get("sample_content"),
-            "feed_info": result.get("feed_info")
+            "feed_info": result.get("feed_info"),
+            "discovered_feed": result.get("discovered_feed")
         }
         
     except HTTPException:
@@ -291,18 +441,224 @@ async def test_source(url: str, source_type: SourceType):
 
 # Endpoint para obter conteúdos de um cliente
 @app.get("/clients/{client_id}/contents")
-async def get_client_contents(client_id: str, limit: int = 100):
-    """Obter conteúdos de um cliente"""
+async def get_client_contents(client_id: str, limit: int = Query(100, ge=1, le=500),
+                              cursor: Optional[str] = None, fields: Optional[str] = None):
+    """
+    Obter conteúdos de um cliente, paginados por cursor
+    
+    fields: colunas separadas por vírgula (ex.: id,title,url,published_at);
+    sem content_text a listagem é servida pelo índice. next_cursor vai no
+    parâmetro cursor da próxima requisição.
+    """
     try:
-        contents = db.get_contents_by_client(client_id, limit)
+        field_list = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+        contents, next_cursor = await adb.get_contents_page(client_id, limit, cursor, field_list)
         return {
             "contents": contents,
-            "count": len(contents)
+            "count": len(contents),
+            "next_cursor": next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Erro ao obter conteúdos do cliente {client_id}: {e}")
         raise HTTPException(status_code=500, detail="Erro ao obter conteúdos")
 
+# Endpoint para busca textual nos conteúdos de um cliente
+@app.get("/clients/{client_id}/search")
+async def search_client_contents(client_id: str, q: str, limit: int = Query(20, ge=1, le=100),
+                                 offset: int = Query(0, ge=0)):
+    """Buscar conteúdos de um cliente (FTS5, ordenados por relevância BM25)"""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Informe o texto da busca (q)")
+    if not db.has_search_index():
+        raise HTTPException(status_code=503, detail="Índice de busca indisponível (SQLite sem FTS5)")
+    
+    try:
+        start = time.perf_counter()
+        results = await adb.search_contents(client_id, q, limit, offset)
+        return {
+            "query": q,
+            "results": results,
+            "count": len(results),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+    except Exception as e:
+        logger.error(f"❌ Erro na busca de conteúdos do cliente {client_id}: {e}")
+        raise HTTPException(status_code=500, detail="Erro na busca de conteúdos")
+
+# Endpoint para estado dos circuit breakers por domínio
+@app.get("/circuit-breakers")
+async def get_circuit_breakers():
+    """Obter estado dos circuit breakers de cada domínio"""
+    breakers = circuit_breakers.snapshot()
+    return {
+        "circuit_breakers": breakers,
+        "open": [b["domain"] for b in breakers if b["state"] != "closed"],
+        "count": len(breakers)
+    }
+
+# Endpoint para métricas dos pools de conexão HTTP
+@app.get("/http-sessions")
+async def get_http_sessions():
+    """Obter contagem de conexões e taxa de reuso dos pools HTTP"""
+    return session_provider.get_stats()
+
+# Endpoint para estatísticas do cache de DNS
+@app.get("/dns-cache")
+async def get_dns_cache():
+    """Obter contadores de acertos/erros do cache de DNS"""
+    return dns_cache.get_stats()
+
+# Endpoint para estatísticas do cache de clientes e fontes
+@app.get("/lookup-cache")
+async def get_lookup_cache():
+    """Obter acertos, faltas e invalidações do cache de clientes e fontes"""
+    return {
+        "api": db.lookup_cache.get_stats(),
+        "scraper": scraper_manager.db.lookup_cache.get_stats()
+    }
+
+# Endpoint para estatísticas da fila de gravação
+@app.get("/write-queue")
+async def get_write_queue_stats():
+    """Obter operações, grupos (commits) e profundidade da fila de gravação"""
+    return get_write_queue().get_stats()
+
+# Endpoint para taxa de compressão de content_text
+@app.get("/contents/compression")
+async def get_contents_compression():
+    """Obter codec, linhas comprimidas e taxa de compressão de content_text"""
+    try:
+        return await adb.get_compression_stats()
+    except Exception as e:
+        logger.error(f"❌ Erro ao obter estatísticas de compressão: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao obter estatísticas de compressão")
+
+# Endpoints do arquivo de páginas brutas
+@app.get("/archive")
+async def get_archive_stats():
+    """Obter tamanho e taxa de compressão do arquivo de HTML bruto"""
+    archive = get_page_archive()
+    if archive is None:
+        return {"enabled": False}
+    return {"enabled": True, **(await adb.run(archive.get_stats))}
+
+@app.post("/archive/retention")
+async def apply_archive_retention():
+    """Aplicar a política de retenção do arquivo (ARCHIVE_RETENTION_DAYS)"""
+    archive = get_page_archive()
+    if archive is None:
+        raise HTTPException(status_code=400, detail="Arquivo de páginas desativado")
+    try:
+        return await adb.run(archive.apply_retention)
+    except Exception as e:
+        logger.error(f"❌ Erro ao aplicar retenção do arquivo: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao aplicar retenção do arquivo")
+
+# Endpoints de re-extração das páginas arquivadas
+@app.post("/reextract")
+async def start_reextraction(request: ReextractRequest):
+    """
+    Re-extrair conteúdos a partir do HTML arquivado (sem novo download)
+    
+    - **url_prefix**: Restringir a URLs com este prefixo
+    - **limit**: Número máximo de páginas
+    - **batch_size**: Páginas por transação
+    """
+    if get_page_archive() is None:
+        raise HTTPException(status_code=400, detail="Arquivo de páginas desativado")
+    try:
+        job_id = reextractor.start_job(
+            url_prefix=request.url_prefix,
+            limit=request.limit,
+            batch_size=request.batch_size
+        )
+        return {"job_id": job_id, "status": "pending"}
+    except Exception as e:
+        logger.error(f"❌ Erro ao iniciar re-extração: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao iniciar re-extração")
+
+@app.get("/reextract/{job_id}")
+async def get_reextraction_status(job_id: str):
+    """Obter progresso e taxa (páginas/s) de um job de re-extração"""
+    job = reextractor.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de re-extração não encontrado")
+    return job.to_dict()
+
+# Endpoints de retenção de conteúdos
+@app.get("/clients/{client_id}/retention")
+async def get_retention_policy(client_id: str):
+    """Obter a política de retenção de um cliente (None = padrão do .env)"""
+    try:
+        policy = await adb.get_retention_policy(client_id)
+        return {
+            **policy.model_dump(),
+            "defaults": {
+                "hot_days": config.get_content_hot_days(),
+                "delete_analyzed_days": config.get_content_delete_analyzed_days()
+            }
+        }
+    except Exception as e:
+        logger.error(f"❌ Erro ao obter política de retenção: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao obter política de retenção")
+
+@app.put("/clients/{client_id}/retention")
+async def update_retention_policy(client_id: str, request: RetentionPolicyRequest):
+    """
+    Alterar a política de retenção de um cliente
+    
+    - **hot_days**: Dias no banco principal antes do arquivo (0 = nunca arquivar)
+    - **delete_analyzed_days**: Apagar conteúdos analisados após N dias (0 = nunca)
+    """
+    try:
+        policy = RetentionPolicy(client_id=client_id, **request.model_dump())
+        await adb.save_retention_policy(policy)
+        return await adb.get_retention_policy(client_id)
+    except Exception as e:
+        logger.error(f"❌ Erro ao alterar política de retenção: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao alterar política de retenção")
+
+@app.get("/retention")
+async def get_retention_stats():
+    """Espaço livre do banco principal e tamanho do arquivo de conteúdos"""
+    try:
+        archive = await adb.run(get_content_archive)
+        return {
+            "database": await adb.get_vacuum_stats(),
+            "archive": await adb.run(archive.get_stats)
+        }
+    except Exception as e:
+        logger.error(f"❌ Erro ao obter estatísticas de retenção: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao obter estatísticas de retenção")
+
+@app.post("/retention")
+async def start_retention(request: RetentionRequest):
+    """
+    Aplicar as políticas de retenção em background
+    
+    - **client_ids**: Restringir a estes clientes
+    - **batch_size**: Conteúdos por transação
+    """
+    try:
+        job_id = scraper_manager.retention.start_job(
+            client_ids=request.client_ids,
+            batch_size=request.batch_size
+        )
+        return {"job_id": job_id, "status": "pending"}
+    except Exception as e:
+        logger.error(f"❌ Erro ao iniciar retenção: {e}")
+        raise HTTPException(status_code=500, detail="Erro ao iniciar retenção")
+
+@app.get("/retention/{job_id}")
+async def get_retention_status(job_id: str):
+    """Obter progresso de um job de retenção"""
+    job = scraper_manager.retention.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de retenção não encontrado")
+    return job.to_dict()
+
 # Endpoint para informações da API
 @app.get("/info")
 async def get_api_info():
@@ -331,7 +687,23 @@ async def get_api_info():
             "task_status": "/tasks/{task_id}",
             "scrape_url": "/scrape-url",
             "test_source": "/test-source",
-            "contents": "/clients/{client_id}/contents",
+            "contents": "/clients/{client_id}/contents?cursor=&fields=",
+            "search_contents": "/clients/{client_id}/search?q=",
+            "feed_states": "/feed-states",
+            "create_source": "/clients/{client_id}/sources (POST)",
+            "opml_import": "/clients/{client_id}/sources/opml (POST)",
+            "poll_feeds": "/poll-feeds (POST), /poll-feeds/{poll_id}",
+            "circuit_breakers": "/circuit-breakers",
+            "http_sessions": "/http-sessions",
+            "dns_cache": "/dns-cache",
+            "lookup_cache": "/lookup-cache",
+            "write_queue": "/write-queue",
+            "contents_compression": "/contents/compression",
+            "archive": "/archive",
+            "archive_retention": "/archive/retention (POST)",
+            "reextract": "/reextract (POST), /reextract/{job_id}",
+            "retention_policy": "/clients/{client_id}/retention (GET, PUT)",
+            "retention": "/retention (GET, POST), /retention/{job_id}",
             "scrape": "/scrape (nova API)",
             "search": "/search",
             "agent": "/agent",
@@ -571,6 +943,10 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Evento de desligamento da API"""
+    # Gravar o que estiver na fila antes de fechar as conexões
+    get_write_queue().close()
+    adb.close()
+    scraper_manager.db.close()
     logger.info("🛑 BriefFlow Content Scraper API desligada")
 
 if __name__ == "__main__":
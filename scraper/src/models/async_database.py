@@ -0,0 +1,56 @@
+"""
+Fachada assíncrona do banco para os handlers da API
+Cada chamada roda em um pool de threads dedicado, fora do event loop
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .database import Database
+from utils.config import Config
+
+class AsyncDatabase:
+    """
+    Expõe os métodos do Database como corrotinas
+
+    `await adb.get_clients()` executa `db.get_clients()` em uma thread do
+    pool; cada thread mantém a sua conexão persistente (Database.get_connection),
+    e em WAL as leituras rodam em paralelo com as gravações. Uma consulta lenta
+    ocupa uma thread do pool, não o event loop.
+    """
+
+    def __init__(self, db: Optional[Database] = None, max_workers: Optional[int] = None):
+        """
+        Inicializar a fachada
+
+        Args:
+            db: Banco de dados (default: nova instância)
+            max_workers: Threads do pool (default: DB_POOL_WORKERS)
+        """
+        self.db = db or Database()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config().get_db_pool_workers(),
+            thread_name_prefix="db"
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Executar uma função bloqueante qualquer no pool do banco"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.db, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+        return call
+
+    def close(self):
+        """Aguardar as chamadas em andamento e fechar as conexões"""
+        self.executor.shutdown(wait=True)
+        self.db.close()
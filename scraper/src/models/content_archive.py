@@ -0,0 +1,159 @@
+"""
+Banco de arquivo dos conteúdos antigos (fora do banco quente compartilhado)
+Mesmas colunas de contents, com content_text sempre comprimido
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .content_codec import ContentCodec, HAS_ZSTD
+from utils.config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+ARCHIVE_COLUMNS = (
+    'id', 'source_id', 'client_id', 'title', 'url', 'content_text', 'summary',
+    'topics', 'published_at', 'scraped_at', 'is_analyzed'
+)
+
+class ContentArchive:
+    """Arquivo de conteúdos movidos pela retenção (um arquivo SQLite separado)"""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Inicializar o arquivo
+
+        Args:
+            path: Caminho do banco de arquivo (default: CONTENT_ARCHIVE_PATH)
+        """
+        self.config = Config()
+        self.path = Path(path or self.config.get_content_archive_path())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.codec = ContentCodec('zstd' if HAS_ZSTD else 'zlib')
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_tables()
+
+    def _init_tables(self):
+        with self._lock:
+            # Antes de criar tabelas: só tem efeito em arquivo novo
+            self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS contents (
+                    id TEXT PRIMARY KEY,
+                    source_id TEXT NOT NULL,
+                    client_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    content_text BLOB,
+                    summary TEXT,
+                    topics TEXT, -- JSON
+                    published_at INTEGER,
+                    scraped_at INTEGER,
+                    is_analyzed INTEGER DEFAULT 0,
+                    archived_at INTEGER
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_archive_client_scraped ON contents (client_id, scraped_at)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_archive_url ON contents (url)")
+            self._conn.commit()
+
+    def store(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Gravar conteúdos no arquivo (idempotente: ids já arquivados são ignorados)
+
+        Args:
+            rows: Linhas de contents com content_text já descomprimido
+
+        Returns:
+            Número de linhas novas no arquivo
+        """
+        if not rows:
+            return 0
+        archived_at = int(datetime.now().timestamp() * 1000)
+        values = [
+            tuple(self.codec.compress(row[col]) if col == 'content_text' else row[col] for col in ARCHIVE_COLUMNS)
+            + (archived_at,)
+            for row in rows
+        ]
+        with self._lock:
+            cursor = self._conn.executemany(f"""
+                INSERT OR IGNORE INTO contents ({', '.join(ARCHIVE_COLUMNS)}, archived_at)
+                VALUES ({', '.join('?' * (len(ARCHIVE_COLUMNS) + 1))})
+            """, values)
+            self._conn.commit()
+            return cursor.rowcount
+
+    def delete_analyzed_before(self, client_id: str, before_ms: int, batch_size: int = 500) -> int:
+        """Apagar do arquivo os conteúdos analisados mais antigos que o horizonte"""
+        deleted = 0
+        while True:
+            with self._lock:
+                cursor = self._conn.execute("""
+                    DELETE FROM contents WHERE rowid IN (
+                        SELECT rowid FROM contents
+                        WHERE client_id = ? AND scraped_at < ? AND is_analyzed = 1
+                        LIMIT ?
+                    )
+                """, (client_id, before_ms, batch_size))
+                self._conn.commit()
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                return deleted
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Obter um conteúdo arquivado pela URL"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM contents WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        content = dict(row)
+        content['content_text'] = self.codec.decompress(content['content_text'])
+        return content
+
+    def incremental_vacuum(self, pages: int):
+        """Devolver ao disco páginas livres (sem reescrever o arquivo inteiro)"""
+        with self._lock:
+            # execute() avança o PRAGMA um passo só (uma página); executescript roda até o fim
+            self._conn.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Linhas arquivadas e tamanho do arquivo"""
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM contents").fetchone()[0]
+            page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return {
+            'path': str(self.path),
+            'rows': rows,
+            'size_bytes': page_size * page_count,
+            'free_bytes': page_size * freelist,
+            'codec': self.codec.codec
+        }
+
+    def close(self):
+        """Fechar o arquivo"""
+        with self._lock:
+            self._conn.close()
+
+_archive: Optional[ContentArchive] = None
+_archive_lock = threading.Lock()
+
+def get_content_archive() -> ContentArchive:
+    """Obter o arquivo de conteúdos do processo (criado sob demanda)"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = ContentArchive()
+        return _archive
@@ -0,0 +1,148 @@
+"""
+Compressão transparente de content_text na tabela contents
+Valores comprimidos são BLOBs com cabeçalho; TEXT continua sendo texto puro
+"""
+
+import struct
+import zlib
+from typing import Dict, List, Optional, Union
+
+from utils.config import Config
+from utils.logger import setup_logger
+
+# Tentar importar zstandard (melhor taxa e velocidade que zlib, dicionários treinados)
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+logger = setup_logger()
+
+# Cabeçalho: 'BF' + codec (1 byte) + id do dicionário (uint32, 0 = sem dicionário)
+# + tamanho original em bytes (uint32, usado nas estatísticas sem descomprimir)
+MAGIC = b'BF'
+HEADER = struct.Struct('>2scII')
+CODEC_ZLIB = b'z'
+CODEC_ZSTD = b's'
+
+class ContentCodec:
+    """Comprime e descomprime content_text; dicionários zstd são carregados do banco"""
+
+    def __init__(self, codec: Optional[str] = None):
+        """
+        Inicializar o codec
+
+        Args:
+            codec: 'off', 'zlib' ou 'zstd' (default: CONTENT_COMPRESSION)
+        """
+        config = Config()
+        codec = (codec or config.get_content_compression()).lower()
+        if codec == 'zstd' and not HAS_ZSTD:
+            logger.warning("⚠️  zstandard não instalado, usando zlib na compressão de conteúdos")
+            codec = 'zlib'
+        self.codec = codec
+        self.level = config.get_content_compression_level()
+        self.min_bytes = config.get_content_compression_min_bytes()
+
+        self._dicts: Dict[int, bytes] = {}
+        self._dict_id = 0
+        self._compressors: Dict[int, object] = {}
+        self._decompressors: Dict[int, object] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.codec in ('zlib', 'zstd')
+
+    def load_dictionaries(self, dictionaries: Dict[int, bytes]):
+        """Registrar os dicionários zstd gravados; o de maior id passa a ser usado na compressão"""
+        self._dicts.update(dictionaries)
+        self._compressors.clear()
+        if self._dicts and self.codec == 'zstd':
+            self._dict_id = max(self._dicts)
+
+    def _zstd_compressor(self, dict_id: int):
+        compressor = self._compressors.get(dict_id)
+        if compressor is None:
+            dict_data = zstandard.ZstdCompressionDict(self._dicts[dict_id]) if dict_id else None
+            compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data)
+            self._compressors[dict_id] = compressor
+        return compressor
+
+    def _zstd_decompressor(self, dict_id: int):
+        decompressor = self._decompressors.get(dict_id)
+        if decompressor is None:
+            if dict_id and dict_id not in self._dicts:
+                raise ValueError(f"Dicionário de compressão {dict_id} não encontrado")
+            dict_data = zstandard.ZstdCompressionDict(self._dicts[dict_id]) if dict_id else None
+            decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+            self._decompressors[dict_id] = decompressor
+        return decompressor
+
+    def compress(self, text: Optional[str]) -> Union[str, bytes, None]:
+        """
+        Comprimir um texto para gravação
+
+        Returns:
+            BLOB com cabeçalho, ou o próprio texto se a compressão estiver
+            desligada, o texto for curto ou não encolher
+        """
+        if not self.enabled or not text:
+            return text
+        raw = text.encode('utf-8')
+        if len(raw) < self.min_bytes:
+            return text
+
+        if self.codec == 'zstd':
+            data = HEADER.pack(MAGIC, CODEC_ZSTD, self._dict_id, len(raw)) + \
+                self._zstd_compressor(self._dict_id).compress(raw)
+        else:
+            data = HEADER.pack(MAGIC, CODEC_ZLIB, 0, len(raw)) + zlib.compress(raw, self.level)
+        return data if len(data) < len(raw) else text
+
+    def decompress(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """Devolver o texto de um valor gravado (TEXT passa direto)"""
+        if not isinstance(value, (bytes, memoryview)):
+            return value
+        value = bytes(value)
+        magic, codec, dict_id, _ = HEADER.unpack_from(value)
+        if magic != MAGIC:
+            raise ValueError("BLOB em content_text sem cabeçalho de compressão")
+        payload = value[HEADER.size:]
+        if codec == CODEC_ZLIB:
+            raw = zlib.decompress(payload)
+        elif codec == CODEC_ZSTD:
+            if not HAS_ZSTD:
+                raise RuntimeError("Conteúdo comprimido com zstd, mas zstandard não está instalado")
+            raw = self._zstd_decompressor(dict_id).decompress(payload)
+        else:
+            raise ValueError(f"Codec de compressão desconhecido: {codec!r}")
+        return raw.decode('utf-8')
+
+    @staticmethod
+    def original_length(value: Union[str, bytes, None]) -> int:
+        """Tamanho em bytes do texto original (lido do cabeçalho, sem descomprimir)"""
+        if value is None:
+            return 0
+        if isinstance(value, str):
+            return len(value.encode('utf-8'))
+        return HEADER.unpack_from(value)[3]
+
+    def train_dictionary(self, samples: List[str], size: int) -> Optional[bytes]:
+        """
+        Treinar um dicionário zstd com amostras de conteúdos
+
+        Textos do mesmo site compartilham boilerplate (assinaturas, rodapés,
+        chamadas), que o dicionário captura melhor que a janela de cada linha.
+
+        Returns:
+            Bytes do dicionário, ou None sem zstd/amostras suficientes
+        """
+        if self.codec != 'zstd' or len(samples) < 10:
+            return None
+        try:
+            trained = zstandard.train_dictionary(size, [sample.encode('utf-8') for sample in samples])
+        except zstandard.ZstdError as e:
+            logger.warning(f"⚠️  Falha ao treinar dicionário de compressão: {e}")
+            return None
+        return trained.as_bytes()
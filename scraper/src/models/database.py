@@ -4,17 +4,49 @@ Interface de banco de dados para o scraper
 
 import sqlite3
 import json
+import base64
+import threading
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 from contextlib import contextmanager
 
-from .scraper import Source, Client, ScrapedContent, Brief, AnalysisConfig
+from .scraper import Source, Client, ScrapedContent, Brief, AnalysisConfig, FeedState, RetentionPolicy
+from .content_codec import ContentCodec, HAS_ZSTD
+from .lookup_cache import LookupCache
+from .migrations import apply_migrations
 from utils.config import Config
 from utils.logger import setup_logger
+from utils.urls import content_id as make_content_id, body_hash as make_body_hash
 
 logger = setup_logger()
 
+# Consultas quentes verificadas com EXPLAIN QUERY PLAN na inicialização (nome, SQL, parâmetros)
+HOT_QUERIES = [
+    ("contents_by_url", "SELECT url FROM contents WHERE client_id = ? AND url IN (?, ?)", ('', '', '')),
+    ("contents_by_id", "SELECT id FROM contents WHERE id IN (?, ?)", ('', '')),
+    ("contents_by_body", "SELECT 1 FROM contents WHERE body_hash = ?", ('',)),
+    ("contents_page",
+     "SELECT id, title, url, scraped_at FROM contents WHERE client_id = ? AND (scraped_at, id) < (?, ?) "
+     "ORDER BY scraped_at DESC, id DESC LIMIT ?", ('', 0, '', 100)),
+    ("sources_by_client", "SELECT * FROM sources WHERE client_id = ? AND is_active = 1", ('',)),
+    ("active_sources", "SELECT * FROM sources WHERE is_active = 1", ()),
+    ("lookup_version", "SELECT version FROM lookup_version WHERE id = 1", ()),
+    ("sources_by_clients", "SELECT client_id, url FROM sources WHERE client_id IN (?, ?)", ('', '')),
+]
+
+# Colunas de contents aceitas em fields= (listagens)
+CONTENT_FIELDS = (
+    'id', 'source_id', 'client_id', 'title', 'url', 'content_text', 'summary',
+    'topics', 'published_at', 'scraped_at', 'is_analyzed'
+)
+
+# Texto do conteúdo: a coluna ou, com o armazenamento de corpos, o corpo referenciado
+CONTENT_TEXT_SQL = "COALESCE(content_text, (SELECT body FROM content_bodies WHERE hash = contents.body_hash))"
+
+# Limite de parâmetros por consulta em builds antigos do SQLite (< 3.32)
+SQLITE_MAX_PARAMS = 999
+
 class Database:
     """Classe de interface com o banco de dados SQLite"""
     
@@ -28,26 +60,100 @@ class Database:
         
         logger.info(f"📁 Banco de dados: {self.db_path}")
         
+        # Uma conexão persistente por thread (sqlite3 não compartilha conexões entre threads)
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        
+        # Compressão de content_text (desligada por padrão: o backend Node lê a coluna)
+        self.codec = ContentCodec()
+        # Corpos idênticos gravados uma vez em content_bodies (desligado por padrão, idem)
+        self.body_store = self.config.is_content_body_store_enabled()
+        
+        # Clientes e fontes: lidos a cada requisição, alterados poucas vezes ao dia
+        self.lookup_cache = LookupCache(self.config.get_db_lookup_cache_ttl())
+        self._check_lookup_version = self.config.is_db_lookup_cache_version_check_enabled()
+        
         # Inicializar tabelas se não existirem
         self._init_tables()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Abrir uma conexão configurada com os PRAGMAs de desempenho"""
+        busy_timeout = self.config.get_db_busy_timeout_ms()
+        conn = sqlite3.connect(self.db_path, timeout=busy_timeout / 1000, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Retornar resultados como dicionários
+        conn.execute(f"PRAGMA busy_timeout = {busy_timeout}")
+        conn.execute(f"PRAGMA synchronous = {self.config.get_db_synchronous()}")
+        conn.execute(f"PRAGMA mmap_size = {self.config.get_db_mmap_size()}")
+        conn.execute(f"PRAGMA cache_size = {self.config.get_db_cache_size()}")
+        # Texto puro de content_text comprimido (view de busca e estatísticas)
+        conn.create_function('content_plain', 1, self.codec.decompress, deterministic=True)
+        conn.create_function('content_original_length', 1, ContentCodec.original_length, deterministic=True)
+        
+        with self._connections_lock:
+            # Fechar as conexões de threads que já terminaram (executors recriados)
+            for thread in [t for t in self._connections if not t.is_alive()]:
+                self._connections.pop(thread).close()
+            self._connections[threading.current_thread()] = conn
+        return conn
+    
     @contextmanager
     def get_connection(self):
-        """Context manager para conexão com o banco"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Retornar resultados como dicionários
+        """
+        Context manager para a conexão da thread atual
+        
+        A conexão é reaproveitada entre chamadas; ao sair do bloco mais externo,
+        uma transação não confirmada é desfeita (mesmo efeito do antigo close()).
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.depth = 0
+        
+        self._local.depth += 1
         try:
             yield conn
         except Exception as e:
-            conn.rollback()
+            # Dentro de um grupo da fila de gravação, quem desfaz é o SAVEPOINT da operação
+            if not getattr(self._local, 'group', False):
+                conn.rollback()
             logger.error(f"Erro no banco de dados: {e}")
             raise
         finally:
-            conn.close()
+            self._local.depth -= 1
+            if self._local.depth == 0 and conn.in_transaction:
+                conn.rollback()
+    
+    def _commit(self, conn: sqlite3.Connection):
+        """Confirmar a transação (no grupo da fila de gravação, o commit é do grupo)"""
+        if not getattr(self._local, 'group', False):
+            conn.commit()
+    
+    def close(self):
+        """Fechar as conexões abertas por todas as threads"""
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
     
     def _init_tables(self):
         """Inicializar tabelas do banco se não existirem"""
         with self.get_connection() as conn:
+            # Só tem efeito em arquivo novo (ou no próximo VACUUM): permite incremental_vacuum
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            
+            # WAL: leituras da API não esperam as gravações do scraper (modo persistente no arquivo)
+            journal_mode = self.config.get_db_journal_mode()
+            mode = conn.execute(f"PRAGMA journal_mode = {journal_mode}").fetchone()[0]
+            if mode.lower() != journal_mode.lower():
+                logger.warning(f"⚠️  journal_mode {journal_mode} não aplicado (atual: {mode})")
+            
             # Tabela de clientes
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS clients (
@@ -125,11 +231,158 @@ class Database:
                 )
             """)
             
+            # Marcas d'água dos feeds RSS (tabela exclusiva do scraper)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS feed_state (
+                    source_id TEXT PRIMARY KEY,
+                    last_guid TEXT,
+                    last_entry_at INTEGER,
+                    seen_guids TEXT, -- JSON
+                    etag TEXT,
+                    last_modified TEXT,
+                    last_checked_at INTEGER,
+                    last_new_entries INTEGER DEFAULT 0,
+                    total_new_entries INTEGER DEFAULT 0,
+                    FOREIGN KEY (source_id) REFERENCES sources (id) ON DELETE CASCADE
+                )
+            """)
+            
             conn.commit()
-            logger.info("✅ Tabelas inicializadas com sucesso")
+            
+            # Índices e demais alterações versionadas
+            version = apply_migrations(conn)
+            self._has_fts = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contents_fts'"
+            ).fetchone() is not None
+            self._load_compression_dicts(conn)
+            conn.execute("PRAGMA optimize")
+            logger.info(f"✅ Tabelas inicializadas com sucesso (schema v{version})")
+        
+        if self.config.is_db_query_plan_check_enabled():
+            self.check_query_plans()
+    
+    def _load_compression_dicts(self, conn: sqlite3.Connection):
+        """Carregar os dicionários zstd (necessários para ler linhas comprimidas com eles)"""
+        if not HAS_ZSTD:
+            return
+        rows = conn.execute("SELECT id, data FROM compression_dicts WHERE codec = 'zstd'").fetchall()
+        self.codec.load_dictionaries({row['id']: row['data'] for row in rows})
+    
+    def _sync_search_index(self, conn: sqlite3.Connection):
+        """
+        Esvaziar a fila de reindexação das linhas comprimidas ou com body_hash
+        
+        Os triggers só indexam TEXT; alterações nas demais linhas (deste ou de
+        outro processo) ficam em contents_fts_pending com os valores antigos.
+        Por linha, a entrada mais antiga é o que está no índice: ela é
+        removida e o estado atual da linha, se ela ainda existe, é inserido.
+        
+        Args:
+            conn: Conexão dentro da transação da gravação
+        """
+        if not self._has_fts:
+            return
+        if not conn.execute("SELECT 1 FROM contents_fts_pending LIMIT 1").fetchone():
+            return
+        conn.execute("""
+            INSERT INTO contents_fts (contents_fts, rowid, title, summary, content_text)
+            SELECT 'delete', content_rowid, title, summary, content_plain(content_text)
+            FROM contents_fts_pending
+            WHERE has_old AND id IN (SELECT MIN(id) FROM contents_fts_pending GROUP BY content_rowid)
+        """)
+        conn.execute(f"""
+            INSERT INTO contents_fts (rowid, title, summary, content_text)
+            SELECT rowid, title, summary, content_plain({CONTENT_TEXT_SQL}) FROM contents
+            WHERE rowid IN (SELECT content_rowid FROM contents_fts_pending)
+        """)
+        conn.execute("DELETE FROM contents_fts_pending")
+    
+    @staticmethod
+    def _content_columns(fields=CONTENT_FIELDS) -> str:
+        """Colunas de contents para um SELECT, com content_text resolvido"""
+        return ', '.join(
+            f"{CONTENT_TEXT_SQL} AS content_text" if field == 'content_text' else field
+            for field in fields
+        )
+    
+    def _store_bodies(self, conn: sqlite3.Connection, texts: List[Optional[str]]) -> List[Optional[str]]:
+        """
+        Gravar textos em content_bodies (um registro por hash) dentro da transação atual
+        
+        Returns:
+            Hash de cada texto (None para texto vazio)
+        """
+        hashes = [make_body_hash(text) if text else None for text in texts]
+        created_at = int(datetime.now().timestamp() * 1000)
+        bodies = {digest: text for digest, text in zip(hashes, texts) if digest}
+        conn.executemany(
+            "INSERT OR IGNORE INTO content_bodies (hash, body, created_at) VALUES (?, ?, ?)",
+            [(digest, self.codec.compress(text), created_at) for digest, text in bodies.items()]
+        )
+        return hashes
+    
+    @staticmethod
+    def _prune_bodies(conn: sqlite3.Connection, hashes):
+        """Apagar corpos que nenhum conteúdo referencia mais"""
+        conn.executemany("""
+            DELETE FROM content_bodies
+            WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM contents WHERE body_hash = ?)
+        """, [(digest, digest) for digest in set(hashes) if digest])
+    
+    def check_query_plans(self) -> Dict[str, List[str]]:
+        """
+        Rodar EXPLAIN QUERY PLAN nas consultas quentes e avisar sobre varreduras completas
+        
+        Returns:
+            Passos do plano de cada consulta
+        """
+        plans = {}
+        with self.get_connection() as conn:
+            for name, sql, params in HOT_QUERIES:
+                steps = [row['detail'] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+                plans[name] = steps
+                
+                problems = [
+                    step for step in steps
+                    if (step.startswith('SCAN') and 'INDEX' not in step) or 'TEMP B-TREE' in step
+                ]
+                if problems:
+                    logger.warning(f"⚠️  Plano de consulta ruim em {name}: {'; '.join(problems)}")
+        return plans
+    
+    def _sync_lookup_cache(self, conn: sqlite3.Connection):
+        """
+        Invalidar o cache se outra conexão alterou clients/sources
+        
+        PRAGMA data_version só muda quando outra conexão (thread ou processo)
+        grava no banco; nesse caso a versão mantida pelos triggers diz se
+        foram clients/sources. Gravações desta conexão invalidam direto.
+        """
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if getattr(self._local, 'data_version', None) == data_version:
+            return
+        self._local.data_version = data_version
+        version = conn.execute("SELECT version FROM lookup_version WHERE id = 1").fetchone()[0]
+        if version != self.lookup_cache.version:
+            self.lookup_cache.invalidate(version)
+    
+    def _cached_lookup(self, key: tuple, loader):
+        """Consulta de clients/sources pelo cache (cópia da lista: o cache não é alterado pelo chamador)"""
+        if self.lookup_cache.enabled and self._check_lookup_version:
+            with self.get_connection() as conn:
+                self._sync_lookup_cache(conn)
+        return list(self.lookup_cache.get(key, loader))
+    
+    def _invalidate_lookups(self, conn: sqlite3.Connection):
+        """Hook das gravações em clients/sources (depois do commit)"""
+        version = conn.execute("SELECT version FROM lookup_version WHERE id = 1").fetchone()[0]
+        self.lookup_cache.invalidate(version)
     
     def get_clients(self) -> List[Client]:
         """Obter todos os clientes"""
+        return self._cached_lookup(('clients',), self._load_clients)
+    
+    def _load_clients(self) -> List[Client]:
         with self.get_connection() as conn:
             cursor = conn.execute("SELECT * FROM clients")
             rows = cursor.fetchall()
@@ -149,6 +402,9 @@ class Database:
     
     def get_sources_by_client(self, client_id: str) -> List[Source]:
         """Obter fontes de um cliente"""
+        return self._cached_lookup(('sources', client_id), lambda: self._load_sources_by_client(client_id))
+    
+    def _load_sources_by_client(self, client_id: str) -> List[Source]:
         with self.get_connection() as conn:
             cursor = conn.execute(
                 "SELECT * FROM sources WHERE client_id = ? AND is_active = 1",
@@ -173,6 +429,9 @@ class Database:
     
     def get_all_active_sources(self) -> List[Source]:
         """Obter todas as fontes ativas"""
+        return self._cached_lookup(('active_sources',), self._load_all_active_sources)
+    
+    def _load_all_active_sources(self) -> List[Source]:
         with self.get_connection() as conn:
             cursor = conn.execute("SELECT * FROM sources WHERE is_active = 1")
             rows = cursor.fetchall()
@@ -192,64 +451,773 @@ class Database:
             
             return sources
     
+    def save_sources_bulk(self, sources: List[Source]) -> List[str]:
+        """
+        Criar fontes em lote (uma transação)
+        
+        Fontes com URL já cadastrada para o mesmo cliente (ou repetidas no
+        lote) são ignoradas.
+        
+        Args:
+            sources: Fontes a criar
+            
+        Returns:
+            IDs das fontes criadas
+        """
+        if not sources:
+            return []
+        
+        with self.get_connection() as conn:
+            client_ids = {source.client_id for source in sources}
+            placeholders = ','.join('?' * len(client_ids))
+            cursor = conn.execute(
+                f"SELECT client_id, url FROM sources WHERE client_id IN ({placeholders})",
+                tuple(client_ids)
+            )
+            existing = {(row['client_id'], row['url']) for row in cursor.fetchall()}
+            
+            rows = []
+            for source in sources:
+                key = (source.client_id, source.url)
+                if key in existing:
+                    continue
+                existing.add(key)
+                rows.append((
+                    source.id,
+                    source.client_id,
+                    source.name,
+                    source.url,
+                    source.type.value,
+                    int(source.is_active),
+                    int(source.created_at.timestamp() * 1000)
+                ))
+            
+            conn.executemany("""
+                INSERT INTO sources (id, client_id, name, url, type, is_active, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            
+            self._commit(conn)
+            if rows:
+                self._invalidate_lookups(conn)
+            logger.info(f"💾 {len(rows)} fontes criadas ({len(sources) - len(rows)} já existentes)")
+            return [row[0] for row in rows]
+    
     def save_content(self, content: ScrapedContent, source_id: str, client_id: str) -> str:
         """Salvar conteúdo no banco de dados"""
-        content_id = f"content_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(content.url)}"
+        return self.save_contents_bulk([content], source_id, client_id)[0]
+    
+    def save_contents_bulk(self, contents: List[ScrapedContent], source_id: str,
+                           client_id: str) -> List[Optional[str]]:
+        """
+        Salvar conteúdos de uma fonte em uma única transação
+        
+        O ID é derivado do cliente e da URL normalizada (o mesmo em qualquer
+        worker). Os IDs e URLs já cadastrados no cliente são consultados de uma
+        vez (em lotes de parâmetros) e os novos são inseridos com executemany;
+        o ON CONFLICT DO NOTHING cobre gravações concorrentes (backend Node).
+        
+        Args:
+            contents: Conteúdos coletados
+            source_id: ID da fonte
+            client_id: ID do cliente
+            
+        Returns:
+            ID de cada conteúdo na ordem recebida, ou None se ele já existia
+        """
+        if not contents:
+            return []
+        
+        scraped_at = int(datetime.now().timestamp() * 1000)
+        content_ids = [make_content_id(client_id, content.url) for content in contents]
         
         with self.get_connection() as conn:
-            # Verificar se o conteúdo já existe
-            cursor = conn.execute("SELECT id FROM contents WHERE url = ?", (content.url,))
-            if cursor.fetchone():
-                logger.info(f"📄 Conteúdo já existe: {content.url}")
-                return None
+            # Lock de escrita desde a checagem: nenhum outro escritor insere entre ela e o INSERT
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
             
-            # Inserir novo conteúdo
-            conn.execute("""
+            # Por ID (variações da mesma URL) e por URL (linhas com IDs antigos ou do backend Node)
+            existing = set()
+            for column, keys, scope in (
+                ('id', content_ids, ""),
+                ('url', [content.url for content in contents], "client_id = ? AND "),
+            ):
+                keys = list(dict.fromkeys(keys))
+                for i in range(0, len(keys), SQLITE_MAX_PARAMS):
+                    chunk = keys[i:i + SQLITE_MAX_PARAMS]
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor = conn.execute(
+                        f"SELECT {column} FROM contents WHERE {scope}{column} IN ({placeholders})",
+                        ([client_id] if scope else []) + chunk
+                    )
+                    existing.update(row[column] for row in cursor.fetchall())
+            
+            ids: List[Optional[str]] = []
+            new_contents = []
+            for content, content_id in zip(contents, content_ids):
+                if content_id in existing or content.url in existing:
+                    logger.info(f"📄 Conteúdo já existe: {content.url}")
+                    ids.append(None)
+                    continue
+                # Repetida no próprio lote: só a primeira ocorrência é gravada
+                existing.add(content_id)
+                ids.append(content_id)
+                new_contents.append((content_id, content))
+            
+            if self.body_store:
+                hashes = self._store_bodies(conn, [content.content_text for _, content in new_contents])
+            else:
+                hashes = [None] * len(new_contents)
+            rows = [
+                (
+                    content_id,
+                    source_id,
+                    client_id,
+                    content.title,
+                    content.url,
+                    None if digest else self.codec.compress(content.content_text),
+                    digest,
+                    content.summary,
+                    json.dumps(content.tags) if content.tags else None,
+                    int(content.published_at.timestamp() * 1000) if content.published_at else None,
+                    scraped_at,
+                    0
+                )
+                for (content_id, content), digest in zip(new_contents, hashes)
+            ]
+            
+            conn.executemany("""
                 INSERT INTO contents (
-                    id, source_id, client_id, title, url, content_text, 
+                    id, source_id, client_id, title, url, content_text, body_hash,
                     summary, topics, published_at, scraped_at, is_analyzed
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                content_id,
-                source_id,
-                client_id,
-                content.title,
-                content.url,
-                content.content_text,
-                content.summary,
-                json.dumps(content.tags) if content.tags else None,
-                int(content.published_at.timestamp() * 1000) if content.published_at else None,
-                int(datetime.now().timestamp() * 1000),
-                0
-            ))
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING
+            """, rows)
+            self._sync_search_index(conn)
             
-            conn.commit()
-            logger.info(f"💾 Conteúdo salvo: {content.title}")
-            return content_id
+            self._commit(conn)
+        
+        if len(contents) == 1:
+            if ids[0]:
+                logger.info(f"💾 Conteúdo salvo: {contents[0].title}")
+        else:
+            logger.info(f"💾 {len(rows)} conteúdos salvos ({len(contents) - len(rows)} já existentes)")
+        return ids
+    
+    def update_contents_bulk(self, contents: List[ScrapedContent]) -> int:
+        """
+        Atualizar conteúdos existentes (por URL) em uma única transação
+        
+        Usado pela re-extração: título, texto, resumo e tags são substituídos;
+        a data de publicação só é trocada se a nova extração encontrou uma.
+        
+        Args:
+            contents: Conteúdos re-extraídos
+            
+        Returns:
+            Número de URLs encontradas (a mesma URL pode existir em vários
+            clientes: todas as linhas dela são atualizadas, mas contam uma vez)
+        """
+        if not contents:
+            return 0
+        
+        urls = [(content.url,) for content in contents]
+        with self.get_connection() as conn:
+            # Corpos substituídos, apagados no fim se ninguém mais os referencia
+            old_hashes = []
+            matched = 0
+            for params in urls:
+                rows = conn.execute("SELECT body_hash FROM contents WHERE url = ?", params).fetchall()
+                matched += 1 if rows else 0
+                old_hashes.extend(row['body_hash'] for row in rows if row['body_hash'] is not None)
+            if self.body_store:
+                hashes = self._store_bodies(conn, [content.content_text for content in contents])
+            else:
+                hashes = [None] * len(contents)
+            conn.executemany("""
+                UPDATE contents SET
+                    title = ?,
+                    content_text = ?,
+                    body_hash = ?,
+                    summary = ?,
+                    topics = ?,
+                    published_at = COALESCE(?, published_at)
+                WHERE url = ?
+            """, [
+                (
+                    content.title,
+                    None if digest else self.codec.compress(content.content_text),
+                    digest,
+                    content.summary,
+                    json.dumps(content.tags) if content.tags else None,
+                    int(content.published_at.timestamp() * 1000) if content.published_at else None,
+                    content.url
+                )
+                for content, digest in zip(contents, hashes)
+            ])
+            self._sync_search_index(conn)
+            self._prune_bodies(conn, old_hashes)
+            
+            self._commit(conn)
+            return matched
     
     def update_source_last_scraped(self, source_id: str):
-        """Atualizar data do último scraping da fonte"""
+        """
+        Atualizar data do último scraping da fonte
+        
+        Não invalida o cache de consultas: as fontes em cache podem ter um
+        last_scraped_at até DB_LOOKUP_CACHE_TTL mais antigo, o que só faz o
+        filtro por data (sitemaps) pegar artigos a mais.
+        """
         with self.get_connection() as conn:
             conn.execute(
                 "UPDATE sources SET last_scraped_at = ? WHERE id = ?",
                 (int(datetime.now().timestamp() * 1000), source_id)
             )
-            conn.commit()
+            self._commit(conn)
+    
+    def save_source_results(self, contents: List[ScrapedContent], source_id: str, client_id: str,
+                            feed_state: Optional[FeedState] = None) -> List[Optional[str]]:
+        """
+        Gravar o resultado da coleta de uma fonte em uma transação
+        
+        Conteúdos, marca d'água do feed e data do último scraping juntos: a
+        marca d'água nunca avança sem os conteúdos que ela cobre.
+        
+        Returns:
+            Retorno de save_contents_bulk
+        """
+        with self.get_connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            group = getattr(self._local, 'group', False)
+            # Os métodos abaixo deixam o commit para cá
+            self._local.group = True
+            try:
+                saved_ids = self.save_contents_bulk(contents, source_id, client_id)
+                if feed_state is not None:
+                    self.save_feed_state(feed_state)
+                self.update_source_last_scraped(source_id)
+            finally:
+                self._local.group = group
+            self._commit(conn)
+            return saved_ids
+    
+    def _row_to_feed_state(self, row: sqlite3.Row) -> FeedState:
+        return FeedState(
+            source_id=row['source_id'],
+            last_guid=row['last_guid'],
+            last_entry_at=datetime.fromtimestamp(row['last_entry_at'] / 1000) if row['last_entry_at'] else None,
+            seen_guids=json.loads(row['seen_guids']) if row['seen_guids'] else [],
+            etag=row['etag'],
+            last_modified=row['last_modified'],
+            last_checked_at=datetime.fromtimestamp(row['last_checked_at'] / 1000) if row['last_checked_at'] else None,
+            last_new_entries=row['last_new_entries'] or 0,
+            total_new_entries=row['total_new_entries'] or 0
+        )
+    
+    def get_feed_state(self, source_id: str) -> Optional[FeedState]:
+        """Obter a marca d'água de um feed"""
+        with self.get_connection() as conn:
+            cursor = conn.execute("SELECT * FROM feed_state WHERE source_id = ?", (source_id,))
+            row = cursor.fetchone()
+            return self._row_to_feed_state(row) if row else None
+    
+    def get_feed_states(self) -> List[FeedState]:
+        """Obter as marcas d'água de todos os feeds"""
+        with self.get_connection() as conn:
+            cursor = conn.execute("SELECT * FROM feed_state ORDER BY last_checked_at DESC")
+            return [self._row_to_feed_state(row) for row in cursor.fetchall()]
+    
+    def save_feed_state(self, state: FeedState):
+        """Gravar (inserir ou substituir) a marca d'água de um feed"""
+        with self.get_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO feed_state (
+                    source_id, last_guid, last_entry_at, seen_guids, etag,
+                    last_modified, last_checked_at, last_new_entries, total_new_entries
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                state.source_id,
+                state.last_guid,
+                int(state.last_entry_at.timestamp() * 1000) if state.last_entry_at else None,
+                json.dumps(state.seen_guids),
+                state.etag,
+                state.last_modified,
+                int(state.last_checked_at.timestamp() * 1000) if state.last_checked_at else None,
+                state.last_new_entries,
+                state.total_new_entries
+            ))
+            self._commit(conn)
     
     def get_contents_by_client(self, client_id: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Obter conteúdos de um cliente"""
+        return self.get_contents_page(client_id, limit)[0]
+    
+    @staticmethod
+    def _encode_cursor(scraped_at: int, content_id: str) -> str:
+        raw = json.dumps([scraped_at, content_id], separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[int, str]:
+        """Raises ValueError se o cursor for inválido"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            scraped_at, content_id = json.loads(raw)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Cursor inválido: {cursor}") from e
+        if not isinstance(scraped_at, int) or not isinstance(content_id, str):
+            raise ValueError(f"Cursor inválido: {cursor}")
+        return scraped_at, content_id
+    
+    def get_contents_page(self, client_id: str, limit: int = 100, cursor: Optional[str] = None,
+                          fields: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Obter uma página de conteúdos de um cliente, mais recentes primeiro
+        
+        Paginação por chave (scraped_at, id): o custo de cada página não cresce
+        com a profundidade, ao contrário de OFFSET. Projeções só com colunas de
+        lista (sem content_text/summary/topics) são servidas pelo índice.
+        
+        Args:
+            client_id: ID do cliente
+            limit: Tamanho da página
+            cursor: Cursor opaco retornado pela página anterior
+            fields: Colunas a retornar (default: todas); id e scraped_at sempre vêm
+            
+        Returns:
+            Conteúdos da página e o cursor da próxima (None na última página)
+            
+        Raises:
+            ValueError: Se o cursor, o limite ou algum campo for inválido
+        """
+        # LIMIT negativo no SQLite é "sem limite"
+        if limit < 1:
+            raise ValueError("limit deve ser maior que zero")
+        if fields:
+            unknown = [field for field in fields if field not in CONTENT_FIELDS]
+            if unknown:
+                raise ValueError(f"Campos inválidos: {', '.join(unknown)}")
+            columns = self._content_columns(dict.fromkeys(['id', 'scraped_at', *fields]))
+        else:
+            columns = self._content_columns()
+        
+        sql = f"SELECT {columns} FROM contents WHERE client_id = ?"
+        params: List[Any] = [client_id]
+        if cursor:
+            scraped_at, content_id = self._decode_cursor(cursor)
+            sql += " AND (scraped_at, id) < (?, ?)"
+            params.extend([scraped_at, content_id])
+        sql += " ORDER BY scraped_at DESC, id DESC LIMIT ?"
+        # Uma linha a mais indica se existe próxima página
+        params.append(limit + 1)
+        
+        with self.get_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        
+        contents = [dict(row) for row in rows[:limit]]
+        for content in contents:
+            if 'content_text' in content:
+                content['content_text'] = self.codec.decompress(content['content_text'])
+        next_cursor = None
+        if len(rows) > limit and contents:
+            last = contents[-1]
+            next_cursor = self._encode_cursor(last['scraped_at'], last['id'])
+        return contents, next_cursor
+    
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """
+        Converter texto livre em consulta FTS5 segura
+        
+        Cada termo vira uma frase entre aspas (sem operadores acidentais como
+        '-' ou ':'); termos terminados em '*' mantêm a busca por prefixo.
+        """
+        terms = []
+        for term in text.split():
+            prefix = term.endswith('*')
+            term = term.rstrip('*').replace('"', '""')
+            if term:
+                terms.append(f'"{term}"' + ('*' if prefix else ''))
+        return ' '.join(terms)
+    
+    def has_search_index(self) -> bool:
+        """
+        Verificar se o índice FTS5 existe (SQLite sem FTS5 não o cria)
+        
+        Só utilizável pelas conexões do Database: o conteúdo do índice vem da
+        view contents_search, que chama content_plain.
+        """
+        return self._has_fts
+    
+    def search_contents(self, client_id: str, query: str, limit: int = 20,
+                        offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Buscar conteúdos de um cliente no índice FTS5, ordenados por BM25
+        
+        Args:
+            client_id: ID do cliente
+            query: Texto da busca (todos os termos precisam aparecer; 'term*' busca prefixo)
+            limit: Número máximo de resultados
+            offset: Resultados a pular (paginação)
+            
+        Returns:
+            Conteúdos com rank (menor = mais relevante) e trecho com os termos marcados
+        """
+        match = self._fts_query(query)
+        if not match:
+            return []
+        
+        with self.get_connection() as conn:
+            # Alterações de outros processos em linhas comprimidas ainda na fila
+            if self._has_fts and conn.execute("SELECT 1 FROM contents_fts_pending LIMIT 1").fetchone():
+                conn.execute("BEGIN IMMEDIATE")
+                self._sync_search_index(conn)
+                conn.commit()
+            
+            cursor = conn.execute("""
+                SELECT
+                    c.id, c.source_id, c.client_id, c.title, c.url, c.summary,
+                    c.published_at, c.scraped_at,
+                    f.rank AS rank,
+                    snippet(contents_fts, -1, '<mark>', '</mark>', '…', 24) AS snippet
+                FROM contents_fts f
+                JOIN contents c ON c.rowid = f.rowid
+                WHERE contents_fts MATCH ? AND c.client_id = ?
+                ORDER BY f.rank
+                LIMIT ? OFFSET ?
+            """, (match, client_id, limit, offset))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def rebuild_search_index(self):
+        """Reconstruir o índice FTS5 a partir de contents (ex.: depois de um VACUUM)"""
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT INTO contents_fts (contents_fts) VALUES ('rebuild')")
+            # A reconstrução já reflete o estado atual das linhas da fila
+            conn.execute("DELETE FROM contents_fts_pending")
+            conn.commit()
+            logger.info("🔎 Índice de busca reconstruído")
+    
+    def check_integrity(self) -> List[str]:
+        """
+        PRAGMA integrity_check e verificação do índice de busca contra contents
+        
+        Deve rodar por aqui, não pelo sqlite3 de linha de comando: desde o
+        SQLite 3.44 o integrity_check também lê as tabelas FTS5, e o conteúdo
+        de contents_fts depende da função content_plain, que só existe nas
+        conexões do Database.
+        
+        Returns:
+            Problemas encontrados (lista vazia = banco íntegro)
+        """
+        with self.get_connection() as conn:
+            problems = [row[0] for row in conn.execute("PRAGMA integrity_check").fetchall() if row[0] != 'ok']
+            if self._has_fts:
+                try:
+                    # rank = 1: compara o índice com o conteúdo da view contents_search
+                    conn.execute("INSERT INTO contents_fts (contents_fts, rank) VALUES ('integrity-check', 1)")
+                except sqlite3.DatabaseError as e:
+                    problems.append(f"contents_fts: {e}")
+            if conn.in_transaction:
+                conn.rollback()
+            return problems
+    
+    def _row_to_retention_policy(self, row: sqlite3.Row) -> RetentionPolicy:
+        return RetentionPolicy(
+            client_id=row['client_id'],
+            hot_days=row['hot_days'],
+            delete_analyzed_days=row['delete_analyzed_days'],
+            updated_at=datetime.fromtimestamp(row['updated_at'] / 1000) if row['updated_at'] else None
+        )
+    
+    def get_retention_policy(self, client_id: str) -> RetentionPolicy:
+        """Obter a política de retenção de um cliente (sem registro: tudo padrão)"""
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT * FROM retention_policies WHERE client_id = ?", (client_id,)).fetchone()
+            return self._row_to_retention_policy(row) if row else RetentionPolicy(client_id=client_id)
+    
+    def save_retention_policy(self, policy: RetentionPolicy):
+        """Gravar (inserir ou substituir) a política de retenção de um cliente"""
+        with self.get_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO retention_policies (client_id, hot_days, delete_analyzed_days, updated_at)
+                VALUES (?, ?, ?, ?)
+            """, (
+                policy.client_id,
+                policy.hot_days,
+                policy.delete_analyzed_days,
+                int(datetime.now().timestamp() * 1000)
+            ))
+            self._commit(conn)
+    
+    def get_brief_content_ids(self) -> set:
+        """IDs de conteúdos citados por pautas (a retenção não os move)"""
         with self.get_connection() as conn:
+            rows = conn.execute("SELECT content_ids FROM briefs WHERE content_ids IS NOT NULL").fetchall()
+        ids = set()
+        for row in rows:
+            try:
+                ids.update(json.loads(row['content_ids']) or [])
+            except (ValueError, TypeError):
+                continue
+        return ids
+    
+    def get_expired_contents(self, client_id: str, before_ms: int, after: Optional[Tuple[int, str]] = None,
+                             analyzed_only: bool = False, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Obter conteúdos de um cliente coletados antes de um instante, mais antigos primeiro
+        
+        Args:
+            client_id: ID do cliente
+            before_ms: Limite de scraped_at (ms)
+            after: Chave (scraped_at, id) do último conteúdo do lote anterior
+            analyzed_only: Só conteúdos já analisados
+            limit: Tamanho do lote
+            
+        Returns:
+            Linhas completas, com content_text descomprimido
+        """
+        sql = f"SELECT {self._content_columns()} FROM contents WHERE client_id = ? AND scraped_at < ?"
+        params: List[Any] = [client_id, before_ms]
+        if after:
+            sql += " AND (scraped_at, id) > (?, ?)"
+            params.extend(after)
+        if analyzed_only:
+            sql += " AND is_analyzed = 1"
+        sql += " ORDER BY scraped_at, id LIMIT ?"
+        params.append(limit)
+        
+        with self.get_connection() as conn:
+            rows = [dict(row) for row in conn.execute(sql, params).fetchall()]
+        for row in rows:
+            row['content_text'] = self.codec.decompress(row['content_text'])
+        return rows
+    
+    def delete_contents(self, content_ids: List[str]) -> int:
+        """
+        Apagar conteúdos por ID em uma transação (índice de busca incluído)
+        
+        Returns:
+            Número de linhas apagadas
+        """
+        if not content_ids:
+            return 0
+        params = [(content_id,) for content_id in content_ids]
+        with self.get_connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            hashes = [
+                row['body_hash']
+                for params_row in params
+                for row in conn.execute("SELECT body_hash FROM contents WHERE id = ? AND body_hash IS NOT NULL", params_row)
+            ]
+            cursor = conn.executemany("DELETE FROM contents WHERE id = ?", params)
+            deleted = cursor.rowcount
+            self._sync_search_index(conn)
+            self._prune_bodies(conn, hashes)
+            self._commit(conn)
+            return deleted
+    
+    def get_vacuum_stats(self) -> Dict[str, Any]:
+        """Modo de auto_vacuum e páginas livres do banco"""
+        with self.get_connection() as conn:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            return {
+                'auto_vacuum': {0: 'none', 1: 'full', 2: 'incremental'}[conn.execute("PRAGMA auto_vacuum").fetchone()[0]],
+                'size_bytes': page_size * conn.execute("PRAGMA page_count").fetchone()[0],
+                'free_bytes': page_size * conn.execute("PRAGMA freelist_count").fetchone()[0]
+            }
+    
+    def incremental_vacuum(self, pages: int) -> int:
+        """
+        Devolver até N páginas livres ao sistema de arquivos (lock curto)
+        
+        Returns:
+            Páginas liberadas (0 se o banco não estiver em auto_vacuum incremental)
+        """
+        with self.get_connection() as conn:
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            # execute() avança o PRAGMA um passo só (uma página); executescript roda até o fim
+            conn.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+            return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+    
+    def enable_incremental_vacuum(self):
+        """
+        Converter um banco existente para auto_vacuum incremental
+        
+        Exige um VACUUM completo (reescreve o arquivo e bloqueia gravações
+        enquanto roda) e reconstrói o índice de busca, cujos rowids mudam.
+        """
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        if self._has_fts:
+            self.rebuild_search_index()
+            # A reconstrução libera as páginas do índice antigo (0 = todas)
+            self.incremental_vacuum(0)
+        logger.info("🧹 auto_vacuum incremental ativado")
+    
+    def get_compression_stats(self) -> Dict[str, Any]:
+        """
+        Taxa de compressão de content_text (lê a coluna inteira: uso administrativo)
+        
+        Returns:
+            Linhas, linhas comprimidas, bytes gravados, bytes originais e taxa
+        """
+        with self.get_connection() as conn:
+            row = conn.execute("""
+                SELECT
+                    COUNT(*) AS rows,
+                    COALESCE(SUM(typeof(content_text) = 'blob'), 0) AS compressed_rows,
+                    COALESCE(SUM(length(CAST(content_text AS BLOB))), 0) AS stored_bytes,
+                    COALESCE(SUM(content_original_length(content_text)), 0) AS original_bytes
+                FROM contents
+            """).fetchone()
+            dictionaries = conn.execute("SELECT COUNT(*) FROM compression_dicts").fetchone()[0]
+            bodies = conn.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM content_bodies) AS bodies,
+                    (SELECT COUNT(*) FROM contents WHERE body_hash IS NOT NULL) AS body_refs,
+                    (SELECT COALESCE(SUM(length(CAST(body AS BLOB))), 0) FROM content_bodies) AS body_bytes
+            """).fetchone()
+        
+        stats = dict(row)
+        stats['body_store'] = {'enabled': self.body_store, **dict(bodies)}
+        stats['codec'] = self.codec.codec
+        stats['dictionaries'] = dictionaries
+        stats['ratio'] = round(stats['original_bytes'] / stats['stored_bytes'], 2) if stats['stored_bytes'] else None
+        return stats
+    
+    def train_compression_dictionary(self, sample_size: int = 2000) -> Optional[int]:
+        """
+        Treinar e gravar um dicionário zstd com uma amostra aleatória de content_text
+        
+        Returns:
+            ID do dicionário (novas compressões passam a usá-lo) ou None
+        """
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {CONTENT_TEXT_SQL} AS content_text FROM contents "
+                "WHERE content_text IS NOT NULL OR body_hash IS NOT NULL ORDER BY RANDOM() LIMIT ?",
+                (sample_size,)
+            ).fetchall()
+            samples = [self.codec.decompress(row['content_text']) for row in rows]
+            
+            data = self.codec.train_dictionary(samples, self.config.get_content_compression_dict_size())
+            if data is None:
+                return None
+            
             cursor = conn.execute(
-                "SELECT * FROM contents WHERE client_id = ? ORDER BY scraped_at DESC LIMIT ?",
-                (client_id, limit)
+                "INSERT INTO compression_dicts (codec, data, created_at) VALUES ('zstd', ?, ?)",
+                (data, int(datetime.now().timestamp() * 1000))
             )
-            rows = cursor.fetchall()
+            conn.commit()
+            self._load_compression_dicts(conn)
+            logger.info(f"📚 Dicionário de compressão {cursor.lastrowid} treinado com {len(samples)} amostras")
+            return cursor.lastrowid
+    
+    def recompress_contents(self, batch_size: int = 500, decompress: bool = False,
+                            limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Comprimir (ou descomprimir) o content_text já gravado, em lotes por rowid
+        
+        Cada lote é uma transação curta, para não bloquear as gravações do
+        scraper; o índice de busca é mantido em cada lote.
+        
+        Args:
+            batch_size: Linhas por transação
+            decompress: Voltar as linhas comprimidas para TEXT (antes de desligar a compressão)
+            limit: Número máximo de linhas processadas
             
-            contents = []
-            for row in rows:
-                contents.append(dict(row))
+        Returns:
+            Linhas lidas, alteradas e bytes antes/depois
+        """
+        if not decompress and not self.codec.enabled:
+            raise ValueError("Compressão desligada: defina CONTENT_COMPRESSION=zlib ou zstd")
+        
+        source_type = 'blob' if decompress else 'text'
+        stats = {'rows': 0, 'changed': 0, 'bytes_before': 0, 'bytes_after': 0}
+        last_rowid = 0
+        
+        while limit is None or stats['rows'] < limit:
+            size = batch_size if limit is None else min(batch_size, limit - stats['rows'])
+            with self.get_connection() as conn:
+                # Lock de escrita antes da leitura: ninguém altera o lote até o commit
+                conn.execute("BEGIN IMMEDIATE")
+                rows = conn.execute(f"""
+                    SELECT rowid, content_text FROM contents
+                    WHERE rowid > ? AND typeof(content_text) = '{source_type}'
+                    ORDER BY rowid LIMIT ?
+                """, (last_rowid, size)).fetchall()
+                if not rows:
+                    break
+                last_rowid = rows[-1]['rowid']
+                stats['rows'] += len(rows)
+                
+                updates = []
+                for row in rows:
+                    old = row['content_text']
+                    new = self.codec.decompress(old) if decompress else self.codec.compress(old)
+                    if new is old:
+                        continue
+                    updates.append((new, row['rowid']))
+                    stats['bytes_before'] += len(old) if isinstance(old, bytes) else len(old.encode('utf-8'))
+                    stats['bytes_after'] += len(new) if isinstance(new, bytes) else len(new.encode('utf-8'))
+                
+                conn.executemany("UPDATE contents SET content_text = ? WHERE rowid = ?", updates)
+                self._sync_search_index(conn)
+                conn.commit()
+                stats['changed'] += len(updates)
             
-            return contents
+            logger.info(f"🗜️  {stats['rows']} linhas lidas, {stats['changed']} alteradas")
+        
+        return stats
+    
+    def move_bodies_to_store(self, batch_size: int = 500, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Mover o content_text já gravado para content_bodies, em lotes por rowid
+        
+        Textos idênticos (o mesmo artigo em vários clientes ou URLs) passam a
+        ocupar um registro só. Cada lote é uma transação curta.
+        
+        Args:
+            batch_size: Linhas por transação
+            limit: Número máximo de linhas processadas
+            
+        Returns:
+            Linhas movidas e corpos novos
+        """
+        stats = {'rows': 0, 'bodies': 0}
+        last_rowid = 0
+        
+        while limit is None or stats['rows'] < limit:
+            size = batch_size if limit is None else min(batch_size, limit - stats['rows'])
+            with self.get_connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                rows = conn.execute("""
+                    SELECT rowid, content_text FROM contents
+                    WHERE rowid > ? AND body_hash IS NULL AND content_text IS NOT NULL
+                    ORDER BY rowid LIMIT ?
+                """, (last_rowid, size)).fetchall()
+                if not rows:
+                    break
+                last_rowid = rows[-1]['rowid']
+                
+                bodies_before = conn.execute("SELECT COUNT(*) FROM content_bodies").fetchone()[0]
+                hashes = self._store_bodies(conn, [self.codec.decompress(row['content_text']) for row in rows])
+                conn.executemany(
+                    "UPDATE contents SET content_text = NULL, body_hash = ? WHERE rowid = ?",
+                    [(digest, row['rowid']) for digest, row in zip(hashes, rows) if digest]
+                )
+                self._sync_search_index(conn)
+                stats['bodies'] += conn.execute("SELECT COUNT(*) FROM content_bodies").fetchone()[0] - bodies_before
+                conn.commit()
+                stats['rows'] += len(rows)
+            
+            logger.info(f"📦 {stats['rows']} linhas movidas, {stats['bodies']} corpos novos")
+        
+        return stats
     
     def save_brief(self, brief: Brief) -> str:
         """Salvar pauta no banco de dados"""
@@ -273,6 +1241,6 @@ class Database:
                 brief.generated_by
             ))
             
-            conn.commit()
+            self._commit(conn)
             logger.info(f"💾 Pauta salva: {brief.title}")
             return brief.id
\ No newline at end of file
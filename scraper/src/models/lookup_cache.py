@@ -0,0 +1,90 @@
+"""
+Cache em processo das consultas de clientes e fontes
+Tabelas pequenas e lidas o tempo todo (API, agendador), alteradas poucas vezes ao dia
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class LookupCache:
+    """
+    Cache read-through com TTL e invalidação explícita
+
+    A invalidação descarta tudo: as consultas cacheadas são poucas e baratas
+    de recarregar, e uma gravação em sources afeta várias delas. A versão
+    das tabelas (mantida por triggers, ver Database) evita que uma carga
+    iniciada antes de uma invalidação grave um resultado antigo.
+    """
+
+    def __init__(self, ttl: float):
+        """
+        Inicializar o cache
+
+        Args:
+            ttl: Segundos até uma entrada ser recarregada (0 = cache desligado)
+        """
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        # Incrementado a cada invalidação; cargas de uma geração anterior não são gravadas
+        self._generation = 0
+        self.version: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Obter um valor do cache, carregando-o com loader em caso de falta
+
+        Args:
+            key: Chave da consulta
+            loader: Função que executa a consulta
+        """
+        if not self.enabled:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, version: Optional[int] = None):
+        """Descartar todas as entradas (gravação local ou de outro processo)"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+            if version is not None:
+                self.version = version
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Acertos, faltas e invalidações"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'ttl_seconds': self.ttl,
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'invalidations': self.invalidations,
+                'version': self.version
+            }
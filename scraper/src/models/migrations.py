@@ -0,0 +1,413 @@
+"""
+Migrações versionadas do banco do scraper
+A versão aplicada fica em PRAGMA user_version (o backend Node usa a tabela
+de migrações do drizzle, sem conflito)
+"""
+
+import sqlite3
+from typing import Callable, List, Tuple
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+def _contents_url_index(conn: sqlite3.Connection):
+    """Índice único de URL; com duplicatas antigas, um índice comum no lugar"""
+    try:
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_url ON contents (url)")
+    except sqlite3.IntegrityError:
+        logger.warning("⚠️  Conteúdos com URL duplicada: idx_contents_url criado sem UNIQUE")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_contents_url ON contents (url)")
+
+def _hot_path_indexes(conn: sqlite3.Connection):
+    """Índices das consultas mais frequentes da API e do scraper"""
+    # Listagem de conteúdos do cliente, mais recentes primeiro (sem ordenação em memória)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contents_client_scraped ON contents (client_id, scraped_at DESC)")
+    # Fontes ativas do cliente; url no índice cobre a checagem de duplicatas da importação OPML
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sources_client_active ON sources (client_id, is_active, url)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sources_active ON sources (is_active)")
+
+def _contents_fts(conn: sqlite3.Connection):
+    """
+    Índice FTS5 dos conteúdos (título, resumo e texto), sincronizado por triggers
+
+    Tabela de conteúdo externo: o texto não é duplicado, o índice aponta para
+    o rowid de contents. Um VACUUM completo pode renumerar esses rowids;
+    depois dele, reconstruir com Database.rebuild_search_index().
+    """
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS contents_fts USING fts5(
+                title, summary, content_text,
+                content='contents', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        logger.warning(f"⚠️  FTS5 indisponível neste SQLite, busca desativada: {e}")
+        return
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS contents_fts_insert AFTER INSERT ON contents BEGIN
+            INSERT INTO contents_fts (rowid, title, summary, content_text)
+            VALUES (new.rowid, new.title, new.summary, new.content_text);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS contents_fts_delete AFTER DELETE ON contents BEGIN
+            INSERT INTO contents_fts (contents_fts, rowid, title, summary, content_text)
+            VALUES ('delete', old.rowid, old.title, old.summary, old.content_text);
+        END
+    """)
+    # Só alterações de texto reindexam (marcar como analisado não toca no índice)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS contents_fts_update AFTER UPDATE OF title, summary, content_text ON contents BEGIN
+            INSERT INTO contents_fts (contents_fts, rowid, title, summary, content_text)
+            VALUES ('delete', old.rowid, old.title, old.summary, old.content_text);
+            INSERT INTO contents_fts (rowid, title, summary, content_text)
+            VALUES (new.rowid, new.title, new.summary, new.content_text);
+        END
+    """)
+
+    # BM25 com pesos por coluna: título > resumo > texto
+    conn.execute("INSERT INTO contents_fts (contents_fts, rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0)')")
+    conn.execute("INSERT INTO contents_fts (contents_fts) VALUES ('rebuild')")
+
+def _contents_list_index(conn: sqlite3.Connection):
+    """
+    Índice de listagem com desempate por id (paginação por chave) e colunas de lista
+
+    Cobre as projeções sem texto: a listagem não lê as linhas de contents,
+    cujo content_text ocupa páginas de overflow.
+    """
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_contents_client_list ON contents (
+            client_id, scraped_at DESC, id DESC,
+            source_id, title, url, published_at, is_analyzed
+        )
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_contents_client_scraped")
+
+def _compressed_contents(conn: sqlite3.Connection):
+    """
+    Suporte a content_text comprimido (BLOB): dicionários e busca sobre o texto puro
+
+    O FTS passa a ler o conteúdo pela view contents_search, que descomprime
+    com a função content_plain (registrada nas conexões do scraper). Os
+    triggers só indexam linhas com TEXT, então gravações de outros processos
+    (backend Node) continuam funcionando; linhas comprimidas são indexadas
+    pelo Database (ver a versão 10).
+
+    Consequência: ler contents_fts (MATCH, snippet, count) ou rodar
+    PRAGMA integrity_check fora de uma conexão do Database falha com
+    "no such function: content_plain". Para verificar o banco, usar
+    Database.check_integrity() (python compress_contents.py --check).
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS compression_dicts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            codec TEXT NOT NULL,
+            data BLOB NOT NULL,
+            created_at INTEGER
+        )
+    """)
+
+    has_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contents_fts'"
+    ).fetchone()
+    if not has_fts:
+        return
+
+    for trigger in ('contents_fts_insert', 'contents_fts_delete', 'contents_fts_update'):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP TABLE contents_fts")
+
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS contents_search AS
+        SELECT rowid AS content_rowid, title, summary, content_plain(content_text) AS content_text
+        FROM contents
+    """)
+    conn.execute("""
+        CREATE VIRTUAL TABLE contents_fts USING fts5(
+            title, summary, content_text,
+            content='contents_search', content_rowid='content_rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER contents_fts_insert AFTER INSERT ON contents BEGIN
+            INSERT INTO contents_fts (rowid, title, summary, content_text)
+            SELECT new.rowid, new.title, new.summary, new.content_text
+            WHERE typeof(new.content_text) != 'blob';
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER contents_fts_delete AFTER DELETE ON contents BEGIN
+            INSERT INTO contents_fts (contents_fts, rowid, title, summary, content_text)
+            SELECT 'delete', old.rowid, old.title, old.summary, old.content_text
+            WHERE typeof(old.content_text) != 'blob';
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER contents_fts_update AFTER UPDATE OF title, summary, content_text ON contents BEGIN
+            INSERT INTO contents_fts (contents_fts, rowid, title, summary, content_text)
+            SELECT 'delete', old.rowid, old.title, old.summary, old.content_text
+            WHERE typeof(old.content_text) != 'blob';
+            INSERT INTO contents_fts (rowid, title, summary, content_text)
+            SELECT new.rowid, new.title, new.summary, new.content_text
+            WHERE typeof(new.content_text) != 'blob';
+        END
+    """)
+
+    conn.execute("INSERT INTO contents_fts (contents_fts, rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0)')")
+    conn.execute("INSERT INTO contents_fts (contents_fts) VALUES ('rebuild')")
+
+def _retention_policies(conn: sqlite3.Connection):
+    """Políticas de retenção por cliente (tabela exclusiva do scraper)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS retention_policies (
+            client_id TEXT PRIMARY KEY,
+            hot_days INTEGER,
+            delete_analyzed_days INTEGER,
+            updated_at INTEGER
+        )
+    """)
+
+def _content_bodies(conn: sqlite3.Connection):
+    """
+    Corpos de conteúdo deduplicados por hash e URL única por cliente
+
+    Com CONTENT_BODY_STORE=true, content_text fica NULL e body_hash aponta
+    para content_bodies (o mesmo texto é gravado uma vez só). A URL passa a
+    ser única por cliente: o mesmo artigo pode ser coletado para vários
+    clientes, cada um com a sua linha.
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(contents)")]
+    if 'body_hash' not in columns:
+        conn.execute("ALTER TABLE contents ADD COLUMN body_hash TEXT")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS content_bodies (
+            hash TEXT PRIMARY KEY,
+            body,
+            created_at INTEGER
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contents_body_hash ON contents (body_hash) WHERE body_hash IS NOT NULL")
+
+    conn.execute("DROP INDEX IF EXISTS idx_contents_url")
+    try:
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_client_url ON contents (client_id, url)")
+    except sqlite3.IntegrityError:
+        logger.warning("⚠️  Conteúdos com URL duplicada no cliente: idx_contents_client_url criado sem UNIQUE")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_contents_client_url ON contents (client_id, url)")
+    # Re-extração e arquivo localizam conteúdos só pela URL
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contents_url ON contents (url)")
+
+    has_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contents_fts'"
+    ).fetchone()
+    if not has_fts:
+        return
+
+    # Mesma estrutura da versão 5; linhas com body_hash também são indexadas pelo Database
+    conn.execute("DROP VIEW IF EXISTS contents_search")
+    conn.execute("""
+        CREATE VIEW contents_search AS
+        SELECT
+            rowid AS content_rowid, title, summary,
+            content_plain(COALESCE(content_text, (SELECT body FROM content_bodies WHERE hash = contents.body_hash)))
+                AS content_text
+        FROM contents
+    """)
+    for trigger in ('contents_fts_insert', 'contents_fts_delete', 'contents_fts_update'):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("""
+        CREATE TRIGGER contents_fts_insert AFTER INSERT ON contents BEGIN
+            INSERT INTO contents_fts (rowid, title, summary, content_text)
+            SELECT new.rowid, new.title, new.summary, new.content_text
+            WHERE typeof(new.content_text) != 'blob' AND new.body_hash IS NULL;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER contents_fts_delete AFTER DELETE ON contents BEGIN
+            INSERT INTO contents_fts (contents_fts, rowid, title, summary, content_text)
+            SELECT 'delete', old.rowid, old.title, old.summary, old.content_text
+            WHERE typeof(old.content_text) != 'blob' AND old.body_hash IS NULL;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER contents_fts_update AFTER UPDATE OF title, summary, content_text, body_hash ON contents BEGIN
+            INSERT INTO contents_fts (contents_fts, rowid, title, summary, content_text)
+            SELECT 'delete', old.rowid, old.title, old.summary, old.content_text
+            WHERE typeof(old.content_text) != 'blob' AND old.body_hash IS NULL;
+            INSERT INTO contents_fts (rowid, title, summary, content_text)
+            SELECT new.rowid, new.title, new.summary, new.content_text
+            WHERE typeof(new.content_text) != 'blob' AND new.body_hash IS NULL;
+        END
+    """)
+
+def _lookup_version(conn: sqlite3.Connection):
+    """
+    Versão de clients/sources, incrementada por triggers a cada alteração
+
+    Invalida o cache de consultas do scraper também quando quem grava é
+    outro processo (backend Node, outro worker).
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS lookup_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    conn.execute("INSERT OR IGNORE INTO lookup_version (id, version) VALUES (1, 0)")
+    for table in ('clients', 'sources'):
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_lookup_{event.lower()} AFTER {event} ON {table} BEGIN
+                    UPDATE lookup_version SET version = version + 1 WHERE id = 1;
+                END
+            """)
+
+def _lookup_version_columns(conn: sqlite3.Connection):
+    """
+    Trigger de UPDATE em sources só para as colunas das consultas
+
+    last_scraped_at muda a cada fonte coletada; com o trigger genérico cada
+    coleta invalidava o cache de todos os processos justamente quando o
+    agendador mais lê.
+    """
+    conn.execute("DROP TRIGGER IF EXISTS sources_lookup_update")
+    conn.execute("""
+        CREATE TRIGGER sources_lookup_update
+        AFTER UPDATE OF id, client_id, name, url, type, is_active ON sources BEGIN
+            UPDATE lookup_version SET version = version + 1 WHERE id = 1;
+        END
+    """)
+
+def _search_index_pending(conn: sqlite3.Connection):
+    """
+    Fila de reindexação das linhas comprimidas ou com body_hash
+
+    Os triggers não conseguem indexar essas linhas (content_plain só existe
+    nas conexões do scraper), e antes as ignoravam: um título alterado pelo
+    backend Node em uma linha comprimida deixava o FTS desatualizado. Agora
+    os triggers só tratam direto linhas TEXT sem entradas na fila; as demais
+    alterações gravam na fila os valores antigos (inclusive o corpo de
+    content_bodies, que pode ser apagado na mesma transação). Por linha, a
+    primeira entrada guarda o que está no índice. O Database esvazia a fila
+    nas próprias gravações e antes das buscas (Database._sync_search_index).
+    """
+    has_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contents_fts'"
+    ).fetchone()
+    if not has_fts:
+        return
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS contents_fts_pending (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_rowid INTEGER NOT NULL,
+            has_old INTEGER NOT NULL,
+            title TEXT,
+            summary TEXT,
+            content_text
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contents_fts_pending_rowid ON contents_fts_pending (content_rowid)")
+
+    def direct(row: str) -> str:
+        # Linha TEXT cujo estado no índice é o atual (sem entradas na fila)
+        return (
+            f"typeof({row}.content_text) != 'blob' AND {row}.body_hash IS NULL "
+            f"AND NOT EXISTS (SELECT 1 FROM contents_fts_pending WHERE content_rowid = {row}.rowid)"
+        )
+
+    direct_old = direct('old')
+    direct_new = direct('new')
+    managed_new = "(typeof(new.content_text) = 'blob' OR new.body_hash IS NOT NULL)"
+    queue_old = """
+        INSERT INTO contents_fts_pending (content_rowid, has_old, title, summary, content_text)
+        SELECT old.rowid, 1, old.title, old.summary,
+               COALESCE(old.content_text, (SELECT body FROM content_bodies WHERE hash = old.body_hash))
+    """
+
+    for trigger in ('contents_fts_insert', 'contents_fts_delete', 'contents_fts_update'):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute(f"""
+        CREATE TRIGGER contents_fts_insert AFTER INSERT ON contents BEGIN
+            INSERT INTO contents_fts (rowid, title, summary, content_text)
+            SELECT new.rowid, new.title, new.summary, new.content_text
+            WHERE {direct_new};
+            INSERT INTO contents_fts_pending (content_rowid, has_old)
+            SELECT new.rowid, 0
+            WHERE {managed_new} OR EXISTS (SELECT 1 FROM contents_fts_pending WHERE content_rowid = new.rowid);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER contents_fts_delete AFTER DELETE ON contents BEGIN
+            INSERT INTO contents_fts (contents_fts, rowid, title, summary, content_text)
+            SELECT 'delete', old.rowid, old.title, old.summary, old.content_text
+            WHERE {direct_old};
+            {queue_old}
+            WHERE NOT ({direct_old});
+        END
+    """)
+    # A fila é gravada primeiro: com uma entrada nela, os ramos diretos não rodam
+    conn.execute(f"""
+        CREATE TRIGGER contents_fts_update AFTER UPDATE OF title, summary, content_text, body_hash ON contents BEGIN
+            {queue_old}
+            WHERE NOT ({direct_old}) OR {managed_new};
+            INSERT INTO contents_fts (contents_fts, rowid, title, summary, content_text)
+            SELECT 'delete', old.rowid, old.title, old.summary, old.content_text
+            WHERE {direct_old};
+            INSERT INTO contents_fts (rowid, title, summary, content_text)
+            SELECT new.rowid, new.title, new.summary, new.content_text
+            WHERE {direct_new};
+        END
+    """)
+
+# (versão, descrição, função que recebe a conexão dentro da transação)
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "índice de URL dos conteúdos", _contents_url_index),
+    (2, "índices das consultas de listagem", _hot_path_indexes),
+    (3, "índice de busca textual (FTS5)", _contents_fts),
+    (4, "índice de listagem paginada de conteúdos", _contents_list_index),
+    (5, "compressão de content_text", _compressed_contents),
+    (6, "políticas de retenção de conteúdos", _retention_policies),
+    (7, "corpos deduplicados e URL única por cliente", _content_bodies),
+    (8, "versão de clientes e fontes (cache de consultas)", _lookup_version),
+    (9, "versão de fontes ignora last_scraped_at", _lookup_version_columns),
+    (10, "fila de reindexação das linhas comprimidas", _search_index_pending),
+]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Versão de migração aplicada ao banco"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Aplicar as migrações pendentes, cada uma na sua transação
+
+    Args:
+        conn: Conexão com o banco (tabelas já criadas)
+
+    Returns:
+        Versão final do banco
+    """
+    version = get_schema_version(conn)
+    for target, description, migrate in MIGRATIONS:
+        if target <= version:
+            continue
+        logger.info(f"🔧 Migração {target}: {description}")
+        try:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            migrate(conn)
+            # PRAGMA não aceita parâmetros; target vem da lista acima
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = target
+    return version
@@ -0,0 +1,448 @@
+"""
+Arquivo comprimido de páginas brutas (HTML) coletadas pelos scrapers
+Endereçado por conteúdo: segmentos append-only + índice SQLite, leitura via mmap
+"""
+
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from utils.config import Config
+from utils.logger import setup_logger
+
+# Tentar importar zstandard (melhor taxa e velocidade que zlib)
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+# flock coordena processos (API, CLI) que gravam no mesmo arquivo; indisponível no Windows
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+logger = setup_logger()
+
+@dataclass
+class ArchivedPage:
+    """Página bruta recuperada do arquivo"""
+    url: str
+    content_hash: str
+    fetched_at: datetime
+    status: Optional[int]
+    content_type: Optional[str]
+    encoding: Optional[str]
+    body: bytes
+
+class PageArchive:
+    """
+    Arquivo de respostas HTTP brutas, deduplicado por hash do corpo
+
+    Vários processos podem usar o mesmo diretório: gravações e retenção
+    tomam um flock exclusivo em archive.lock e leituras um compartilhado,
+    então o offset gravado no índice é sempre o fim real do segmento e a
+    compactação não remove um segmento no meio de uma leitura. Sem fcntl
+    (Windows), o arquivo deve ter um único processo escritor.
+    """
+
+    SEGMENT_PREFIX = "segment-"
+    SEGMENT_SUFFIX = ".bin"
+
+    def __init__(self, archive_dir: Optional[Path] = None):
+        """
+        Inicializar o arquivo
+
+        Args:
+            archive_dir: Diretório do arquivo (default: ARCHIVE_DIR)
+        """
+        self.config = Config()
+        self.archive_dir = Path(archive_dir or self.config.get_archive_dir())
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+
+        self.codec = 'zstd' if HAS_ZSTD else 'zlib'
+        self.segment_max_bytes = self.config.get_archive_segment_max_mb() * 1024 * 1024
+
+        self._lock = threading.RLock()
+        self._lock_file = open(self.archive_dir / "archive.lock", 'a+b')
+        self._lock_depth = 0
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._index = sqlite3.connect(self.archive_dir / "index.db", check_same_thread=False)
+        self._index.row_factory = sqlite3.Row
+        self._init_index()
+
+        self._segment_id = self._last_segment_id()
+        self._segment_file = None
+
+    def _init_index(self):
+        """Criar tabelas do índice"""
+        with self._lock:
+            self._index.execute("PRAGMA journal_mode=WAL")
+            self._index.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    hash TEXT PRIMARY KEY,
+                    segment INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    raw_length INTEGER NOT NULL,
+                    codec TEXT NOT NULL,
+                    created_at INTEGER
+                )
+            """)
+            self._index.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    fetched_at INTEGER NOT NULL,
+                    status INTEGER,
+                    content_type TEXT,
+                    encoding TEXT
+                )
+            """)
+            self._index.execute("CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (url, fetched_at)")
+            self._index.execute("CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages (hash)")
+            self._index.execute("CREATE INDEX IF NOT EXISTS idx_blobs_segment ON blobs (segment)")
+            self._index.commit()
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        """Lock entre threads e, com fcntl, entre processos (reentrante; o nível externo vale)"""
+        with self._lock:
+            if HAS_FCNTL and self._lock_depth == 0:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if HAS_FCNTL and self._lock_depth == 0:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    # ==================== SEGMENTOS ====================
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.archive_dir / f"{self.SEGMENT_PREFIX}{segment_id:06d}{self.SEGMENT_SUFFIX}"
+
+    def _last_segment_id(self) -> int:
+        ids = [
+            int(path.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)])
+            for path in self.archive_dir.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}")
+        ]
+        return max(ids) if ids else 1
+
+    def _refresh_segment_id(self):
+        """Seguir segmentos abertos por outros processos (chamar com o lock exclusivo)"""
+        latest = self._segment_id
+        while self._segment_path(latest + 1).exists():
+            latest += 1
+        if latest != self._segment_id:
+            if self._segment_file is not None:
+                self._segment_file.close()
+                self._segment_file = None
+            self._segment_id = latest
+
+    def _writable_segment(self, incoming: int):
+        """
+        Obter o segmento corrente e o offset da próxima gravação (chamar com o lock exclusivo)
+
+        O offset vem do tamanho real do arquivo (fstat), não do tell() do
+        handle, que não enxerga gravações de outros processos.
+        """
+        self._refresh_segment_id()
+        if self._segment_file is None:
+            self._segment_file = open(self._segment_path(self._segment_id), 'ab')
+
+        self._segment_file.flush()
+        size = os.fstat(self._segment_file.fileno()).st_size
+        if size and size + incoming > self.segment_max_bytes:
+            self._segment_file.close()
+            self._segment_id += 1
+            self._segment_file = open(self._segment_path(self._segment_id), 'ab')
+            size = 0
+
+        return self._segment_file, size
+
+    def _read_blob(self, segment_id: int, offset: int, length: int) -> bytes:
+        """Ler bytes de um segmento via mmap (remapeando se o segmento cresceu)"""
+        with self._lock:
+            if segment_id == self._segment_id and self._segment_file is not None:
+                self._segment_file.flush()
+
+            mapped = self._maps.get(segment_id)
+            if mapped is None or offset + length > len(mapped):
+                if mapped is not None:
+                    mapped.close()
+                with open(self._segment_path(segment_id), 'rb') as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[segment_id] = mapped
+
+            return mapped[offset:offset + length]
+
+    # ==================== COMPRESSÃO ====================
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=self.config.get_archive_compression_level()).compress(data)
+        return zlib.compress(data, min(self.config.get_archive_compression_level(), 9))
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == 'zstd':
+            if not HAS_ZSTD:
+                raise RuntimeError("Blob comprimido com zstd, mas zstandard não está instalado")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    # ==================== API PÚBLICA ====================
+
+    def put(self, url: str, body: bytes, status: Optional[int] = None,
+            content_type: Optional[str] = None, encoding: Optional[str] = None) -> str:
+        """
+        Arquivar uma resposta bruta
+
+        Args:
+            url: URL buscada
+            body: Corpo da resposta
+            status: Status HTTP
+            content_type: Header Content-Type
+            encoding: Encoding detectado pelo requests
+
+        Returns:
+            Hash SHA-256 do corpo (endereço no arquivo)
+        """
+        content_hash = hashlib.sha256(body).hexdigest()
+        now = int(datetime.now().timestamp() * 1000)
+
+        with self._locked():
+            exists = self._index.execute(
+                "SELECT 1 FROM blobs WHERE hash = ?", (content_hash,)
+            ).fetchone()
+
+            if not exists:
+                compressed = self._compress(body)
+                segment, offset = self._writable_segment(len(compressed))
+                segment.write(compressed)
+                segment.flush()
+
+                self._index.execute("""
+                    INSERT INTO blobs (hash, segment, offset, length, raw_length, codec, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (content_hash, self._segment_id, offset, len(compressed), len(body), self.codec, now))
+
+            self._index.execute("""
+                INSERT INTO pages (url, hash, fetched_at, status, content_type, encoding)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (url, content_hash, now, status, content_type, encoding))
+            self._index.commit()
+
+        return content_hash
+
+    def get_blob(self, content_hash: str) -> Optional[bytes]:
+        """Obter o corpo descomprimido pelo hash"""
+        with self._locked(shared=True):
+            row = self._index.execute(
+                "SELECT segment, offset, length, codec FROM blobs WHERE hash = ?", (content_hash,)
+            ).fetchone()
+            if not row:
+                return None
+            data = self._read_blob(row['segment'], row['offset'], row['length'])
+        return self._decompress(data, row['codec'])
+
+    def _page_from_row(self, row: sqlite3.Row) -> Optional[ArchivedPage]:
+        body = self.get_blob(row['hash'])
+        if body is None:
+            return None
+        return ArchivedPage(
+            url=row['url'],
+            content_hash=row['hash'],
+            fetched_at=datetime.fromtimestamp(row['fetched_at'] / 1000),
+            status=row['status'],
+            content_type=row['content_type'],
+            encoding=row['encoding'],
+            body=body
+        )
+
+    def get_latest(self, url: str) -> Optional[ArchivedPage]:
+        """Obter a captura mais recente de uma URL"""
+        with self._lock:
+            row = self._index.execute(
+                "SELECT * FROM pages WHERE url = ? ORDER BY fetched_at DESC, id DESC LIMIT 1", (url,)
+            ).fetchone()
+        return self._page_from_row(row) if row else None
+
+    def iter_latest(self, batch_size: int = 500, url_prefix: Optional[str] = None) -> Iterator[ArchivedPage]:
+        """
+        Iterar a captura mais recente de cada URL arquivada
+
+        Args:
+            batch_size: Linhas lidas do índice por consulta
+            url_prefix: Restringir a URLs com este prefixo (ex.: um domínio)
+        """
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._index.execute("""
+                    SELECT p.* FROM pages p
+                    WHERE p.id > ? AND p.url LIKE ? ESCAPE '\\' AND p.id = (
+                        SELECT p2.id FROM pages p2 WHERE p2.url = p.url
+                        ORDER BY p2.fetched_at DESC, p2.id DESC LIMIT 1
+                    )
+                    ORDER BY p.id LIMIT ?
+                """, (last_id, self._like_prefix(url_prefix), batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                page = self._page_from_row(row)
+                if page is not None:
+                    yield page
+            last_id = rows[-1]['id']
+
+    @staticmethod
+    def _like_prefix(prefix: Optional[str]) -> str:
+        if not prefix:
+            return '%'
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return escaped + '%'
+
+    def apply_retention(self) -> Dict[str, int]:
+        """
+        Aplicar a política de retenção
+
+        Remove capturas mais antigas que ARCHIVE_RETENTION_DAYS (mantendo a
+        mais recente de cada URL se ARCHIVE_KEEP_LATEST), apaga blobs órfãos e
+        reescreve segmentos antigos com pouco conteúdo vivo.
+
+        Returns:
+            Contadores de páginas, blobs e segmentos removidos
+        """
+        cutoff = int((datetime.now() - timedelta(days=self.config.get_archive_retention_days())).timestamp() * 1000)
+        keep_latest = self.config.is_archive_keep_latest()
+        stats = {'pages_removed': 0, 'blobs_removed': 0, 'segments_removed': 0, 'segments_compacted': 0}
+
+        with self._locked():
+            self._refresh_segment_id()
+            if keep_latest:
+                cursor = self._index.execute("""
+                    DELETE FROM pages WHERE fetched_at < ? AND id NOT IN (
+                        SELECT MAX(id) FROM pages GROUP BY url
+                    )
+                """, (cutoff,))
+            else:
+                cursor = self._index.execute("DELETE FROM pages WHERE fetched_at < ?", (cutoff,))
+            stats['pages_removed'] = cursor.rowcount
+
+            cursor = self._index.execute(
+                "DELETE FROM blobs WHERE hash NOT IN (SELECT DISTINCT hash FROM pages)"
+            )
+            stats['blobs_removed'] = cursor.rowcount
+            self._index.commit()
+
+            # Segmentos fechados: remover vazios, compactar os com pouco conteúdo vivo
+            for path in sorted(self.archive_dir.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}")):
+                segment_id = int(path.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)])
+                if segment_id >= self._segment_id:
+                    continue
+
+                live = self._index.execute(
+                    "SELECT COALESCE(SUM(length), 0) FROM blobs WHERE segment = ?", (segment_id,)
+                ).fetchone()[0]
+                size = path.stat().st_size
+
+                if live == 0:
+                    self._drop_segment(segment_id, path)
+                    stats['segments_removed'] += 1
+                elif size and live / size < 0.5:
+                    self._compact_segment(segment_id, path)
+                    stats['segments_compacted'] += 1
+
+        logger.info(f"🗄️  Retenção do arquivo aplicada: {stats}")
+        return stats
+
+    def _drop_segment(self, segment_id: int, path: Path):
+        mapped = self._maps.pop(segment_id, None)
+        if mapped is not None:
+            mapped.close()
+        path.unlink(missing_ok=True)
+
+    def _compact_segment(self, segment_id: int, path: Path):
+        """Copiar os blobs vivos de um segmento para o segmento corrente"""
+        rows = self._index.execute(
+            "SELECT hash, offset, length FROM blobs WHERE segment = ?", (segment_id,)
+        ).fetchall()
+
+        for row in rows:
+            data = self._read_blob(segment_id, row['offset'], row['length'])
+            segment, offset = self._writable_segment(len(data))
+            segment.write(data)
+            self._index.execute(
+                "UPDATE blobs SET segment = ?, offset = ? WHERE hash = ?",
+                (self._segment_id, offset, row['hash'])
+            )
+
+        self._segment_file.flush()
+        self._index.commit()
+        self._drop_segment(segment_id, path)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Tamanho do arquivo e taxa de compressão"""
+        with self._lock:
+            row = self._index.execute("""
+                SELECT COUNT(*) AS blobs, COALESCE(SUM(length), 0) AS stored,
+                       COALESCE(SUM(raw_length), 0) AS raw
+                FROM blobs
+            """).fetchone()
+            pages = self._index.execute("SELECT COUNT(*), COUNT(DISTINCT url) FROM pages").fetchone()
+
+        segments = list(self.archive_dir.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}"))
+        return {
+            'codec': self.codec,
+            'pages': pages[0],
+            'urls': pages[1],
+            'blobs': row['blobs'],
+            'raw_bytes': row['raw'],
+            'stored_bytes': row['stored'],
+            'compression_ratio': round(row['raw'] / row['stored'], 2) if row['stored'] else None,
+            'segments': len(segments),
+            'disk_bytes': sum(path.stat().st_size for path in segments)
+        }
+
+    def close(self):
+        """Fechar arquivos abertos"""
+        with self._lock:
+            if self._segment_file is not None:
+                self._segment_file.close()
+                self._segment_file = None
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+            self._index.close()
+            self._lock_file.close()
+
+_archive: Optional[PageArchive] = None
+_archive_lock = threading.Lock()
+
+def get_page_archive() -> Optional[PageArchive]:
+    """
+    Obter o arquivo de páginas do processo (criado sob demanda)
+
+    Returns:
+        PageArchive ou None se ARCHIVE_ENABLED=false
+    """
+    global _archive
+    if not Config().is_archive_enabled():
+        return None
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive()
+        return _archive
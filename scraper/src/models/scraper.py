@@ -60,6 +60,30 @@ class Source(BaseModel):
             datetime: lambda v: v.isoformat() if v else None
         }
 
+class FeedState(BaseModel):
+    """Marca d'água de um feed RSS/Atom (ingestão incremental)"""
+    source_id: str = Field(..., description="ID da fonte")
+    last_guid: Optional[str] = Field(None, description="GUID da entrada mais recente vista")
+    last_entry_at: Optional[datetime] = Field(None, description="Data da entrada mais recente vista")
+    seen_guids: List[str] = Field(default_factory=list, description="GUIDs vistos recentemente (mais novo primeiro)")
+    etag: Optional[str] = Field(None, description="ETag da última resposta (If-None-Match)")
+    last_modified: Optional[str] = Field(None, description="Last-Modified da última resposta (If-Modified-Since)")
+    last_checked_at: Optional[datetime] = Field(None, description="Última verificação do feed")
+    last_new_entries: int = Field(0, description="Entradas novas na última verificação")
+    total_new_entries: int = Field(0, description="Entradas novas desde a criação da marca")
+    
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat() if v else None
+        }
+
+class RetentionPolicy(BaseModel):
+    """Política de retenção de conteúdos de um cliente (None = padrão do .env, 0 = desligado)"""
+    client_id: str = Field(..., description="ID do cliente")
+    hot_days: Optional[int] = Field(None, ge=0, description="Dias mantidos no banco principal antes do arquivo")
+    delete_analyzed_days: Optional[int] = Field(None, ge=0, description="Dias após os quais conteúdos analisados são apagados")
+    updated_at: Optional[datetime] = Field(None, description="Última alteração")
+
 class Client(BaseModel):
     """Modelo de cliente"""
     id: str = Field(..., description="ID do cliente")
@@ -135,6 +159,53 @@ class TaskStatusResponse(BaseModel):
     estimated_completion: Optional[datetime] = Field(None, description="Data estimada de conclusão")
     error_message: Optional[str] = Field(None, description="Mensagem de erro se houver")
 
+class ReextractRequest(BaseModel):
+    """Modelo de requisição de re-extração das páginas arquivadas"""
+    url_prefix: Optional[str] = Field(None, description="Re-extrair apenas URLs com este prefixo")
+    limit: Optional[int] = Field(None, ge=1, description="Número máximo de páginas")
+    batch_size: Optional[int] = Field(None, ge=1, description="Páginas por transação")
+
+class SourceCreateRequest(BaseModel):
+    """Modelo de requisição de criação de fonte"""
+    name: str = Field(..., description="Nome da fonte")
+    url: str = Field(..., description="URL da fonte")
+    type: SourceType = Field(SourceType.BLOG, description="Tipo da fonte")
+    is_active: bool = Field(True, description="Se a fonte está ativa")
+    use_discovered_feed: bool = Field(True, description="Trocar blog/news pelo feed RSS do site, se houver")
+
+class SourceCreateResponse(BaseModel):
+    """Modelo de resposta de criação de fonte"""
+    source: Source = Field(..., description="Fonte criada")
+    discovered_feed: Optional[str] = Field(None, description="Feed encontrado no site")
+    switched_to_rss: bool = Field(False, description="Se a fonte foi criada como RSS usando o feed descoberto")
+
+class OPMLImportRequest(BaseModel):
+    """Modelo de requisição de importação de fontes via OPML"""
+    opml: str = Field(..., description="Conteúdo XML do arquivo OPML")
+    is_active: bool = Field(True, description="Criar as fontes já ativas")
+
+class OPMLImportResponse(BaseModel):
+    """Modelo de resposta da importação OPML"""
+    feeds_found: int = Field(..., description="Feeds encontrados no OPML")
+    created: int = Field(..., description="Fontes criadas")
+    skipped: int = Field(..., description="Fontes já existentes (ignoradas)")
+    source_ids: List[str] = Field(default_factory=list, description="IDs das fontes criadas")
+
+class FeedPollRequest(BaseModel):
+    """Modelo de requisição de varredura de feeds"""
+    client_ids: Optional[List[str]] = Field(None, description="Restringir aos feeds destes clientes")
+    max_items: int = Field(50, ge=1, le=500, description="Máximo de entradas por feed")
+
+class RetentionPolicyRequest(BaseModel):
+    """Modelo de requisição de alteração da política de retenção de um cliente"""
+    hot_days: Optional[int] = Field(None, ge=0, description="Dias no banco principal (None = padrão, 0 = nunca arquivar)")
+    delete_analyzed_days: Optional[int] = Field(None, ge=0, description="Horizonte de exclusão dos analisados (None = padrão, 0 = nunca)")
+
+class RetentionRequest(BaseModel):
+    """Modelo de requisição de execução da retenção"""
+    client_ids: Optional[List[str]] = Field(None, description="Restringir a estes clientes")
+    batch_size: Optional[int] = Field(None, ge=1, description="Linhas por transação")
+
 # ==================== NOVOS MODELOS PARA API DO FRONTEND ====================
 
 class ScrapeRequest(BaseModel):
@@ -0,0 +1,226 @@
+"""
+Fila de gravação com uma única thread escritora e commit em grupo
+Evita 'database is locked' e um fsync por gravação quando muitas threads/corrotinas gravam
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from .database import Database
+from utils.config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+class _WriteOp:
+    """Operação enfileirada: função que recebe o Database da fila"""
+
+    __slots__ = ('func', 'args', 'kwargs', 'future')
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Future = Future()
+
+class WriteQueue:
+    """
+    Thread escritora que consome uma fila limitada de operações
+
+    As operações são agrupadas até DB_WRITE_BATCH_SIZE ou até DB_WRITE_BATCH_MS
+    depois da primeira, e executadas em uma transação só (um commit, um
+    fsync). Com janela 0, o grupo é o que se acumulou durante o commit
+    anterior: sem espera com pouca carga, grupos maiores com muita. Cada
+    operação roda em um SAVEPOINT: uma falha desfaz só ela e chega ao
+    chamador pelo Future. Operações são funções que recebem o
+    Database como primeiro argumento, ex.: submit(Database.save_feed_state, state).
+    Métodos que abrem a própria transação em lotes (delete_contents em
+    laço, recompress_contents, move_bodies_to_store) não devem ser enfileirados.
+    """
+
+    def __init__(self, db: Optional[Database] = None):
+        """
+        Inicializar a fila
+
+        Args:
+            db: Banco usado pela thread escritora (default: nova instância)
+        """
+        self.config = Config()
+        self.db = db or Database()
+        self.enabled = self.config.is_db_write_queue_enabled()
+        self.batch_size = self.config.get_db_write_batch_size()
+        self.batch_window = self.config.get_db_write_batch_ms() / 1000
+        self._queue: "queue.Queue[Optional[_WriteOp]]" = queue.Queue(maxsize=self.config.get_db_write_queue_size())
+        self._lock = threading.Lock()
+
+        self.ops = 0
+        self.groups = 0
+        self.errors = 0
+        self.max_group = 0
+        self.commit_seconds = 0.0
+
+        self._thread: Optional[threading.Thread] = None
+        if self.enabled:
+            self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self._thread.start()
+            logger.info(
+                f"✍️  Fila de gravação iniciada (grupos de até {self.batch_size} operações / "
+                f"{self.config.get_db_write_batch_ms()}ms)"
+            )
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Enfileirar uma gravação (bloqueia enquanto a fila estiver cheia)
+
+        Args:
+            func: Função chamada como func(db, *args, **kwargs) na thread escritora
+
+        Returns:
+            Future com o retorno da função (ou a exceção)
+        """
+        op = _WriteOp(func, args, kwargs)
+        if not self.enabled:
+            # Sem fila: grava na thread do chamador, com commit próprio
+            self._execute(op)
+            return op.future
+        self._queue.put(op)
+        return op.future
+
+    async def execute(self, func: Callable, *args, **kwargs) -> Any:
+        """Enfileirar e aguardar uma gravação sem bloquear o event loop"""
+        op = _WriteOp(func, args, kwargs)
+        if not self.enabled:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._execute, op)
+            return op.future.result()
+        try:
+            self._queue.put_nowait(op)
+        except queue.Full:
+            # Fila cheia: esperar a vaga fora do event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._queue.put, op)
+        return await asyncio.wrap_future(op.future)
+
+    def _execute(self, op: _WriteOp):
+        try:
+            op.future.set_result(op.func(self.db, *op.args, **op.kwargs))
+        except Exception as e:
+            op.future.set_exception(e)
+
+    def _next_group(self, first: _WriteOp):
+        """Juntar operações até o tamanho ou a janela do grupo; None na lista = encerrar"""
+        group = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(group) < self.batch_size:
+            try:
+                timeout = deadline - time.monotonic()
+                op = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            group.append(op)
+            if op is None:
+                break
+        return group
+
+    def _commit_group(self, group):
+        """Executar um grupo em uma transação, um SAVEPOINT por operação"""
+        results = []
+        start = time.perf_counter()
+        with self.db.get_connection() as conn:
+            self.db._local.group = True
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for op in group:
+                    conn.execute("SAVEPOINT write_op")
+                    try:
+                        result = op.func(self.db, *op.args, **op.kwargs)
+                        conn.execute("RELEASE write_op")
+                        results.append((op, result, None))
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO write_op")
+                        conn.execute("RELEASE write_op")
+                        results.append((op, None, e))
+                conn.commit()
+            except Exception as e:
+                # BEGIN ou COMMIT falhou: nenhuma operação do grupo foi gravada
+                if conn.in_transaction:
+                    conn.rollback()
+                logger.error(f"❌ Erro no commit do grupo de {len(group)} gravações: {e}")
+                results = [(op, None, e) for op in group]
+            finally:
+                self.db._local.group = False
+
+        with self._lock:
+            self.groups += 1
+            self.ops += len(group)
+            self.errors += sum(1 for _, _, error in results if error is not None)
+            self.max_group = max(self.max_group, len(group))
+            self.commit_seconds += time.perf_counter() - start
+
+        for op, result, error in results:
+            if error is not None:
+                op.future.set_exception(error)
+            else:
+                op.future.set_result(result)
+
+    def _run(self):
+        """Laço da thread escritora"""
+        while True:
+            op = self._queue.get()
+            if op is None:
+                return
+            group = self._next_group(op)
+            stop = group[-1] is None
+            if stop:
+                group.pop()
+            if group:
+                try:
+                    self._commit_group(group)
+                except Exception as e:
+                    logger.error(f"❌ Erro na thread de gravação: {e}")
+                    for pending in group:
+                        if not pending.future.done():
+                            pending.future.set_exception(e)
+            if stop:
+                return
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Operações, grupos, tamanho médio do grupo e profundidade da fila"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'queued': self._queue.qsize(),
+                'ops': self.ops,
+                'groups': self.groups,
+                'errors': self.errors,
+                'avg_group': round(self.ops / self.groups, 1) if self.groups else None,
+                'max_group': self.max_group,
+                'avg_commit_ms': round(self.commit_seconds / self.groups * 1000, 2) if self.groups else None
+            }
+
+    def close(self):
+        """Gravar o que estiver na fila e parar a thread escritora"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+_write_queue: Optional[WriteQueue] = None
+_write_queue_lock = threading.Lock()
+
+def get_write_queue(db: Optional[Database] = None) -> WriteQueue:
+    """
+    Obter a fila de gravação do processo (uma thread escritora por processo)
+
+    Args:
+        db: Banco já aberto pelo chamador, usado se a fila ainda não existir
+            (evita outra instância com migrações e cache de consultas próprios)
+    """
+    global _write_queue
+    with _write_queue_lock:
+        if _write_queue is None:
+            _write_queue = WriteQueue(db)
+        return _write_queue
@@ -0,0 +1,144 @@
+"""
+Extração de artigos em pool de processos
+Parsing de HTML e extração são CPU puro: rodam fora do GIL do processo principal
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import sys
+from pathlib import Path
+
+# Adicionar o diretório pai ao path para importações relativas
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from utils.config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Scrapers do processo worker (criados uma vez por processo)
+_worker_scraper = None
+_worker_rss_scraper = None
+
+def _get_worker_scraper():
+    global _worker_scraper
+    if _worker_scraper is None:
+        from scrapers.web_scraper import WebScraper
+        _worker_scraper = WebScraper()
+    return _worker_scraper
+
+def extract_page(html: bytes, url: str, validate: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Extrair um artigo a partir do HTML bruto (executado nos workers)
+
+    Só dados compactos atravessam a fronteira entre processos: o soup fica
+    no worker e volta apenas o dicionário do ScrapedContent.
+
+    Args:
+        html: HTML da página
+        url: URL do artigo
+        validate: Descartar conteúdo que não passa em _validate_content
+
+    Returns:
+        Campos do ScrapedContent ou None se a extração falhar
+    """
+    scraper = _get_worker_scraper()
+    content = scraper.extract_article(html, url)
+    if content is None:
+        return None
+    if validate and not scraper._validate_content(content):
+        return None
+    return content.model_dump()
+
+def parse_feed(content: bytes, state: Optional[Dict[str, Any]], max_items: int,
+               headers: Dict[str, str]) -> Tuple[List[Dict[str, Any]], List[int], Optional[Dict[str, Any]]]:
+    """
+    Parsear um feed e suas entradas novas (executado nos workers)
+
+    Args:
+        content: Corpo do feed
+        state: Marca d'água (FeedState serializado) ou None
+        max_items: Número máximo de itens
+        headers: Headers da resposta
+
+    Returns:
+        Conteúdos (não validados), posições das entradas truncadas e a marca avançada
+    """
+    global _worker_rss_scraper
+    if _worker_rss_scraper is None:
+        from scrapers.rss_scraper import RSScraper
+        _worker_rss_scraper = RSScraper()
+
+    from models.scraper import FeedState
+    feed_state = FeedState(**state) if state else None
+    parsed, truncated = _worker_rss_scraper.parse_feed_entries(content, feed_state, max_items, headers)
+    return (
+        [content.model_dump() for content in parsed],
+        truncated,
+        feed_state.model_dump() if feed_state else None
+    )
+
+def discover_links(html: bytes, base_url: str) -> List[str]:
+    """
+    Descobrir links de artigos em uma página de listagem (executado nos workers)
+
+    Args:
+        html: HTML da página
+        base_url: URL da página (resolução de links relativos)
+
+    Returns:
+        URLs absolutas dos artigos
+    """
+    return _get_worker_scraper().discover_article_links(html, base_url)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """
+    Obter o pool de processos de extração (compartilhado, criado sob demanda)
+
+    Usa spawn: o processo principal tem threads (executor, DNS, servidor) e
+    fork com threads ativas pode herdar locks travados.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = Config().get_extraction_workers()
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            logger.info(f"⚙️  Pool de extração iniciado com {workers} processos")
+        return _pool
+
+def shutdown_extraction_pool():
+    """Encerrar o pool de processos de extração"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+def run_in_pool(func: Callable, *args) -> Any:
+    """
+    Executar uma função de extração no pool e aguardar o resultado
+
+    A thread chamadora (fetcher) fica bloqueada sem segurar o GIL, então
+    várias threads de I/O mantêm todos os processos ocupados. Se o pool
+    quebrar (worker morto), ele é recriado na próxima chamada.
+
+    Raises:
+        BrokenProcessPool: Se um worker morrer durante a execução
+    """
+    try:
+        return get_extraction_pool().submit(func, *args).result()
+    except BrokenProcessPool:
+        logger.warning("⚠️  Pool de extração quebrado, será recriado")
+        shutdown_extraction_pool()
+        raise
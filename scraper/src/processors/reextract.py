@@ -0,0 +1,191 @@
+"""
+Re-extração em lote das páginas arquivadas
+Aplica o extrator atual (site_configs, _extract_*) sem baixar as páginas de novo
+"""
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import sys
+from pathlib import Path
+
+# Adicionar o diretório pai ao path para importações relativas
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from models.database import Database
+from models.page_archive import get_page_archive, ArchivedPage
+from models.scraper import ScrapedContent, ContentStatus
+from processors.extraction import extract_page, get_extraction_pool
+from utils.config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+@dataclass
+class ReextractionJob:
+    """Estado e contadores de um job de re-extração"""
+    id: str
+    url_prefix: Optional[str] = None
+    limit: Optional[int] = None
+    batch_size: int = 500
+    status: ContentStatus = ContentStatus.PENDING
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    pages: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    error_message: Optional[str] = None
+
+    @property
+    def pages_per_second(self) -> Optional[float]:
+        if not self.elapsed:
+            return None
+        return round(self.pages / self.elapsed, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'url_prefix': self.url_prefix,
+            'limit': self.limit,
+            'batch_size': self.batch_size,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'pages': self.pages,
+            'updated': self.updated,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'elapsed_seconds': round(self.elapsed, 2),
+            'pages_per_second': self.pages_per_second,
+            'error_message': self.error_message
+        }
+
+class Reextractor:
+    """Re-extrai conteúdos a partir do arquivo de HTML bruto usando o pool de processos"""
+
+    def __init__(self, db: Optional[Database] = None):
+        """
+        Inicializar o re-extrator
+
+        Args:
+            db: Banco de dados (default: nova instância)
+        """
+        self.config = Config()
+        self.db = db or Database()
+        self.jobs: Dict[str, ReextractionJob] = {}
+
+    def create_job(self, url_prefix: Optional[str] = None, limit: Optional[int] = None,
+                   batch_size: Optional[int] = None) -> ReextractionJob:
+        """Criar (sem executar) um job de re-extração"""
+        job = ReextractionJob(
+            id=str(uuid.uuid4()),
+            url_prefix=url_prefix,
+            limit=limit,
+            batch_size=batch_size or self.config.get_reextract_batch_size()
+        )
+        self.jobs[job.id] = job
+        return job
+
+    def start_job(self, url_prefix: Optional[str] = None, limit: Optional[int] = None,
+                  batch_size: Optional[int] = None) -> str:
+        """
+        Iniciar um job de re-extração em background
+
+        Returns:
+            ID do job
+        """
+        job = self.create_job(url_prefix, limit, batch_size)
+        threading.Thread(target=self.run, args=(job,), name=f"reextract-{job.id[:8]}", daemon=True).start()
+        logger.info(f"🚀 Re-extração iniciada: {job.id}")
+        return job.id
+
+    def get_job(self, job_id: str) -> Optional[ReextractionJob]:
+        """Obter um job pelo ID"""
+        return self.jobs.get(job_id)
+
+    def _process_batch(self, batch: List[ArchivedPage], job: ReextractionJob):
+        """Extrair um lote no pool de processos e gravar em uma transação"""
+        pool = get_extraction_pool()
+        workers = self.config.get_extraction_workers()
+        chunksize = max(1, len(batch) // (workers * 4))
+
+        results = pool.map(
+            extract_page,
+            [page.body for page in batch],
+            [page.url for page in batch],
+            chunksize=chunksize
+        )
+
+        contents = []
+        for page, result in zip(batch, results):
+            if result is None:
+                job.failed += 1
+                logger.debug(f"⚠️  Re-extração sem conteúdo válido: {page.url}")
+                continue
+            contents.append(ScrapedContent(**result))
+
+        updated = self.db.update_contents_bulk(contents)
+        job.updated += updated
+        # Páginas arquivadas que não estão (ou não estão mais) na tabela contents
+        job.skipped += len(contents) - updated
+        job.pages += len(batch)
+
+    def run(self, job: ReextractionJob) -> ReextractionJob:
+        """
+        Executar um job de re-extração (bloqueante)
+
+        Args:
+            job: Job criado com create_job
+
+        Returns:
+            O próprio job com os contadores finais
+        """
+        archive = get_page_archive()
+        if archive is None:
+            job.status = ContentStatus.ERROR
+            job.error_message = "Arquivo de páginas desativado (ARCHIVE_ENABLED=false)"
+            return job
+
+        job.status = ContentStatus.PROCESSING
+        job.started_at = datetime.now()
+        start = time.perf_counter()
+
+        try:
+            batch: List[ArchivedPage] = []
+            seen = 0
+            for page in archive.iter_latest(url_prefix=job.url_prefix):
+                if job.limit and seen >= job.limit:
+                    break
+                batch.append(page)
+                seen += 1
+
+                if len(batch) >= job.batch_size:
+                    self._process_batch(batch, job)
+                    batch = []
+                    job.elapsed = time.perf_counter() - start
+                    logger.info(f"🔁 Re-extração {job.id[:8]}: {job.pages} páginas ({job.pages_per_second} páginas/s)")
+
+            if batch:
+                self._process_batch(batch, job)
+
+            job.status = ContentStatus.COMPLETED
+
+        except Exception as e:
+            logger.error(f"❌ Erro na re-extração {job.id}: {e}")
+            job.status = ContentStatus.ERROR
+            job.error_message = str(e)
+
+        job.elapsed = time.perf_counter() - start
+        job.completed_at = datetime.now()
+        logger.info(
+            f"🎉 Re-extração {job.id[:8]} concluída: {job.pages} páginas, {job.updated} atualizadas, "
+            f"{job.failed} falhas em {job.elapsed:.1f}s ({job.pages_per_second} páginas/s)"
+        )
+        return job
@@ -0,0 +1,204 @@
+"""
+Retenção de conteúdos: arquivamento dos antigos e exclusão dos já analisados
+Mantém o banco compartilhado pequeno; os conteúdos movidos ficam no arquivo comprimido
+"""
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+import sys
+from pathlib import Path
+
+# Adicionar o diretório pai ao path para importações relativas
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from models.database import Database
+from models.content_archive import get_content_archive
+from models.scraper import ContentStatus
+from utils.config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+@dataclass
+class RetentionJob:
+    """Estado e contadores de um job de retenção"""
+    id: str
+    client_ids: Optional[List[str]] = None
+    batch_size: int = 500
+    status: ContentStatus = ContentStatus.PENDING
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    clients: int = 0
+    archived: int = 0
+    deleted: int = 0
+    deleted_from_archive: int = 0
+    kept_for_briefs: int = 0
+    vacuumed_pages: int = 0
+    elapsed: float = 0.0
+    error_message: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'client_ids': self.client_ids,
+            'batch_size': self.batch_size,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'clients': self.clients,
+            'archived': self.archived,
+            'deleted': self.deleted,
+            'deleted_from_archive': self.deleted_from_archive,
+            'kept_for_briefs': self.kept_for_briefs,
+            'vacuumed_pages': self.vacuumed_pages,
+            'elapsed_seconds': round(self.elapsed, 2),
+            'error_message': self.error_message
+        }
+
+class ContentRetention:
+    """Aplica as políticas de retenção por cliente em lotes curtos"""
+
+    def __init__(self, db: Optional[Database] = None):
+        """
+        Inicializar a retenção
+
+        Args:
+            db: Banco de dados (default: nova instância)
+        """
+        self.config = Config()
+        self.db = db or Database()
+        self.jobs: Dict[str, RetentionJob] = {}
+        # Um job por vez: dois jobs disputariam os mesmos lotes
+        self._run_lock = threading.Lock()
+
+    def create_job(self, client_ids: Optional[List[str]] = None,
+                   batch_size: Optional[int] = None) -> RetentionJob:
+        """Criar (sem executar) um job de retenção"""
+        job = RetentionJob(
+            id=str(uuid.uuid4()),
+            client_ids=client_ids,
+            batch_size=batch_size or self.config.get_content_retention_batch_size()
+        )
+        self.jobs[job.id] = job
+        return job
+
+    def start_job(self, client_ids: Optional[List[str]] = None,
+                  batch_size: Optional[int] = None) -> str:
+        """
+        Iniciar um job de retenção em background
+
+        Returns:
+            ID do job
+        """
+        job = self.create_job(client_ids, batch_size)
+        threading.Thread(target=self.run, args=(job,), name=f"retention-{job.id[:8]}", daemon=True).start()
+        logger.info(f"🚀 Retenção de conteúdos iniciada: {job.id}")
+        return job.id
+
+    def get_job(self, job_id: str) -> Optional[RetentionJob]:
+        """Obter um job pelo ID"""
+        return self.jobs.get(job_id)
+
+    @staticmethod
+    def _horizon_ms(days: int) -> int:
+        return int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
+
+    def _vacuum(self, job: RetentionJob):
+        """Devolver ao disco as páginas liberadas pelo lote (lock curto, sem VACUUM completo)"""
+        job.vacuumed_pages += self.db.incremental_vacuum(self.config.get_content_retention_vacuum_pages())
+
+    def _expire(self, client_id: str, before_ms: int, job: RetentionJob, protected: set, archive: bool):
+        """
+        Percorrer os conteúdos expirados de um cliente, lote a lote
+
+        Args:
+            archive: Mover para o arquivo (todos) em vez de apagar (só os analisados)
+        """
+        after = None
+        while True:
+            rows = self.db.get_expired_contents(
+                client_id, before_ms, after=after, analyzed_only=not archive, limit=job.batch_size
+            )
+            if not rows:
+                return
+            after = (rows[-1]['scraped_at'], rows[-1]['id'])
+
+            expired = [row for row in rows if row['id'] not in protected]
+            job.kept_for_briefs += len(rows) - len(expired)
+            if expired:
+                if archive:
+                    # Gravado (e commitado) no arquivo antes de sair do banco principal:
+                    # uma falha no meio repete o lote sem perder linhas
+                    get_content_archive().store(expired)
+                    job.archived += len(expired)
+                    self.db.delete_contents([row['id'] for row in expired])
+                else:
+                    job.deleted += self.db.delete_contents([row['id'] for row in expired])
+                self._vacuum(job)
+
+            if len(rows) < job.batch_size:
+                return
+
+    def _apply(self, client_id: str, job: RetentionJob, protected: set):
+        """Aplicar a política de um cliente"""
+        policy = self.db.get_retention_policy(client_id)
+        hot_days = policy.hot_days if policy.hot_days is not None else self.config.get_content_hot_days()
+        delete_days = policy.delete_analyzed_days
+        if delete_days is None:
+            delete_days = self.config.get_content_delete_analyzed_days()
+
+        # Primeiro a exclusão: analisados além do horizonte não precisam ir para o arquivo
+        if delete_days:
+            before_ms = self._horizon_ms(delete_days)
+            self._expire(client_id, before_ms, job, protected, archive=False)
+            job.deleted_from_archive += get_content_archive().delete_analyzed_before(
+                client_id, before_ms, job.batch_size
+            )
+        if hot_days:
+            self._expire(client_id, self._horizon_ms(hot_days), job, protected, archive=True)
+
+    def run(self, job: RetentionJob) -> RetentionJob:
+        """
+        Executar um job de retenção (bloqueante)
+
+        Args:
+            job: Job criado com create_job
+
+        Returns:
+            O próprio job com os contadores finais
+        """
+        job.status = ContentStatus.PROCESSING
+        job.started_at = datetime.now()
+        start = time.perf_counter()
+
+        try:
+            with self._run_lock:
+                protected = self.db.get_brief_content_ids()
+                client_ids = job.client_ids or [client.id for client in self.db.get_clients()]
+                for client_id in client_ids:
+                    self._apply(client_id, job, protected)
+                    job.clients += 1
+                    job.elapsed = time.perf_counter() - start
+                if job.deleted_from_archive:
+                    get_content_archive().incremental_vacuum(self.config.get_content_retention_vacuum_pages())
+
+            job.status = ContentStatus.COMPLETED
+
+        except Exception as e:
+            logger.error(f"❌ Erro na retenção de conteúdos {job.id}: {e}")
+            job.status = ContentStatus.ERROR
+            job.error_message = str(e)
+
+        job.elapsed = time.perf_counter() - start
+        job.completed_at = datetime.now()
+        logger.info(
+            f"🧹 Retenção {job.id[:8]} concluída: {job.archived} arquivados, {job.deleted} apagados, "
+            f"{job.deleted_from_archive} apagados do arquivo em {job.elapsed:.1f}s"
+        )
+        return job
@@ -0,0 +1,150 @@
+"""
+Descoberta de feeds RSS/Atom de sites
+Permite que fontes do tipo blog/news usem o feed em vez do scraping de HTML
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import feedparser
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+import sys
+from pathlib import Path
+
+# Adicionar o diretório pai ao path para importações relativas
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from utils.config import Config
+from utils.logger import setup_logger
+from utils.resilience import request_with_retry
+from utils.robots import robots_cache, host_pacer
+from utils.sessions import session_provider
+
+logger = setup_logger()
+
+FEED_TYPES = (
+    'application/rss+xml',
+    'application/atom+xml',
+    'application/feed+json',
+    'application/rss',
+    'text/xml',
+)
+
+# Caminhos comuns de feeds (WordPress, Ghost, Hugo, Blogger, Substack, Medium)
+COMMON_FEED_PATHS = (
+    '/feed', '/rss', '/feed.xml', '/rss.xml', '/atom.xml', '/index.xml',
+    '/feeds/posts/default', '/?feed=rss2',
+)
+
+class FeedDiscovery:
+    """Descobre o feed de um site (link rel=alternate e caminhos comuns), com cache por domínio"""
+
+    def __init__(self):
+        """Inicializar a descoberta"""
+        self.config = Config()
+        self._cache: Dict[str, Tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, url: str) -> Optional[requests.Response]:
+        if not robots_cache.can_fetch(url):
+            return None
+        host_pacer.wait(url)
+        try:
+            response = request_with_retry(
+                session_provider.get_session(), 'GET', url,
+                max_retries=1,
+                timeout=self.config.get_timeout()
+            )
+        except requests.RequestException as e:
+            logger.debug(f"⚠️  Falha ao buscar {url}: {e}")
+            return None
+        return response if response.status_code == 200 else None
+
+    def _link_candidates(self, html: bytes, page_url: str) -> List[str]:
+        """Feeds declarados em <link rel="alternate"> na página"""
+        soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('link'))
+        candidates = []
+        for link in soup.find_all('link'):
+            rel = link.get('rel') or []
+            rel = rel if isinstance(rel, list) else rel.split()
+            link_type = (link.get('type') or '').lower().split(';')[0].strip()
+            href = link.get('href')
+            if href and 'alternate' in [r.lower() for r in rel] and link_type in FEED_TYPES:
+                # Feeds de comentários não servem como fonte de artigos
+                if 'comments' in href.lower():
+                    continue
+                candidates.append(urljoin(page_url, href))
+        return candidates
+
+    def _is_feed(self, url: str) -> bool:
+        """Verificar se a URL responde com um feed com entradas"""
+        response = self._fetch(url)
+        if response is None:
+            return False
+        feed = feedparser.parse(response.content)
+        return bool(feed.entries)
+
+    def discover(self, url: str) -> Optional[str]:
+        """
+        Descobrir o feed de um site
+
+        Args:
+            url: URL do site (página inicial ou seção)
+
+        Returns:
+            URL do feed ou None se o site não publicar feed
+        """
+        domain = urlparse(url).netloc.lower()
+        if not domain:
+            return None
+
+        with self._lock:
+            entry = self._cache.get(domain)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        feed_url = self._discover(url)
+
+        ttl = self.config.get_feed_discovery_ttl() if feed_url else self.config.get_feed_discovery_negative_ttl()
+        with self._lock:
+            self._cache[domain] = (feed_url, time.monotonic() + ttl)
+
+        if feed_url:
+            logger.info(f"📡 Feed descoberto para {domain}: {feed_url}")
+        else:
+            logger.info(f"🔍 Nenhum feed encontrado para {domain}")
+        return feed_url
+
+    def _discover(self, url: str) -> Optional[str]:
+        candidates = []
+
+        response = self._fetch(url)
+        if response is not None:
+            # O próprio URL já é um feed
+            content_type = response.headers.get('Content-Type', '').lower()
+            if 'xml' in content_type or 'rss' in content_type or 'atom' in content_type:
+                if feedparser.parse(response.content).entries:
+                    return url
+            candidates.extend(self._link_candidates(response.content, url))
+
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        candidates.extend(origin + path for path in COMMON_FEED_PATHS)
+
+        for candidate in dict.fromkeys(candidates):
+            if self._is_feed(candidate):
+                return candidate
+        return None
+
+    def clear(self):
+        """Limpar o cache"""
+        with self._lock:
+            self._cache.clear()
+
+# Instância global (cache compartilhado)
+feed_discovery = FeedDiscovery()
@@ -0,0 +1,246 @@
+"""
+Poller assíncrono de feeds RSS/Atom em massa
+Downloads concorrentes com limite por host, parsing no pool de processos
+"""
+
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+from urllib.parse import urlparse
+
+import sys
+from pathlib import Path
+
+# Adicionar o diretório pai ao path para importações relativas
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from models.scraper import Source, ScrapedContent, SourceType, ContentStatus, FeedState
+from models.database import Database
+from models.write_queue import get_write_queue
+from processors.extraction import parse_feed, get_extraction_pool
+from .rss_scraper import RSScraper
+from utils.config import Config
+from utils.dns_cache import dns_cache
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+@dataclass
+class FeedPollRun:
+    """Estado e contadores de uma varredura de feeds"""
+    id: str
+    status: ContentStatus = ContentStatus.PENDING
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    feeds: int = 0
+    fetched: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    new_entries: int = 0
+    saved: int = 0
+    elapsed: float = 0.0
+    error_message: Optional[str] = None
+
+    @property
+    def done(self) -> int:
+        return self.fetched + self.not_modified + self.errors
+
+    @property
+    def feeds_per_second(self) -> Optional[float]:
+        if not self.elapsed:
+            return None
+        return round(self.done / self.elapsed, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'poll_id': self.id,
+            'status': self.status,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'feeds': self.feeds,
+            'done': self.done,
+            'fetched': self.fetched,
+            'not_modified': self.not_modified,
+            'errors': self.errors,
+            'new_entries': self.new_entries,
+            'saved': self.saved,
+            'elapsed_seconds': round(self.elapsed, 2),
+            'feeds_per_second': self.feeds_per_second,
+            'error_message': self.error_message
+        }
+
+class FeedPoller:
+    """Varredura concorrente de todos os feeds RSS cadastrados"""
+
+    def __init__(self, db: Optional[Database] = None):
+        """
+        Inicializar o poller
+
+        Args:
+            db: Banco de dados (default: nova instância)
+        """
+        self.config = Config()
+        self.db = db or Database()
+        self.rss_scraper = RSScraper()
+
+        # Downloads (I/O bloqueante) em threads; leituras do banco em uma thread;
+        # gravações pela thread escritora, com commit em grupo entre feeds
+        self.fetch_executor = ThreadPoolExecutor(
+            max_workers=self.config.get_feed_poll_concurrency(),
+            thread_name_prefix="feed-poll"
+        )
+        self.db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="feed-poll-db")
+        self.write_queue = get_write_queue(self.db)
+
+        self.runs: Dict[str, FeedPollRun] = {}
+        # O event loop só guarda referência fraca às tasks: sem isto uma varredura longa pode ser coletada
+        self._tasks: Set[asyncio.Task] = set()
+
+        logger.info("📡 Poller de feeds inicializado")
+
+    def start_poll(self, client_ids: Optional[List[str]] = None, max_items: int = 50) -> str:
+        """
+        Iniciar uma varredura em background (requer event loop em execução)
+
+        Returns:
+            ID da varredura
+        """
+        run = FeedPollRun(id=str(uuid.uuid4()))
+        self.runs[run.id] = run
+        task = asyncio.create_task(self.poll(run, client_ids, max_items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"🚀 Varredura de feeds iniciada: {run.id}")
+        return run.id
+
+    def get_run(self, poll_id: str) -> Optional[FeedPollRun]:
+        """Obter uma varredura pelo ID"""
+        return self.runs.get(poll_id)
+
+    def _get_feed_sources(self, client_ids: Optional[List[str]]) -> List[Source]:
+        if client_ids:
+            sources = []
+            for client_id in client_ids:
+                sources.extend(self.db.get_sources_by_client(client_id))
+        else:
+            sources = self.db.get_all_active_sources()
+        return [source for source in sources if source.type == SourceType.RSS]
+
+    async def poll(self, run: FeedPollRun, client_ids: Optional[List[str]] = None,
+                   max_items: int = 50) -> FeedPollRun:
+        """
+        Varrer os feeds ativos
+
+        Args:
+            run: Varredura (contadores atualizados durante a execução)
+            client_ids: Restringir aos feeds destes clientes
+            max_items: Máximo de entradas por feed
+
+        Returns:
+            A própria varredura com os contadores finais
+        """
+        loop = asyncio.get_running_loop()
+        run.status = ContentStatus.PROCESSING
+        run.started_at = datetime.now()
+        start = time.perf_counter()
+
+        try:
+            sources = await loop.run_in_executor(self.db_executor, self._get_feed_sources, client_ids)
+            run.feeds = len(sources)
+            logger.info(f"📋 Varrendo {len(sources)} feeds")
+
+            dns_cache.prefetch(urlparse(source.url).hostname for source in sources)
+
+            global_limit = asyncio.Semaphore(self.config.get_feed_poll_concurrency())
+            per_host = self.config.get_feed_poll_per_host()
+            host_limits = defaultdict(lambda: asyncio.Semaphore(per_host))
+
+            async def progress():
+                while True:
+                    await asyncio.sleep(10)
+                    run.elapsed = time.perf_counter() - start
+                    logger.info(f"📡 Varredura {run.id[:8]}: {run.done}/{run.feeds} feeds ({run.feeds_per_second} feeds/s)")
+
+            reporter = asyncio.create_task(progress())
+            try:
+                await asyncio.gather(*(
+                    self._poll_source(run, source, max_items, global_limit, host_limits)
+                    for source in sources
+                ))
+            finally:
+                reporter.cancel()
+
+            run.status = ContentStatus.COMPLETED
+
+        except Exception as e:
+            logger.error(f"❌ Erro na varredura {run.id}: {e}")
+            run.status = ContentStatus.ERROR
+            run.error_message = str(e)
+
+        run.elapsed = time.perf_counter() - start
+        run.completed_at = datetime.now()
+        logger.info(
+            f"🎉 Varredura {run.id[:8]} concluída: {run.feeds} feeds, {run.not_modified} sem alteração, "
+            f"{run.errors} erros, {run.saved} conteúdos salvos em {run.elapsed:.1f}s ({run.feeds_per_second} feeds/s)"
+        )
+        return run
+
+    async def _poll_source(self, run: FeedPollRun, source: Source, max_items: int,
+                           global_limit: asyncio.Semaphore, host_limits: Dict[str, asyncio.Semaphore]):
+        """Baixar, parsear e gravar um feed"""
+        loop = asyncio.get_running_loop()
+        host = urlparse(source.url).netloc.lower()
+
+        try:
+            state = await loop.run_in_executor(self.db_executor, self.db.get_feed_state, source.id)
+            state = state or FeedState(source_id=source.id)
+
+            # Limite por host primeiro, para não ocupar vagas globais esperando um host lento
+            async with host_limits[host], global_limit:
+                response = await loop.run_in_executor(
+                    self.fetch_executor, self.rss_scraper.fetch_feed, source.url, state
+                )
+
+            if response is None:
+                run.not_modified += 1
+                await self.write_queue.execute(Database.save_feed_state, state)
+                return
+
+            run.fetched += 1
+            parsed, truncated, state = await self._parse(
+                loop, response.content, state, max_items, dict(response.headers)
+            )
+            contents = await loop.run_in_executor(
+                self.fetch_executor, self.rss_scraper.finalize_entries, parsed, truncated
+            )
+
+            saved_ids = await self.write_queue.execute(
+                Database.save_source_results, contents, source.id, source.client_id, state
+            )
+            run.new_entries += state.last_new_entries
+            run.saved += sum(1 for content_id in saved_ids if content_id)
+
+        except Exception as e:
+            run.errors += 1
+            logger.warning(f"⚠️  Erro no feed {source.name} ({source.url}): {e}")
+
+    async def _parse(self, loop: asyncio.AbstractEventLoop, content: bytes, state: FeedState,
+                     max_items: int, headers: Dict[str, str]):
+        """Parsear o feed no pool de processos (ou em thread, se o pool estiver desativado)"""
+        if not self.config.is_extraction_pool_enabled():
+            parsed, truncated = await loop.run_in_executor(
+                self.fetch_executor, self.rss_scraper.parse_feed_entries, content, state, max_items, headers
+            )
+            return parsed, truncated, state
+
+        parsed, truncated, state_dict = await loop.run_in_executor(
+            get_extraction_pool(), parse_feed, content, state.model_dump(), max_items, headers
+        )
+        return [ScrapedContent(**item) for item in parsed], truncated, FeedState(**state_dict)
+
@@ -4,8 +4,10 @@ Scraper para RSS/Atom feeds
 
 import feedparser
 import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import sys
@@ -15,9 +17,15 @@ from pathlib import Path
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
-from models.scraper import ScrapedContent, SourceType
+from models.scraper import ScrapedContent, SourceType, FeedState
 from utils.config import Config
+from utils.dates import parse_date, from_struct_time
+from utils.html_text import html_to_text
 from utils.logger import setup_logger
+from utils.sessions import session_provider
+from utils.resilience import request_with_retry
+from utils.robots import host_pacer
+from .web_scraper import WebScraper
 
 logger = setup_logger()
 
@@ -27,18 +35,34 @@ class RSScraper:
     def __init__(self):
         """Inicializar o scraper RSS"""
         self.config = Config()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.config.get_user_agent()
-        })
+        self.sessions = session_provider
+        
+        # Enriquecimento de entradas truncadas (criados sob demanda)
+        self._web_scraper: Optional[WebScraper] = None
+        self._enrich_executor: Optional[ThreadPoolExecutor] = None
+        self._enrich_lock = threading.Lock()
+    
+    @property
+    def session(self) -> requests.Session:
+        """Sessão HTTP da thread atual (pools compartilhados entre scrapers)"""
+        return self.sessions.get_session()
     
-    def scrape(self, source_url: str, max_items: int = 50) -> List[ScrapedContent]:
+    # GUIDs guardados na marca d'água (feeds sem datas ou fora de ordem)
+    SEEN_GUIDS_LIMIT = 200
+    
+    def scrape(self, source_url: str, max_items: int = 50,
+               state: Optional[FeedState] = None) -> List[ScrapedContent]:
         """
         Fazer scraping de um feed RSS/Atom
         
+        Com uma marca d'água, o feed é pedido com GET condicional e apenas as
+        entradas ainda não vistas são processadas; a marca é atualizada in-place
+        e deve ser gravada pelo chamador depois de salvar os conteúdos.
+        
         Args:
             source_url: URL do feed
             max_items: Número máximo de itens a coletar
+            state: Marca d'água da fonte (opcional)
             
         Returns:
             Lista de conteúdos coletados
@@ -46,32 +70,14 @@ class RSScraper:
         logger.info(f"📡 Iniciando scraping do feed: {source_url}")
         
         try:
-            # Fazer download do feed
-            response = self.session.get(
-                source_url,
-                timeout=self.config.get_timeout()
-            )
-            response.raise_for_status()
+            response = self.fetch_feed(source_url, state)
+            if response is None:
+                return []
             
-            # Parsear o feed
-            feed = feedparser.parse(response.content)
-            
-            if feed.bozo:
-                logger.warning(f"⚠️  Feed malformado: {feed.bozo_exception}")
-            
-            contents = []
-            
-            for entry in feed.entries[:max_items]:
-                try:
-                    content = self._parse_entry(entry)
-                    if content and self._validate_content(content):
-                        contents.append(content)
-                except Exception as e:
-                    logger.error(f"❌ Erro ao processar entrada: {e}")
-                    continue
-            
-            logger.info(f"✅ Feed processado: {len(contents)} itens coletados")
-            return contents
+            parsed, truncated = self.parse_feed_entries(
+                response.content, state, max_items, dict(response.headers)
+            )
+            return self.finalize_entries(parsed, truncated)
             
         except requests.RequestException as e:
             logger.error(f"❌ Erro de requisição: {e}")
@@ -80,6 +86,245 @@ class RSScraper:
             logger.error(f"❌ Erro geral no scraping: {e}")
             return []
     
+    def fetch_feed(self, source_url: str, state: Optional[FeedState] = None) -> Optional[requests.Response]:
+        """
+        Baixar o feed (GET condicional se houver marca d'água)
+        
+        Returns:
+            Resposta ou None se o feed não mudou (304)
+            
+        Raises:
+            requests.RequestException: Em erro de rede ou status HTTP de erro
+        """
+        host_pacer.wait(source_url)
+        response = request_with_retry(
+            self.session, 'GET', source_url,
+            headers=self._conditional_headers(state),
+            timeout=self.config.get_timeout()
+        )
+        
+        if state is not None and response.status_code == 304:
+            state.last_checked_at = datetime.now()
+            state.last_new_entries = 0
+            logger.info(f"✅ Feed sem alterações (304): {source_url}")
+            return None
+        
+        response.raise_for_status()
+        return response
+    
+    def parse_feed_entries(self, content: bytes, state: Optional[FeedState] = None,
+                           max_items: int = 50,
+                           headers: Optional[Dict[str, str]] = None) -> Tuple[List[ScrapedContent], List[int]]:
+        """
+        Parsear o feed e as entradas novas (CPU apenas, sem rede)
+        
+        Args:
+            content: Corpo do feed
+            state: Marca d'água (filtra entradas vistas e é avançada in-place)
+            max_items: Número máximo de itens
+            headers: Headers da resposta (ETag/Last-Modified para a marca)
+            
+        Returns:
+            Conteúdos parseados (ainda não validados) e posições das entradas truncadas
+        """
+        feed = feedparser.parse(content)
+        
+        if feed.bozo:
+            logger.warning(f"⚠️  Feed malformado: {feed.bozo_exception}")
+        
+        entries = feed.entries[:max_items]
+        if state is not None:
+            entries = self._new_entries(entries, state)
+            self._advance_state(state, entries, headers or {})
+            logger.info(f"🆕 {len(entries)} entradas novas no feed")
+        
+        parsed = []
+        truncated = []
+        
+        for entry in entries:
+            try:
+                parsed_entry = self._parse_entry(entry)
+                if parsed_entry:
+                    parsed.append(parsed_entry)
+                    if self._is_truncated(entry, parsed_entry):
+                        truncated.append(len(parsed) - 1)
+            except Exception as e:
+                logger.error(f"❌ Erro ao processar entrada: {e}")
+                continue
+        
+        return parsed, truncated
+    
+    def finalize_entries(self, parsed: List[ScrapedContent], truncated: List[int]) -> List[ScrapedContent]:
+        """
+        Enriquecer entradas truncadas (se ativado) e validar
+        
+        Args:
+            parsed: Conteúdos de parse_feed_entries
+            truncated: Posições das entradas truncadas
+            
+        Returns:
+            Conteúdos válidos
+        """
+        # Buscar o texto completo das entradas que trazem só um teaser
+        if truncated and self.config.is_rss_enrich_enabled():
+            self._enrich_contents(parsed, truncated)
+        
+        contents = [content for content in parsed if self._validate_content(content)]
+        
+        logger.info(f"✅ Feed processado: {len(contents)} itens coletados")
+        return contents
+    
+    # Marcadores de teaser no fim do texto da entrada
+    TRUNCATION_MARKERS = (
+        '…', '...', '[…]', '[...]', 'leia mais', 'continue lendo', 'saiba mais',
+        'read more', 'continue reading', 'appeared first on'
+    )
+    
+    def _is_truncated(self, entry, content: ScrapedContent) -> bool:
+        """
+        Verificar se a entrada parece trazer só um teaser do artigo
+        
+        Entradas com content:encoded longo são completas; sem ele, são
+        truncadas se o texto for curto ou terminar em um marcador de teaser.
+        """
+        text = (content.content_text or '').strip()
+        if len(text) < self.config.get_rss_enrich_min_length():
+            return True
+        if entry.get('content'):
+            return False
+        tail = text[-80:].lower()
+        return any(marker in tail for marker in self.TRUNCATION_MARKERS)
+    
+    def _get_enrich_executor(self) -> ThreadPoolExecutor:
+        with self._enrich_lock:
+            if self._enrich_executor is None:
+                self._web_scraper = WebScraper()
+                self._enrich_executor = ThreadPoolExecutor(
+                    max_workers=self.config.get_rss_enrich_workers(),
+                    thread_name_prefix="rss-enrich"
+                )
+            return self._enrich_executor
+    
+    def _enrich_contents(self, contents: List[ScrapedContent], indexes: List[int]):
+        """
+        Buscar os artigos das entradas truncadas em paralelo e mesclar o texto
+        
+        O paralelismo é limitado por RSS_ENRICH_WORKERS; artigos do mesmo host
+        continuam espaçados pelo Crawl-delay (host_pacer).
+        
+        Args:
+            contents: Conteúdos parseados do feed (alterados in-place)
+            indexes: Posições das entradas truncadas
+        """
+        executor = self._get_enrich_executor()
+        futures = {
+            index: executor.submit(self._web_scraper.scrape_single_article, contents[index].url)
+            for index in indexes
+        }
+        
+        enriched = 0
+        for index, future in futures.items():
+            try:
+                article = future.result()
+            except Exception as e:
+                logger.warning(f"⚠️  Erro ao enriquecer {contents[index].url}: {e}")
+                continue
+            if article:
+                merged = self._merge_article(contents[index], article)
+                if merged is not contents[index]:
+                    contents[index] = merged
+                    enriched += 1
+        
+        logger.info(f"📰 Entradas enriquecidas com o texto completo: {enriched}/{len(indexes)}")
+    
+    def _merge_article(self, content: ScrapedContent, article: ScrapedContent) -> ScrapedContent:
+        """
+        Mesclar o artigo extraído na entrada do feed
+        
+        O texto vem do artigo (se for maior); título, data e resumo do feed são
+        mantidos, e autor/tags do artigo só preenchem lacunas.
+        """
+        if len(article.content_text or '') <= len(content.content_text or ''):
+            return content
+        
+        word_count = len(article.content_text.split())
+        return content.model_copy(update={
+            'content_text': article.content_text,
+            'summary': content.summary or article.summary,
+            'author': content.author or article.author,
+            'published_at': content.published_at or article.published_at,
+            'tags': content.tags or article.tags,
+            'word_count': word_count,
+            'reading_time': max(1, word_count // 200)
+        })
+    
+    def _conditional_headers(self, state: Optional[FeedState]) -> dict:
+        """Headers de GET condicional a partir da marca d'água"""
+        headers = {}
+        if state is not None:
+            if state.etag:
+                headers['If-None-Match'] = state.etag
+            if state.last_modified:
+                headers['If-Modified-Since'] = state.last_modified
+        return headers
+    
+    def _entry_key(self, entry) -> Tuple[Optional[str], Optional[datetime]]:
+        """GUID (id ou link) e data de uma entrada, sem parsear o conteúdo"""
+        guid = entry.get('id') or entry.get('link')
+        entry_date = None
+        for date_field in ['published_parsed', 'updated_parsed']:
+            entry_date = from_struct_time(entry.get(date_field))
+            if entry_date:
+                break
+        return guid, entry_date
+    
+    def _new_entries(self, entries: list, state: FeedState) -> list:
+        """
+        Filtrar as entradas já vistas
+        
+        Uma entrada é considerada vista se o GUID está na marca d'água ou se é
+        mais antiga que a entrada mais recente já processada.
+        """
+        seen = set(state.seen_guids)
+        high_water = state.last_entry_at.timestamp() if state.last_entry_at else None
+        
+        new_entries = []
+        for entry in entries:
+            guid, entry_date = self._entry_key(entry)
+            if guid and guid in seen:
+                continue
+            if high_water is not None and entry_date and entry_date.timestamp() < high_water:
+                continue
+            new_entries.append(entry)
+        return new_entries
+    
+    def _advance_state(self, state: FeedState, new_entries: list, headers: Dict[str, str]):
+        """Avançar a marca d'água com as entradas novas e os validadores HTTP"""
+        guids = []
+        dated = False
+        for entry in new_entries:
+            guid, entry_date = self._entry_key(entry)
+            if guid:
+                guids.append(guid)
+            if entry_date:
+                dated = True
+                if not state.last_entry_at or entry_date.timestamp() > state.last_entry_at.timestamp():
+                    state.last_entry_at = entry_date
+                    state.last_guid = guid
+        
+        # Feed sem datas: a primeira entrada é a mais recente
+        if guids and not dated:
+            state.last_guid = guids[0]
+        
+        state.seen_guids = (guids + [g for g in state.seen_guids if g not in guids])[:self.SEEN_GUIDS_LIMIT]
+        # requests usa headers case-insensitive; dicts vindos de outro processo não
+        lowered = {key.lower(): value for key, value in headers.items()}
+        state.etag = lowered.get('etag')
+        state.last_modified = lowered.get('last-modified')
+        state.last_checked_at = datetime.now()
+        state.last_new_entries = len(new_entries)
+        state.total_new_entries += len(new_entries)
+    
     def _parse_entry(self, entry) -> Optional[ScrapedContent]:
         """
         Parsear uma entrada do feed
@@ -100,14 +345,17 @@ class RSScraper:
         title = getattr(entry, 'title', None) or getattr(entry, 'link', 'Sem título')
         
         # Extrair conteúdo
-        content_text = self._extract_content(entry)
+        raw_content = self._extract_raw_content(entry)
+        content_text = html_to_text(raw_content) if raw_content else None
         
-        # Extrair resumo
-        summary = getattr(entry, 'summary', None)
-        if summary:
-            # Limpar HTML do resumo
-            from bs4 import BeautifulSoup
-            summary = BeautifulSoup(summary, 'html.parser').get_text(strip=True)
+        # Extrair resumo (muitas vezes é o mesmo HTML do conteúdo: não converter duas vezes)
+        raw_summary = getattr(entry, 'summary', None)
+        summary = None
+        if raw_summary:
+            if raw_summary == raw_content:
+                summary = ' '.join(content_text.split())
+            else:
+                summary = html_to_text(raw_summary, block_separator=' ')
         
         # Extrair autor
         author = None
@@ -119,14 +367,17 @@ class RSScraper:
         # Extrair data de publicação
         published_at = None
         for date_field in ['published_parsed', 'updated_parsed']:
-            if hasattr(entry, date_field) and getattr(entry, date_field):
-                time_struct = getattr(entry, date_field)
-                if time_struct:
-                    try:
-                        published_at = datetime(*time_struct[:6])
-                        break
-                    except (ValueError, TypeError):
-                        continue
+            published_at = from_struct_time(getattr(entry, date_field, None))
+            if published_at:
+                break
+        
+        # feedparser não entende datas em português: tentar o texto original
+        if not published_at:
+            domain = urlparse(url).netloc
+            for date_field in ['published', 'updated']:
+                published_at = parse_date(getattr(entry, date_field, None), domain)
+                if published_at:
+                    break
         
         # Extrair tags
         tags = []
@@ -167,8 +418,8 @@ class RSScraper:
         
         return None
     
-    def _extract_content(self, entry) -> Optional[str]:
-        """Extrair conteúdo textual da entrada"""
+    def _extract_raw_content(self, entry) -> Optional[str]:
+        """Obter o HTML do conteúdo da entrada (content, description ou summary)"""
         # Tentar diferentes campos de conteúdo
         content_fields = ['content', 'description', 'summary']
         
@@ -184,10 +435,8 @@ class RSScraper:
                     if hasattr(content, 'value'):
                         content = content.value
                     
-                    # Se for string, limpar HTML
                     if isinstance(content, str):
-                        from bs4 import BeautifulSoup
-                        return BeautifulSoup(content, 'html.parser').get_text(strip=True)
+                        return content
         
         return None
     
@@ -227,7 +476,10 @@ class RSScraper:
             Dicionário com informações do feed ou None
         """
         try:
-            response = self.session.get(feed_url, timeout=self.config.get_timeout())
+            response = request_with_retry(
+                self.session, 'GET', feed_url,
+                timeout=self.config.get_timeout()
+            )
             response.raise_for_status()
             
             feed = feedparser.parse(response.content)
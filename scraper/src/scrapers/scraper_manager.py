@@ -6,6 +6,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import uuid
 import asyncio
+from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import sys
@@ -15,11 +16,16 @@ from pathlib import Path
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
-from models.scraper import Source, ScrapedContent, SourceType, ScrapingTask, ContentStatus
+from models.scraper import Source, ScrapedContent, SourceType, ScrapingTask, ContentStatus, FeedState
 from models.database import Database
+from models.write_queue import get_write_queue
+from models.page_archive import get_page_archive
+from processors.retention import ContentRetention
 from .rss_scraper import RSScraper
 from .web_scraper import WebScraper
+from .feed_discovery import feed_discovery
 from utils.config import Config
+from utils.dns_cache import dns_cache
 from utils.logger import setup_logger
 
 logger = setup_logger()
@@ -31,11 +37,20 @@ class ScraperManager:
         """Inicializar o gerenciador"""
         self.config = Config()
         self.db = Database()
+        self.retention = ContentRetention(self.db)
+        # Gravações da coleta pela thread escritora (commit em grupo)
+        self.write_queue = get_write_queue(self.db)
         
         # Inicializar scrapers
         self.rss_scraper = RSScraper()
         self.web_scraper = WebScraper()
         
+        # Executor de longa duração: as threads (e suas sessões HTTP) são reaproveitadas
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.get_scraper_workers(),
+            thread_name_prefix="scraper"
+        )
+        
         # Armazenamento de tarefas em execução
         self.running_tasks: Dict[str, ScrapingTask] = {}
         
@@ -102,6 +117,9 @@ class ScraperManager:
             
             logger.info(f"📋 Processando {len(sources)} fontes para a tarefa {task_id}")
             
+            # Resolver os hosts das fontes em background antes das requisições
+            dns_cache.prefetch(urlparse(source.url).hostname for source in sources)
+            
             # Processar cada fonte
             total_contents = 0
             for source in sources:
@@ -111,26 +129,23 @@ class ScraperManager:
                         logger.info(f"⏭️  Pulando fonte recente: {source.name}")
                         continue
                     
-                    # Fazer scraping da fonte
-                    contents = await self._scrape_source(source)
+                    # Marca d'água do feed (RSS): só entradas novas são processadas
+                    feed_state = self._load_feed_state(source, force_rescrape)
                     
-                    # Salvar conteúdos no banco
-                    saved_count = 0
-                    for content in contents:
-                        content_id = self.db.save_content(content, source.id, source.client_id)
-                        if content_id:
-                            saved_count += 1
+                    # Fazer scraping da fonte (sitemaps: só artigos alterados desde a última coleta)
+                    since = None if force_rescrape else source.last_scraped_at
+                    contents = await self._scrape_source(source, feed_state, since)
+                    
+                    # Conteúdos, marca d'água e data do último scraping na mesma transação
+                    # (o delay entre requisições é aplicado por host nos scrapers)
+                    saved_ids = await self.write_queue.execute(
+                        Database.save_source_results, contents, source.id, source.client_id, feed_state
+                    )
+                    saved_count = sum(1 for content_id in saved_ids if content_id)
                     
                     logger.info(f"✅ Fonte processada: {source.name} - {saved_count} conteúdos salvos")
                     total_contents += saved_count
                     
-                    # Atualizar data do último scraping
-                    self.db.update_source_last_scraped(source.id)
-                    
-                    # Respeitar delay entre fontes
-                    import time
-                    time.sleep(self.config.get_request_delay())
-                    
                 except Exception as e:
                     logger.error(f"❌ Erro ao processar fonte {source.name}: {e}")
                     continue
@@ -142,6 +157,18 @@ class ScraperManager:
             
             logger.info(f"🎉 Tarefa {task_id} concluída: {total_contents} conteúdos coletados")
             
+            # Retenção do arquivo de HTML bruto (compacta segmentos: fora do event loop)
+            archive = get_page_archive()
+            if archive is not None:
+                try:
+                    await asyncio.to_thread(archive.apply_retention)
+                except Exception as e:
+                    logger.warning(f"⚠️  Erro ao aplicar retenção do arquivo: {e}")
+            
+            # Retenção dos conteúdos (arquivamento e exclusão por cliente) em thread própria
+            if self.config.is_content_retention_enabled():
+                self.retention.start_job()
+            
         except Exception as e:
             logger.error(f"❌ Erro na tarefa {task_id}: {e}")
             task.status = ContentStatus.ERROR
@@ -209,12 +236,37 @@ class ScraperManager:
         
         return time_since_last.total_seconds() < (threshold_hours * 3600)
     
-    async def _scrape_source(self, source: Source) -> List[ScrapedContent]:
+    def _load_feed_state(self, source: Source, force_rescrape: bool) -> Optional[FeedState]:
+        """
+        Obter a marca d'água de uma fonte RSS
+        
+        Args:
+            source: Fonte
+            force_rescrape: Ignorar a marca (reprocessar todo o feed)
+            
+        Returns:
+            Marca d'água ou None se a fonte não for RSS
+        """
+        if source.type != SourceType.RSS:
+            return None
+        
+        state = self.db.get_feed_state(source.id)
+        if state is None:
+            return FeedState(source_id=source.id)
+        if force_rescrape:
+            return FeedState(source_id=source.id, total_new_entries=state.total_new_entries)
+        return state
+    
+    async def _scrape_source(self, source: Source,
+                             feed_state: Optional[FeedState] = None,
+                             since: Optional[datetime] = None) -> List[ScrapedContent]:
         """
         Fazer scraping de uma fonte específica
         
         Args:
             source: Fonte para scraping
+            feed_state: Marca d'água do feed (apenas RSS)
+            since: Última coleta (filtro de lastmod dos sitemaps; apenas blog/news)
             
         Returns:
             Lista de conteúdos coletados
@@ -224,15 +276,13 @@ class ScraperManager:
         try:
             if source.type == SourceType.RSS:
                 # Usar executor para rodar em thread separada
-                with ThreadPoolExecutor() as executor:
-                    future = executor.submit(self.rss_scraper.scrape, source.url)
-                    contents = await asyncio.wrap_future(future)
+                future = self.executor.submit(self.rss_scraper.scrape, source.url, state=feed_state)
+                contents = await asyncio.wrap_future(future)
                 return contents
             
             elif source.type in [SourceType.BLOG, SourceType.NEWS]:
-                with ThreadPoolExecutor() as executor:
-                    future = executor.submit(self.web_scraper.scrape, source.url)
-                    contents = await asyncio.wrap_future(future)
+                future = self.executor.submit(self.web_scraper.scrape, source.url, since=since)
+                contents = await asyncio.wrap_future(future)
                 return contents
             
             elif source.type == SourceType.YOUTUBE:
@@ -285,9 +335,8 @@ class ScraperManager:
             
             else:
                 # Fazer scraping de página web
-                with ThreadPoolExecutor() as executor:
-                    future = executor.submit(self.web_scraper.scrape_single_article, url)
-                    content = asyncio.run(asyncio.wrap_future(future))
+                future = self.executor.submit(self.web_scraper.scrape_single_article, url)
+                content = future.result()
                 return content
                 
         except Exception as e:
@@ -324,7 +373,8 @@ class ScraperManager:
             'success': False,
             'message': '',
             'sample_content': None,
-            'feed_info': None
+            'feed_info': None,
+            'discovered_feed': None
         }
         
         try:
@@ -344,6 +394,12 @@ class ScraperManager:
                     result['message'] = "Feed inválido ou inacessível"
             
             elif source_type in [SourceType.BLOG, SourceType.NEWS]:
+                # Site com feed: sugerir o caminho RSS (muito mais barato que scraping de HTML)
+                feed_url = feed_discovery.discover(source_url)
+                if feed_url:
+                    result['discovered_feed'] = feed_url
+                    result['feed_info'] = self.rss_scraper.get_feed_info(feed_url)
+                
                 # Testar scraping de site
                 content = self.web_scraper.scrape_single_article(source_url)
                 if content:
@@ -14,6 +14,9 @@ from models.scraper import MapResponse
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.config import Config
 from utils.logger import setup_logger
+from utils.robots import robots_cache
+from utils.sessions import session_provider
+from .sitemap_discovery import sitemap_discovery
 
 logger = setup_logger()
 
@@ -28,11 +31,16 @@ class SiteMapper:
         """Inicializar o Site Mapper"""
         self.config = Config()
         self.api_key = self.FIRECRAWL_API_KEY
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Headers do Firecrawl vão por requisição; a sessão (pools + cache de DNS) é compartilhada
+        self.headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
-        })
+        }
+
+    @property
+    def session(self) -> requests.Session:
+        """Sessão HTTP da thread atual"""
+        return session_provider.get_session()
 
     def map_site(self, url: str, max_urls: int = None) -> MapResponse:
         """
@@ -64,6 +72,7 @@ class SiteMapper:
             response = self.session.post(
                 self.FIRECRAWL_API_URL,
                 json=payload,
+                headers=self.headers,
                 timeout=30
             )
 
@@ -225,65 +234,22 @@ class SiteMapper:
         logger.info(f"🔄 Usando método alternativo para mapear: {url}")
 
         try:
-            # Tentar sitemap.xml
-            sitemap_url = url.rstrip('/') + '/sitemap.xml'
-            response = self.session.get(sitemap_url, timeout=10)
+            url = self._normalize_url(url)
 
-            if response.status_code == 200:
-                return self._parse_sitemap(response.text, max_urls)
+            # Sitemaps do robots.txt ou caminhos comuns, seguindo índices e .xml.gz
+            links = sitemap_discovery.discover(url, max_urls=max_urls)
+            if links is None:
+                logger.warning("⚠️  Sitemap não encontrado, retornando lista vazia")
+                return MapResponse(links=[], urls=[])
 
-            logger.warning("⚠️  Sitemap não encontrado, retornando lista vazia")
-            return MapResponse(links=[], urls=[])
+            allowed = [link for link in links if robots_cache.can_fetch(link)]
+            logger.info(f"✅ Sitemap parseado: {len(allowed)} URLs")
+            return MapResponse(links=allowed, urls=allowed)
 
         except Exception as e:
             logger.error(f"❌ Erro no método alternativo: {e}")
             return MapResponse(links=[], urls=[])
 
-    def _parse_sitemap(self, sitemap_xml: str, max_urls: int) -> MapResponse:
-        """
-        Parsear sitemap XML
-
-        Args:
-            sitemap_xml: Conteúdo XML do sitemap
-            max_urls: Número máximo de URLs
-
-        Returns:
-            Resposta com URLs do sitemap
-        """
-        try:
-            from xml.etree import ElementTree as ET
-
-            root = ET.fromstring(sitemap_xml)
-
-            # Namespace do sitemap
-            namespace = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-
-            urls = []
-
-            # Tentar com namespace
-            locs = root.findall('.//sm:loc', namespace) or root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
-
-            # Tentar sem namespace
-            if not locs:
-                locs = root.findall('.//loc')
-
-            for loc in locs:
-                if loc.text:
-                    urls.append(loc.text.strip())
-
-            # Filtrar e deduplicar
-            unique_urls = list(dict.fromkeys(urls))  # Remove duplicates mantendo ordem
-
-            logger.info(f"✅ Sitemap parseado: {len(unique_urls)} URLs")
-            return MapResponse(
-                links=unique_urls[:max_urls],
-                urls=unique_urls[:max_urls]
-            )
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao parsear sitemap: {e}")
-            return MapResponse(links=[], urls=[])
-
     def test_map(self, url: str) -> Dict[str, Any]:
         """
         Testar funcionalidade de mapeamento
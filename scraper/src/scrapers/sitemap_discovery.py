@@ -0,0 +1,180 @@
+"""
+Descoberta de artigos por sitemaps (regulares, de notícias, índices e .xml.gz)
+Só URLs com <lastmod> posterior à última coleta da fonte são retornadas
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from xml.etree.ElementTree import ParseError
+
+import requests
+
+import sys
+from pathlib import Path
+
+# Adicionar o diretório pai ao path para importações relativas
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from utils.config import Config
+from utils.logger import setup_logger
+from utils.resilience import request_with_retry
+from utils.robots import robots_cache, host_pacer
+from utils.sessions import session_provider
+from utils.sitemaps import SitemapEntry, iter_sitemap
+
+logger = setup_logger()
+
+# Caminhos comuns quando o robots.txt não declara sitemaps
+COMMON_SITEMAP_PATHS = ('/sitemap_index.xml', '/sitemap.xml', '/sitemap.xml.gz')
+
+def _is_newer(entry: SitemapEntry, since: Optional[datetime]) -> bool:
+    """Entradas sem lastmod passam: não há como saber se mudaram"""
+    if since is None or entry.lastmod is None:
+        return True
+    return entry.lastmod.timestamp() > since.timestamp()
+
+def _sort_key(entry: SitemapEntry) -> float:
+    """Mais recentes primeiro; entradas sem data por último"""
+    return -entry.lastmod.timestamp() if entry.lastmod else float('inf')
+
+class SitemapDiscovery:
+    """Lê os sitemaps de um site, com cache por domínio das URLs de sitemap"""
+
+    def __init__(self):
+        """Inicializar a descoberta"""
+        self.config = Config()
+        self._cache: Dict[str, Tuple[List[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def _iter_remote(self, sitemap_url: str):
+        """Baixar um sitemap em streaming e iterar suas entradas"""
+        if not robots_cache.can_fetch(sitemap_url):
+            logger.debug(f"🚫 Sitemap bloqueado pelo robots.txt: {sitemap_url}")
+            return
+        host_pacer.wait(sitemap_url)
+        response = request_with_retry(
+            session_provider.get_session(), 'GET', sitemap_url,
+            max_retries=1,
+            stream=True,
+            timeout=self.config.get_timeout()
+        )
+        try:
+            if response.status_code != 200:
+                return
+            response.raw.decode_content = True
+            # O io.BufferedReader do parser falha se o urllib3 fechar o stream ao fim do corpo
+            response.raw.auto_close = False
+            yield from iter_sitemap(response.raw)
+        finally:
+            response.close()
+
+    def _locate(self, url: str) -> List[str]:
+        """URLs de sitemap do site: robots.txt ou o primeiro caminho comum que responder"""
+        domain = urlparse(url).netloc.lower()
+        with self._lock:
+            entry = self._cache.get(domain)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        sitemap_urls = robots_cache.site_maps(url)
+        if not sitemap_urls:
+            parsed = urlparse(url)
+            origin = f"{parsed.scheme}://{parsed.netloc}"
+            for path in COMMON_SITEMAP_PATHS:
+                try:
+                    if any(True for _ in self._iter_remote(origin + path)):
+                        sitemap_urls = [origin + path]
+                        break
+                except (requests.RequestException, ParseError):
+                    continue
+
+        with self._lock:
+            self._cache[domain] = (sitemap_urls, time.monotonic() + self.config.get_sitemap_discovery_ttl())
+        return sitemap_urls
+
+    def discover(self, url: str, since: Optional[datetime] = None,
+                 max_urls: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Descobrir URLs de artigos de um site pelos sitemaps
+
+        Índices de sitemap são seguidos (filhos com lastmod antigo são pulados
+        sem download) e as páginas são filtradas pelo caminho da fonte: uma
+        fonte em https://site.com/blog só recebe URLs sob /blog.
+
+        Args:
+            url: URL da fonte
+            since: Última coleta da fonte; só entradas modificadas depois dela
+            max_urls: Número máximo de URLs (as mais recentes primeiro)
+
+        Returns:
+            URLs das páginas, ou None se o site não tiver sitemap legível
+        """
+        sitemap_urls = self._locate(url)
+        if not sitemap_urls:
+            return None
+
+        source = urlparse(url)
+        host = source.netloc.lower()
+        # Fonte apontando para uma página (ex.: /noticias/index.html): usar o diretório
+        directory, _, last_segment = source.path.rpartition('/')
+        prefix = directory if '.' in last_segment else source.path.rstrip('/')
+        max_sitemaps = self.config.get_sitemap_max_files()
+
+        pending = list(sitemap_urls)
+        visited = set()
+        pages: Dict[str, SitemapEntry] = {}
+        readable = False
+
+        while pending and len(visited) < max_sitemaps:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+
+            children = []
+            try:
+                for entry in self._iter_remote(sitemap_url):
+                    readable = True
+                    if not _is_newer(entry, since):
+                        continue
+                    if entry.is_sitemap:
+                        children.append(entry)
+                        continue
+                    parsed = urlparse(entry.loc)
+                    # Segmentos inteiros: /blog não inclui /blogging nem /blog-archive
+                    under_prefix = not prefix or parsed.path == prefix or parsed.path.startswith(prefix + '/')
+                    if parsed.netloc.lower() != host or not under_prefix:
+                        continue
+                    current = pages.get(entry.loc)
+                    if current is None or _sort_key(entry) < _sort_key(current):
+                        pages[entry.loc] = entry
+            except (requests.RequestException, ParseError) as e:
+                logger.warning(f"⚠️  Erro ao ler sitemap {sitemap_url}: {e}")
+                continue
+
+            # Filhos alterados mais recentemente primeiro (news sitemaps costumam ser os atuais)
+            children.sort(key=_sort_key)
+            pending.extend(child.loc for child in children)
+
+        if not readable:
+            return None
+
+        entries = sorted(pages.values(), key=_sort_key)
+        urls = [entry.loc for entry in entries[:max_urls]]
+        logger.info(
+            f"🗺️  Sitemaps de {host}: {len(visited)} lidos, {len(pages)} páginas alteradas"
+            + (f" desde {since.isoformat()}" if since else "")
+        )
+        return urls
+
+    def clear(self):
+        """Limpar o cache"""
+        with self._lock:
+            self._cache.clear()
+
+# Instância global (cache compartilhado)
+sitemap_discovery = SitemapDiscovery()
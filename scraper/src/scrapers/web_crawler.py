@@ -13,6 +13,8 @@ from models.scraper import CrawlResponse
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.config import Config
 from utils.logger import setup_logger
+from utils.robots import robots_cache
+from utils.sessions import session_provider
 
 logger = setup_logger()
 
@@ -26,11 +28,16 @@ class WebCrawler:
         """Inicializar o Web Crawler"""
         self.config = Config()
         self.api_key = self.FIRECRAWL_API_KEY
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Headers do Firecrawl vão por requisição; a sessão (pools + cache de DNS) é compartilhada
+        self.headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
-        })
+        }
+
+    @property
+    def session(self) -> requests.Session:
+        """Sessão HTTP da thread atual"""
+        return session_provider.get_session()
 
     def crawl_site(self, url: str, max_pages: int = 10) -> CrawlResponse:
         """
@@ -49,6 +56,10 @@ class WebCrawler:
             # Normalizar URL
             normalized_url = self._normalize_url(url)
 
+            if not robots_cache.can_fetch(normalized_url):
+                logger.warning(f"🚫 Crawling bloqueado pelo robots.txt: {normalized_url}")
+                return CrawlResponse(pages=[], urls=[])
+
             # Iniciar crawl assíncrono com o Firecrawl
             payload = {
                 "url": normalized_url,
@@ -67,6 +78,7 @@ class WebCrawler:
             response = self.session.post(
                 self.FIRECRAWL_API_URL,
                 json=payload,
+                headers=self.headers,
                 timeout=30
             )
 
@@ -148,8 +160,11 @@ class WebCrawler:
                     if isinstance(item, dict) and 'url' in item:
                         urls.append(item['url'])
 
-        # Filtrar apenas URLs válidas
-        valid_urls = [url for url in urls if url and url.startswith('http')]
+        # Filtrar apenas URLs válidas e permitidas pelo robots.txt
+        valid_urls = [
+            url for url in urls
+            if url and url.startswith('http') and robots_cache.can_fetch(url)
+        ]
 
         return valid_urls
 
@@ -195,7 +210,7 @@ class WebCrawler:
 
         for attempt in range(max_polls):
             try:
-                response = self.session.get(poll_url, timeout=10)
+                response = self.session.get(poll_url, headers=self.headers, timeout=10)
                 response.raise_for_status()
                 data = response.json()
 
@@ -246,7 +261,7 @@ class WebCrawler:
                 "formats": ["markdown"]
             }
 
-            response = self.session.post(scrape_url, json=payload, timeout=30)
+            response = self.session.post(scrape_url, json=payload, headers=self.headers, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -297,8 +312,8 @@ class WebCrawler:
                 else:
                     urls.append(base_url + url)
 
-        # Remover duplicatas mantendo ordem
-        unique_urls = list(dict.fromkeys(urls))
+        # Remover duplicatas mantendo ordem e descartar URLs bloqueadas pelo robots.txt
+        unique_urls = [url for url in dict.fromkeys(urls) if robots_cache.can_fetch(url)]
 
         return unique_urls
 
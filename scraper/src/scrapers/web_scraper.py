@@ -7,7 +7,7 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from urllib.parse import urljoin, urlparse
-import time
+from concurrent.futures.process import BrokenProcessPool
 import re
 
 import sys
@@ -17,9 +17,16 @@ from pathlib import Path
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
+from models.page_archive import get_page_archive
 from models.scraper import ScrapedContent, SourceType
+from processors.extraction import extract_page, discover_links, run_in_pool
 from utils.config import Config
+from utils.dates import parse_date
 from utils.logger import setup_logger
+from utils.sessions import session_provider
+from utils.resilience import request_with_retry, circuit_breakers
+from utils.robots import robots_cache, host_pacer
+from .sitemap_discovery import sitemap_discovery
 
 logger = setup_logger()
 
@@ -29,10 +36,7 @@ class WebScraper:
     def __init__(self):
         """Inicializar o scraper web"""
         self.config = Config()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.config.get_user_agent()
-        })
+        self.sessions = session_provider
         
         # Configurações por padrão de site
         self.site_configs = {
@@ -74,13 +78,20 @@ class WebScraper:
             }
         }
     
-    def scrape(self, source_url: str, max_articles: int = 20) -> List[ScrapedContent]:
+    @property
+    def session(self) -> requests.Session:
+        """Sessão HTTP da thread atual (pools compartilhados entre scrapers)"""
+        return self.sessions.get_session()
+    
+    def scrape(self, source_url: str, max_articles: int = 20,
+               since: Optional[datetime] = None) -> List[ScrapedContent]:
         """
         Fazer scraping de um site web
         
         Args:
             source_url: URL do site
             max_articles: Número máximo de artigos a coletar
+            since: Última coleta da fonte (com sitemaps, só artigos alterados depois dela)
             
         Returns:
             Lista de conteúdos coletados
@@ -88,17 +99,20 @@ class WebScraper:
         logger.info(f"🌐 Iniciando scraping do site: {source_url}")
         
         try:
-            # Obter página principal
-            response = self.session.get(
-                source_url,
-                timeout=self.config.get_timeout()
-            )
-            response.raise_for_status()
+            if not robots_cache.can_fetch(source_url):
+                logger.warning(f"🚫 Página bloqueada pelo robots.txt: {source_url}")
+                return []
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            article_links = None
+            if self.config.is_sitemap_discovery_enabled():
+                article_links = sitemap_discovery.discover(source_url, since, max_articles)
+                if article_links is not None and not article_links:
+                    logger.info(f"⏭️  Nenhum artigo alterado no sitemap desde a última coleta: {source_url}")
+                    return []
             
-            # Descobrir artigos na página
-            article_links = self._discover_article_links(soup, source_url)
+            # Sem sitemap: descobrir artigos na página principal
+            if article_links is None:
+                article_links = self._discover_from_page(source_url)
             
             if not article_links:
                 logger.warning("⚠️  Nenhum artigo encontrado na página")
@@ -106,12 +120,20 @@ class WebScraper:
             
             logger.info(f"📄 Encontrados {len(article_links)} artigos")
             
+            # Descartar artigos bloqueados pelo robots.txt
+            article_links = [link for link in article_links if robots_cache.can_fetch(link)]
+            
             # Limitar número de artigos
             article_links = article_links[:max_articles]
             
             # Coletar conteúdo de cada artigo
             contents = []
             for i, article_url in enumerate(article_links, 1):
+                # Domínio com circuito aberto: não insistir nos artigos restantes
+                if circuit_breakers.is_open(article_url):
+                    logger.warning(f"⚠️  Circuito aberto, pulando artigos restantes de {source_url}")
+                    break
+                
                 logger.info(f"📖 Processando artigo {i}/{len(article_links)}: {article_url}")
                 
                 try:
@@ -119,9 +141,6 @@ class WebScraper:
                     if content and self._validate_content(content):
                         contents.append(content)
                     
-                    # Respeitar delay entre requisições
-                    time.sleep(self.config.get_request_delay())
-                    
                 except Exception as e:
                     logger.error(f"❌ Erro ao processar artigo {article_url}: {e}")
                     continue
@@ -136,6 +155,21 @@ class WebScraper:
             logger.error(f"❌ Erro geral no scraping: {e}")
             return []
     
+    def _discover_from_page(self, source_url: str) -> List[str]:
+        """Baixar a página principal e descobrir os links de artigos"""
+        host_pacer.wait(source_url)
+        response = request_with_retry(
+            self.session, 'GET', source_url,
+            timeout=self.config.get_timeout()
+        )
+        response.raise_for_status()
+        
+        # Parsing no pool de processos
+        return self._offload(
+            discover_links, self.discover_article_links,
+            response.content, source_url
+        )
+    
     def scrape_single_article(self, article_url: str) -> Optional[ScrapedContent]:
         """
         Fazer scraping de um único artigo
@@ -148,6 +182,10 @@ class WebScraper:
         """
         logger.info(f"📖 Fazendo scraping do artigo: {article_url}")
         
+        if not robots_cache.can_fetch(article_url):
+            logger.warning(f"🚫 Artigo bloqueado pelo robots.txt: {article_url}")
+            return None
+        
         try:
             content = self._scrape_article(article_url)
             if content and self._validate_content(content):
@@ -236,13 +274,78 @@ class WebScraper:
             Conteúdo parseado ou None
         """
         try:
-            response = self.session.get(
-                article_url,
+            # Respeitar o Crawl-delay do host (ou REQUEST_DELAY se não declarado)
+            host_pacer.wait(article_url)
+            response = request_with_retry(
+                self.session, 'GET', article_url,
                 timeout=self.config.get_timeout()
             )
             response.raise_for_status()
+            self._archive_response(article_url, response)
+            
+            result = self._offload(
+                extract_page, self._extract_article_dict,
+                response.content, article_url, False
+            )
+            return ScrapedContent(**result) if result else None
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao fazer scraping do artigo: {e}")
+            return None
+    
+    def _offload(self, func, fallback, *args):
+        """
+        Executar parsing/extração no pool de processos, ou localmente se desativado
+        
+        Args:
+            func: Função de processors.extraction (executada no worker)
+            fallback: Equivalente local, usado sem pool ou se o pool quebrar
+            *args: Argumentos (apenas dados serializáveis: bytes, str, bool)
+        """
+        if self.config.is_extraction_pool_enabled():
+            try:
+                return run_in_pool(func, *args)
+            except BrokenProcessPool as e:
+                logger.warning(f"⚠️  Extração no pool falhou, processando localmente: {e}")
+        return fallback(*args)
+    
+    def _extract_article_dict(self, html: bytes, article_url: str,
+                              validate: bool = True) -> Optional[Dict[str, Any]]:
+        """Equivalente local de extract_page (mesmo formato de retorno)"""
+        content = self.extract_article(html, article_url)
+        if content is None or (validate and not self._validate_content(content)):
+            return None
+        return content.model_dump()
+    
+    def discover_article_links(self, html: bytes, base_url: str) -> List[str]:
+        """
+        Descobrir links de artigos a partir do HTML de uma página de listagem
+        
+        Args:
+            html: HTML da página
+            base_url: URL da página
+            
+        Returns:
+            Lista de URLs de artigos
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        return self._discover_article_links(soup, base_url)
+    
+    def extract_article(self, html: bytes, article_url: str) -> Optional[ScrapedContent]:
+        """
+        Extrair o conteúdo de um artigo a partir do HTML bruto (sem rede)
+        
+        Usado tanto no scraping quanto na re-extração de páginas arquivadas.
+        
+        Args:
+            html: HTML da página
+            article_url: URL do artigo
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+        Returns:
+            Conteúdo parseado ou None
+        """
+        try:
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Obter configuração específica do site
             domain = urlparse(article_url).netloc
@@ -261,7 +364,7 @@ class WebScraper:
             author = self._extract_author(soup, config)
             
             # Extrair data de publicação
-            published_at = self._extract_date(soup, config)
+            published_at = self._extract_date(soup, config, domain)
             
             # Extrair tags
             tags = self._extract_tags(soup)
@@ -284,9 +387,32 @@ class WebScraper:
             )
             
         except Exception as e:
-            logger.error(f"❌ Erro ao fazer scraping do artigo: {e}")
+            logger.error(f"❌ Erro ao extrair artigo {article_url}: {e}")
             return None
     
+    def _archive_response(self, url: str, response: requests.Response):
+        """
+        Guardar o HTML bruto no arquivo de páginas (falhas não interrompem o scraping)
+        
+        Args:
+            url: URL do artigo
+            response: Resposta HTTP
+        """
+        archive = get_page_archive()
+        if archive is None:
+            return
+        
+        try:
+            archive.put(
+                url,
+                response.content,
+                status=response.status_code,
+                content_type=response.headers.get('Content-Type'),
+                encoding=response.encoding
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Erro ao arquivar página {url}: {e}")
+    
     def _get_site_config(self, domain: str) -> Dict[str, Any]:
         """
         Obter configuração específica para um domínio
@@ -398,7 +524,8 @@ class WebScraper:
         
         return None
     
-    def _extract_date(self, soup: BeautifulSoup, config: Dict[str, Any]) -> Optional[datetime]:
+    def _extract_date(self, soup: BeautifulSoup, config: Dict[str, Any],
+                      domain: Optional[str] = None) -> Optional[datetime]:
         """Extrair data de publicação"""
         for selector in config['date_selectors']:
             elements = soup.select(selector)
@@ -419,41 +546,24 @@ class WebScraper:
                     date_str = element.get_text(strip=True)
                 
                 if date_str:
-                    date = self._parse_date(date_str)
+                    date = self._parse_date(date_str, domain)
                     if date:
                         return date
         
         return None
     
-    def _parse_date(self, date_str: str) -> Optional[datetime]:
+    def _parse_date(self, date_str: str, domain: Optional[str] = None) -> Optional[datetime]:
         """
         Parsear string de data para datetime
         
         Args:
             date_str: String de data
+            domain: Domínio do artigo (memoriza o formato usado pelo site)
             
         Returns:
             Datetime ou None se inválido
         """
-        # Padrões comuns de data
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}',  # ISO
-            r'\d{4}/\d{2}/\d{2}',
-            r'\d{2}/\d{2}/\d{4}',
-            r'\d{2}-\d{2}-\d{4}',
-            r'\w+ \d{1,2}, \d{4}',  # Month DD, YYYY
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, date_str)
-            if match:
-                try:
-                    from dateutil.parser import parse
-                    return parse(match.group())
-                except Exception:
-                    continue
-        
-        return None
+        return parse_date(date_str, domain)
     
     def _extract_tags(self, soup: BeautifulSoup) -> List[str]:
         """Extrair tags do artigo"""
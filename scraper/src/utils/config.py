@@ -4,7 +4,7 @@ Arquivo de configuração do scraper
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict
 
 # Tentar carregar dotenv
 try:
@@ -44,6 +44,105 @@ class Config:
         backend_dir = self.base_dir.parent
         return backend_dir / "data" / "briefflow.db"
     
+    def get_db_journal_mode(self) -> str:
+        """Obter journal_mode do SQLite (WAL permite leituras durante gravações)"""
+        return os.getenv("DB_JOURNAL_MODE", "WAL").upper()
+    
+    def get_db_synchronous(self) -> str:
+        """Obter nível de synchronous do SQLite (NORMAL é seguro com WAL)"""
+        return os.getenv("DB_SYNCHRONOUS", "NORMAL").upper()
+    
+    def get_db_mmap_size(self) -> int:
+        """Obter tamanho máximo (bytes) do banco mapeado em memória"""
+        return int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+    
+    def get_db_cache_size(self) -> int:
+        """Obter cache de páginas por conexão (negativo = KiB, positivo = páginas)"""
+        return int(os.getenv("DB_CACHE_SIZE", "-65536"))
+    
+    def get_db_busy_timeout_ms(self) -> int:
+        """Obter quanto tempo (ms) esperar por um lock antes de falhar com 'database is locked'"""
+        return int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+    
+    def get_db_pool_workers(self) -> int:
+        """Obter threads do pool que executa as consultas dos handlers da API"""
+        return int(os.getenv("DB_POOL_WORKERS", "4"))
+    
+    def get_db_lookup_cache_ttl(self) -> float:
+        """Obter TTL (segundos) do cache de clientes e fontes (0 = desligado)"""
+        return float(os.getenv("DB_LOOKUP_CACHE_TTL", "300"))
+    
+    def is_db_lookup_cache_version_check_enabled(self) -> bool:
+        """Verificar se o cache confere PRAGMA data_version para ver gravações de outros processos"""
+        return os.getenv("DB_LOOKUP_CACHE_VERSION_CHECK", "true").lower() == "true"
+    
+    def is_db_write_queue_enabled(self) -> bool:
+        """Verificar se as gravações da coleta passam pela thread escritora (commit em grupo)"""
+        return os.getenv("DB_WRITE_QUEUE_ENABLED", "true").lower() == "true"
+    
+    def get_db_write_batch_size(self) -> int:
+        """Obter número máximo de operações por commit do grupo"""
+        return int(os.getenv("DB_WRITE_BATCH_SIZE", "64"))
+    
+    def get_db_write_batch_ms(self) -> float:
+        """Obter janela (ms) de espera por mais operações antes do commit do grupo (0 = só as já enfileiradas)"""
+        return float(os.getenv("DB_WRITE_BATCH_MS", "0"))
+    
+    def get_db_write_queue_size(self) -> int:
+        """Obter tamanho máximo da fila de gravação (cheia = quem grava espera)"""
+        return int(os.getenv("DB_WRITE_QUEUE_SIZE", "1000"))
+    
+    def get_content_compression(self) -> str:
+        """Obter codec de compressão de content_text ('off', 'zlib' ou 'zstd')"""
+        return os.getenv("CONTENT_COMPRESSION", "off").lower()
+    
+    def get_content_compression_level(self) -> int:
+        """Obter nível de compressão de content_text"""
+        return int(os.getenv("CONTENT_COMPRESSION_LEVEL", "6"))
+    
+    def get_content_compression_min_bytes(self) -> int:
+        """Obter tamanho mínimo de content_text (bytes) para comprimir"""
+        return int(os.getenv("CONTENT_COMPRESSION_MIN_BYTES", "1024"))
+    
+    def get_content_compression_dict_size(self) -> int:
+        """Obter tamanho (bytes) do dicionário zstd treinado"""
+        return int(os.getenv("CONTENT_COMPRESSION_DICT_SIZE", str(110 * 1024)))
+    
+    def is_content_body_store_enabled(self) -> bool:
+        """Verificar se textos idênticos são gravados uma vez em content_bodies"""
+        return os.getenv("CONTENT_BODY_STORE", "false").lower() == "true"
+    
+    def is_content_retention_enabled(self) -> bool:
+        """Verificar se a retenção de conteúdos roda após cada tarefa de scraping"""
+        return os.getenv("CONTENT_RETENTION_ENABLED", "false").lower() == "true"
+    
+    def get_content_hot_days(self) -> int:
+        """Obter dias que um conteúdo fica no banco principal antes do arquivo (0 = sempre)"""
+        return int(os.getenv("CONTENT_HOT_DAYS", "180"))
+    
+    def get_content_delete_analyzed_days(self) -> int:
+        """Obter dias após os quais conteúdos analisados são apagados (0 = nunca)"""
+        return int(os.getenv("CONTENT_DELETE_ANALYZED_DAYS", "0"))
+    
+    def get_content_archive_path(self) -> Path:
+        """Obter caminho do banco de arquivo dos conteúdos antigos"""
+        archive_path = os.getenv("CONTENT_ARCHIVE_PATH")
+        if archive_path:
+            return Path(archive_path)
+        return self.get_database_path().parent / "briefflow-archive.db"
+    
+    def get_content_retention_batch_size(self) -> int:
+        """Obter número de conteúdos movidos/apagados por transação"""
+        return int(os.getenv("CONTENT_RETENTION_BATCH_SIZE", "500"))
+    
+    def get_content_retention_vacuum_pages(self) -> int:
+        """Obter páginas devolvidas ao disco (incremental_vacuum) após cada lote"""
+        return int(os.getenv("CONTENT_RETENTION_VACUUM_PAGES", "2000"))
+    
+    def is_db_query_plan_check_enabled(self) -> bool:
+        """Verificar se os planos das consultas quentes devem ser checados na inicialização"""
+        return os.getenv("DB_QUERY_PLAN_CHECK", "true").lower() == "true"
+    
     def get_briefflow_api_url(self) -> str:
         """Obter URL da API do BriefFlow"""
         return os.getenv("BRIEFFLOW_API_URL", "http://localhost:5001")
@@ -67,14 +166,164 @@ class Config:
         """Obter delay entre requests em segundos"""
         return float(os.getenv("REQUEST_DELAY", "1.0"))
     
+    def is_robots_enabled(self) -> bool:
+        """Verificar se o robots.txt deve ser respeitado"""
+        return os.getenv("ROBOTS_ENABLED", "true").lower() == "true"
+    
+    def get_robots_user_agent(self) -> str:
+        """Obter o nome de agente usado para casar regras do robots.txt"""
+        return os.getenv("ROBOTS_USER_AGENT", "BriefFlowBot")
+    
+    def get_robots_cache_ttl(self) -> float:
+        """Obter validade em segundos do robots.txt em cache"""
+        return float(os.getenv("ROBOTS_CACHE_TTL", "86400"))
+    
+    def get_robots_error_ttl(self) -> float:
+        """Obter validade em segundos do cache quando o robots.txt está inacessível"""
+        return float(os.getenv("ROBOTS_ERROR_TTL", "600"))
+    
+    def get_robots_max_crawl_delay(self) -> float:
+        """Obter limite superior em segundos para o Crawl-delay declarado pelos sites"""
+        return float(os.getenv("ROBOTS_MAX_CRAWL_DELAY", "30"))
+    
     def get_max_retries(self) -> int:
         """Obter número máximo de tentativas"""
         return int(os.getenv("MAX_RETRIES", "3"))
     
+    def get_retry_backoff_base(self) -> float:
+        """Obter base do backoff exponencial entre tentativas em segundos"""
+        return float(os.getenv("RETRY_BACKOFF_BASE", "1.0"))
+    
+    def get_retry_backoff_max(self) -> float:
+        """Obter espera máxima entre tentativas em segundos"""
+        return float(os.getenv("RETRY_BACKOFF_MAX", "30"))
+    
+    def get_circuit_failure_threshold(self) -> int:
+        """Obter número de falhas consecutivas que abre o circuito de um domínio"""
+        return int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    
+    def get_circuit_cooldown(self) -> float:
+        """Obter tempo em segundos que o circuito de um domínio fica aberto"""
+        return float(os.getenv("CIRCUIT_COOLDOWN", "300"))
+    
+    def get_http_pool_connections(self) -> int:
+        """Obter número de pools de host mantidos por sessão HTTP"""
+        return int(os.getenv("HTTP_POOL_CONNECTIONS", "50"))
+    
+    def get_http_pool_maxsize(self) -> int:
+        """Obter número máximo de conexões keep-alive por host"""
+        return int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+    
+    def get_http_pool_host_sizes(self) -> Dict[str, int]:
+        """Obter tamanhos de pool específicos por host (formato: host=tamanho,host=tamanho)"""
+        sizes = {}
+        for item in os.getenv("HTTP_POOL_HOST_SIZES", "").split(","):
+            host, _, size = item.partition("=")
+            if host.strip() and size.strip().isdigit():
+                sizes[host.strip().lower()] = int(size)
+        return sizes
+    
+    def get_http_pool_block(self) -> bool:
+        """Verificar se requisições devem aguardar conexão livre em vez de abrir conexões extras"""
+        return os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+    
+    def get_http_session_max_idle(self) -> float:
+        """Obter tempo ocioso em segundos após o qual a sessão da thread é recriada"""
+        return float(os.getenv("HTTP_SESSION_MAX_IDLE", "60"))
+    
+    def get_http_session_max_requests(self) -> int:
+        """Obter número de requisições após o qual a sessão da thread é recriada"""
+        return int(os.getenv("HTTP_SESSION_MAX_REQUESTS", "1000"))
+    
+    def is_dns_cache_enabled(self) -> bool:
+        """Verificar se o cache de DNS em processo está ativo"""
+        return os.getenv("DNS_CACHE_ENABLED", "true").lower() == "true"
+    
+    def get_dns_cache_ttl(self) -> float:
+        """Obter TTL padrão em segundos quando o TTL real do registro não é conhecido"""
+        return float(os.getenv("DNS_CACHE_TTL", "300"))
+    
+    def get_dns_cache_min_ttl(self) -> float:
+        """Obter TTL mínimo em segundos (também a janela de renovação antecipada)"""
+        return float(os.getenv("DNS_CACHE_MIN_TTL", "30"))
+    
+    def get_dns_cache_max_ttl(self) -> float:
+        """Obter TTL máximo em segundos de uma entrada do cache de DNS"""
+        return float(os.getenv("DNS_CACHE_MAX_TTL", "3600"))
+    
+    def get_dns_negative_ttl(self) -> float:
+        """Obter TTL em segundos de falhas de resolução em cache"""
+        return float(os.getenv("DNS_NEGATIVE_TTL", "60"))
+    
+    def get_dns_stale_ttl(self) -> float:
+        """Obter por quantos segundos uma entrada expirada pode ser servida enquanto é renovada"""
+        return float(os.getenv("DNS_STALE_TTL", "300"))
+    
+    def get_scraper_workers(self) -> int:
+        """Obter número de threads do executor de scraping"""
+        return int(os.getenv("SCRAPER_WORKERS", "8"))
+    
+    def is_extraction_pool_enabled(self) -> bool:
+        """Verificar se parsing e extração rodam no pool de processos"""
+        return os.getenv("EXTRACTION_POOL_ENABLED", "true").lower() == "true"
+    
+    def get_extraction_workers(self) -> int:
+        """Obter número de processos do pool de extração (0 = número de CPUs)"""
+        workers = int(os.getenv("EXTRACTION_WORKERS", "0"))
+        return workers if workers > 0 else (os.cpu_count() or 1)
+    
+    def get_reextract_batch_size(self) -> int:
+        """Obter quantas páginas são re-extraídas e gravadas por transação"""
+        return int(os.getenv("REEXTRACT_BATCH_SIZE", "500"))
+    
+    def is_rss_enrich_enabled(self) -> bool:
+        """Verificar se entradas de feed truncadas devem buscar o artigo completo"""
+        return os.getenv("RSS_ENRICH_ENABLED", "false").lower() == "true"
+    
+    def get_rss_enrich_workers(self) -> int:
+        """Obter número máximo de artigos buscados em paralelo no enriquecimento"""
+        return int(os.getenv("RSS_ENRICH_WORKERS", "4"))
+    
+    def get_rss_enrich_min_length(self) -> int:
+        """Obter comprimento abaixo do qual uma entrada de feed é considerada truncada"""
+        return int(os.getenv("RSS_ENRICH_MIN_LENGTH", "500"))
+    
+    def get_feed_poll_concurrency(self) -> int:
+        """Obter número máximo de feeds baixados em paralelo pelo poller"""
+        return int(os.getenv("FEED_POLL_CONCURRENCY", "64"))
+    
+    def get_feed_poll_per_host(self) -> int:
+        """Obter número máximo de feeds do mesmo host baixados em paralelo"""
+        return int(os.getenv("FEED_POLL_PER_HOST", "2"))
+    
+    def get_feed_discovery_ttl(self) -> float:
+        """Obter por quantos segundos o feed descoberto de um domínio fica em cache"""
+        return float(os.getenv("FEED_DISCOVERY_TTL", "86400"))
+    
+    def get_feed_discovery_negative_ttl(self) -> float:
+        """Obter por quantos segundos um domínio sem feed fica em cache"""
+        return float(os.getenv("FEED_DISCOVERY_NEGATIVE_TTL", "3600"))
+    
+    def is_sitemap_discovery_enabled(self) -> bool:
+        """Verificar se o WebScraper deve descobrir artigos pelos sitemaps do site"""
+        return os.getenv("SITEMAP_DISCOVERY_ENABLED", "false").lower() == "true"
+    
+    def get_sitemap_discovery_ttl(self) -> float:
+        """Obter por quantos segundos as URLs de sitemap de um domínio ficam em cache"""
+        return float(os.getenv("SITEMAP_DISCOVERY_TTL", "86400"))
+    
+    def get_sitemap_max_files(self) -> int:
+        """Obter número máximo de sitemaps (incluindo filhos de índices) lidos por fonte"""
+        return int(os.getenv("SITEMAP_MAX_FILES", "10"))
+    
     def get_timeout(self) -> int:
         """Obter timeout de requests em segundos"""
         return int(os.getenv("REQUEST_TIMEOUT", "30"))
     
+    def is_date_day_first(self) -> bool:
+        """Verificar se datas numéricas ambíguas (03/04/2024) são dia/mês (padrão brasileiro)"""
+        return os.getenv("DATE_DAY_FIRST", "true").lower() == "true"
+    
     def get_content_min_length(self) -> int:
         """Obter comprimento mínimo do conteúdo"""
         return int(os.getenv("CONTENT_MIN_LENGTH", "100"))
@@ -83,6 +332,33 @@ class Config:
         """Obter comprimento máximo do conteúdo"""
         return int(os.getenv("CONTENT_MAX_LENGTH", "50000"))
     
+    def is_archive_enabled(self) -> bool:
+        """Verificar se o HTML bruto das páginas deve ser arquivado"""
+        return os.getenv("ARCHIVE_ENABLED", "true").lower() == "true"
+    
+    def get_archive_dir(self) -> Path:
+        """Obter diretório do arquivo de páginas brutas"""
+        archive_dir = os.getenv("ARCHIVE_DIR")
+        if archive_dir:
+            return Path(archive_dir)
+        return self.get_database_path().parent / "archive"
+    
+    def get_archive_segment_max_mb(self) -> int:
+        """Obter tamanho máximo de cada segmento do arquivo (MB)"""
+        return int(os.getenv("ARCHIVE_SEGMENT_MAX_MB", "64"))
+    
+    def get_archive_compression_level(self) -> int:
+        """Obter nível de compressão do arquivo (zstd 1-22, zlib 1-9)"""
+        return int(os.getenv("ARCHIVE_COMPRESSION_LEVEL", "6"))
+    
+    def get_archive_retention_days(self) -> int:
+        """Obter por quantos dias as capturas antigas são mantidas"""
+        return int(os.getenv("ARCHIVE_RETENTION_DAYS", "30"))
+    
+    def is_archive_keep_latest(self) -> bool:
+        """Verificar se a captura mais recente de cada URL é mantida além da retenção"""
+        return os.getenv("ARCHIVE_KEEP_LATEST", "true").lower() == "true"
+    
     def validate(self) -> bool:
         """Validar configuração básica"""
         try:
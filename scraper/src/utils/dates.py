@@ -0,0 +1,243 @@
+"""
+Parser de datas dos scrapers
+Caminho rápido para ISO-8601, formatos pré-compilados, meses em português
+e memorização por domínio do último formato que funcionou
+"""
+
+import re
+import threading
+import time as _time
+from functools import partial
+from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from utils.config import Config
+
+# Tentar importar dateutil (último recurso para formatos desconhecidos)
+try:
+    from dateutil.parser import parse as dateutil_parse
+    HAS_DATEUTIL = True
+except ImportError:
+    HAS_DATEUTIL = False
+
+MONTHS = {
+    # Português
+    'janeiro': 1, 'fevereiro': 2, 'março': 3, 'marco': 3, 'abril': 4, 'maio': 5,
+    'junho': 6, 'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10,
+    'novembro': 11, 'dezembro': 12,
+    'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4, 'mai': 5, 'jun': 6, 'jul': 7,
+    'ago': 8, 'set': 9, 'out': 10, 'nov': 11, 'dez': 12,
+    # Inglês
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11,
+    'december': 12,
+    'feb': 2, 'apr': 4, 'aug': 8, 'sep': 9, 'sept': 9, 'oct': 10, 'dec': 12,
+}
+
+# Hora opcional depois da data: "10:30", "10h30", "às 10h30", "| 10:30:15"
+_TIME = r'(?:[^\d]{0,8}?(\d{1,2})[:h](\d{2})(?::(\d{2}))?)?'
+_TZ = r'\s*(Z|[+-]\d{2}:?\d{2})?'
+
+_ISO_RE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,]\d+)?)?' + _TZ + r')?'
+)
+_RFC822_RE = re.compile(r'\d{1,2}\s+[A-Za-z]{3}\s+\d{4}\s+\d{2}:\d{2}')
+_YMD_RE = re.compile(r'(\d{4})[/.](\d{1,2})[/.](\d{1,2})' + _TIME)
+_DMY_RE = re.compile(r'(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})' + _TIME)
+_DAY_MONTH_RE = re.compile(
+    r'(\d{1,2})(?:º)?(?:\s+de\s+|[\s.\-]+)([a-zç]+)\.?(?:\s+de\s+|[\s.\-,]+)(\d{4})' + _TIME,
+    re.IGNORECASE
+)
+_MONTH_DAY_RE = re.compile(
+    r'([a-zç]+)\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})' + _TIME,
+    re.IGNORECASE
+)
+
+def _tzinfo(value: Optional[str]) -> Optional[timezone]:
+    """Converter 'Z', '+03:00' ou '-0300' em tzinfo"""
+    if not value:
+        return None
+    if value == 'Z':
+        return timezone.utc
+    sign = -1 if value[0] == '-' else 1
+    digits = value[1:].replace(':', '')
+    return timezone(sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:4])))
+
+def _build(year, month, day, hour=None, minute=None, second=None, tz=None) -> datetime:
+    return datetime(
+        int(year), int(month), int(day),
+        int(hour or 0), int(minute or 0), int(second or 0),
+        tzinfo=tz
+    )
+
+def _parse_iso(date_str: str) -> Optional[datetime]:
+    match = _ISO_RE.search(date_str)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, tz = match.groups()
+    return _build(year, month, day, hour, minute, second, _tzinfo(tz))
+
+def _parse_rfc822(date_str: str) -> Optional[datetime]:
+    if not _RFC822_RE.search(date_str):
+        return None
+    return parsedate_to_datetime(date_str.strip())
+
+def _parse_ymd(date_str: str) -> Optional[datetime]:
+    match = _YMD_RE.search(date_str)
+    if not match:
+        return None
+    return _build(*match.groups())
+
+def _parse_dmy(date_str: str, day_first: bool = True) -> Optional[datetime]:
+    match = _DMY_RE.search(date_str)
+    if not match:
+        return None
+    first, second, year, hour, minute, seconds = match.groups()
+    day, month = int(first), int(second)
+    # Dia primeiro (padrão brasileiro), a menos que seja impossível
+    if month > 12 or (not day_first and day <= 12):
+        day, month = month, day
+    return _build(year, month, day, hour, minute, seconds)
+
+def _parse_day_month(date_str: str) -> Optional[datetime]:
+    match = _DAY_MONTH_RE.search(date_str)
+    if not match:
+        return None
+    day, month_name, year, hour, minute, second = match.groups()
+    month = MONTHS.get(month_name.lower())
+    if not month:
+        return None
+    return _build(year, month, day, hour, minute, second)
+
+def _parse_month_day(date_str: str) -> Optional[datetime]:
+    match = _MONTH_DAY_RE.search(date_str)
+    if not match:
+        return None
+    month_name, day, year, hour, minute, second = match.groups()
+    month = MONTHS.get(month_name.lower())
+    if not month:
+        return None
+    return _build(year, month, day, hour, minute, second)
+
+# Formatos em ordem de tentativa (o formato memorizado do domínio vem primeiro)
+FORMATS: List[Tuple[str, Callable[[str], Optional[datetime]]]] = [
+    ('iso', _parse_iso),
+    ('rfc822', _parse_rfc822),
+    ('ymd', _parse_ymd),
+    ('dmy', _parse_dmy),
+    ('day_month', _parse_day_month),
+    ('month_day', _parse_month_day),
+]
+_FORMATS_BY_NAME = dict(FORMATS)
+
+class DateParser:
+    """Parser de datas com memorização do formato por domínio"""
+
+    def __init__(self, day_first: Optional[bool] = None):
+        """
+        Inicializar o parser
+
+        Args:
+            day_first: Datas numéricas ambíguas com o dia primeiro (default: DATE_DAY_FIRST)
+        """
+        self.config = Config()
+        self.day_first = self.config.is_date_day_first() if day_first is None else day_first
+        self._formats = {**_FORMATS_BY_NAME, 'dmy': partial(_parse_dmy, day_first=self.day_first)}
+        self._domain_formats: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self.fast_path_hits = 0
+        self.memo_hits = 0
+        self.fallbacks = 0
+        self.failures = 0
+
+    def _try_format(self, name: str, date_str: str) -> Optional[datetime]:
+        try:
+            return self._formats[name](date_str)
+        except (ValueError, TypeError, OverflowError, IndexError):
+            return None
+
+    def parse(self, date_str: Optional[str], domain: Optional[str] = None) -> Optional[datetime]:
+        """
+        Parsear string de data para datetime
+
+        Args:
+            date_str: String de data (meta tag, atributo datetime, texto, RSS)
+            domain: Domínio de origem, usado para memorizar o formato
+
+        Returns:
+            Datetime (com fuso se informado na string) ou None se inválido
+        """
+        if not date_str:
+            return None
+        date_str = date_str.strip()
+
+        # Caminho rápido: ISO-8601 puro (atributos datetime e meta tags)
+        if len(date_str) >= 10 and date_str[4] == '-' and date_str[:4].isdigit():
+            try:
+                parsed = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+                self.fast_path_hits += 1
+                return parsed
+            except ValueError:
+                pass
+
+        # Formato que funcionou da última vez para o domínio
+        memo = self._domain_formats.get(domain) if domain else None
+        if memo:
+            parsed = self._try_format(memo, date_str)
+            if parsed:
+                self.memo_hits += 1
+                return parsed
+
+        for name, _ in FORMATS:
+            if name == memo:
+                continue
+            parsed = self._try_format(name, date_str)
+            if parsed:
+                if domain:
+                    with self._lock:
+                        self._domain_formats[domain] = name
+                return parsed
+
+        if HAS_DATEUTIL:
+            try:
+                parsed = dateutil_parse(date_str, dayfirst=self.day_first, fuzzy=True)
+                self.fallbacks += 1
+                return parsed
+            except (ValueError, OverflowError, TypeError):
+                pass
+
+        self.failures += 1
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores do parser e formatos memorizados"""
+        return {
+            'fast_path_hits': self.fast_path_hits,
+            'memo_hits': self.memo_hits,
+            'fallbacks': self.fallbacks,
+            'failures': self.failures,
+            'domain_formats': dict(self._domain_formats)
+        }
+
+# Parser global (memorização compartilhada entre scrapers)
+date_parser = DateParser()
+
+def parse_date(date_str: Optional[str], domain: Optional[str] = None) -> Optional[datetime]:
+    """Atalho para date_parser.parse"""
+    return date_parser.parse(date_str, domain)
+
+def from_struct_time(value: Optional[_time.struct_time]) -> Optional[datetime]:
+    """
+    Converter struct_time do feedparser (sempre em UTC) para datetime
+
+    Returns:
+        Datetime em UTC ou None se inválido
+    """
+    if not value:
+        return None
+    try:
+        return datetime(*value[:6], tzinfo=timezone.utc)
+    except (ValueError, TypeError):
+        return None
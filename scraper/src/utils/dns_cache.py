@@ -0,0 +1,261 @@
+"""
+Cache de resolução DNS em processo para os clientes HTTP dos scrapers
+TTL respeitado, cache negativo e renovação em background
+"""
+
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.exceptions import NewConnectionError
+
+from utils.config import Config
+from utils.logger import setup_logger
+
+# Tentar importar dnspython (permite ler o TTL real dos registros)
+try:
+    import dns.resolver
+    import dns.exception
+    HAS_DNSPYTHON = True
+except ImportError:
+    HAS_DNSPYTHON = False
+
+logger = setup_logger()
+
+class _DNSEntry:
+    """Resultado de uma resolução (positivo ou negativo)"""
+
+    __slots__ = ('addresses', 'expires_at', 'error')
+
+    def __init__(self, addresses: List[str], expires_at: float, error: Optional[str] = None):
+        self.addresses = addresses
+        self.expires_at = expires_at
+        self.error = error
+
+class DNSCache:
+    """Cache de resolução de nomes com TTL, cache negativo e stale-while-revalidate"""
+
+    def __init__(self):
+        """Inicializar o cache"""
+        self.config = Config()
+        self._entries: Dict[str, _DNSEntry] = {}
+        self._lock = threading.Lock()
+        self._lookup_locks: Dict[str, threading.Lock] = {}
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dns")
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    @staticmethod
+    def _is_ip(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host.strip('[]'))
+            return True
+        except ValueError:
+            return False
+
+    def _clamp_ttl(self, ttl: float) -> float:
+        return min(max(ttl, self.config.get_dns_cache_min_ttl()), self.config.get_dns_cache_max_ttl())
+
+    def _lookup(self, host: str) -> Tuple[List[str], float]:
+        """
+        Resolver o nome no sistema (ou via dnspython, se disponível)
+
+        Returns:
+            Endereços e TTL em segundos
+
+        Raises:
+            socket.gaierror: Se o nome não puder ser resolvido
+        """
+        if HAS_DNSPYTHON:
+            for record_type in ('A', 'AAAA'):
+                try:
+                    answer = dns.resolver.resolve(host, record_type)
+                    addresses = [record.to_text() for record in answer]
+                    if addresses:
+                        return addresses, float(answer.rrset.ttl)
+                except dns.exception.DNSException:
+                    continue
+            # CNAMEs para hosts locais, /etc/hosts, etc.: cair para o resolvedor do sistema
+
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        return addresses, self.config.get_dns_cache_ttl()
+
+    def _store(self, host: str) -> _DNSEntry:
+        """Resolver e gravar o resultado no cache (positivo ou negativo)"""
+        try:
+            addresses, ttl = self._lookup(host)
+            entry = _DNSEntry(addresses, time.monotonic() + self._clamp_ttl(ttl))
+        except (socket.gaierror, UnicodeError) as e:
+            with self._lock:
+                self.errors += 1
+            entry = _DNSEntry([], time.monotonic() + self.config.get_dns_negative_ttl(), error=str(e))
+
+        with self._lock:
+            self._entries[host] = entry
+        return entry
+
+    def _refresh(self, host: str):
+        """Renovar uma entrada em background"""
+        try:
+            self._store(host)
+        finally:
+            with self._lock:
+                self._refreshing.discard(host)
+                self.refreshes += 1
+
+    def _schedule_refresh(self, host: str):
+        with self._lock:
+            if host in self._refreshing:
+                return
+            self._refreshing.add(host)
+        self._executor.submit(self._refresh, host)
+
+    def resolve(self, host: str) -> List[str]:
+        """
+        Obter os endereços de um host
+
+        Entradas perto de expirar (ou expiradas há pouco) são devolvidas
+        imediatamente e renovadas em background, tirando a latência de DNS
+        do caminho crítico das requisições.
+
+        Args:
+            host: Nome do host
+
+        Returns:
+            Lista de endereços IP
+
+        Raises:
+            socket.gaierror: Se o nome não puder ser resolvido (inclusive via cache negativo)
+        """
+        if self._is_ip(host):
+            return [host]
+
+        host = host.lower()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(host)
+
+        if entry is not None:
+            remaining = entry.expires_at - now
+
+            if entry.error:
+                if remaining > 0:
+                    with self._lock:
+                        self.negative_hits += 1
+                    raise socket.gaierror(socket.EAI_NONAME, entry.error)
+            elif remaining > 0:
+                with self._lock:
+                    self.hits += 1
+                if remaining < self.config.get_dns_cache_min_ttl():
+                    self._schedule_refresh(host)
+                return entry.addresses
+            elif -remaining < self.config.get_dns_stale_ttl():
+                with self._lock:
+                    self.stale_hits += 1
+                self._schedule_refresh(host)
+                return entry.addresses
+
+        # Miss: apenas uma thread resolve cada host
+        with self._lock:
+            self.misses += 1
+            lookup_lock = self._lookup_locks.setdefault(host, threading.Lock())
+
+        with lookup_lock:
+            with self._lock:
+                current = self._entries.get(host)
+            if current is not None and current is not entry and current.expires_at > time.monotonic():
+                entry = current
+            else:
+                entry = self._store(host)
+
+        if entry.error:
+            raise socket.gaierror(socket.EAI_NONAME, entry.error)
+        return entry.addresses
+
+    def prefetch(self, hosts: Iterable[str]):
+        """Resolver hosts em background antes de usá-los"""
+        for host in set(h.lower() for h in hosts if h):
+            if self._is_ip(host):
+                continue
+            with self._lock:
+                entry = self._entries.get(host)
+            if entry is None or entry.expires_at <= time.monotonic():
+                self._schedule_refresh(host)
+
+    def invalidate(self, host: str):
+        """Remover um host do cache (ex.: após falha de conexão)"""
+        with self._lock:
+            self._entries.pop(host.lower(), None)
+
+    def clear(self):
+        """Limpar o cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de acertos/erros e tamanho do cache"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.negative_hits + self.misses
+            hit_count = self.hits + self.stale_hits + self.negative_hits
+            return {
+                'enabled': self.config.is_dns_cache_enabled(),
+                'backend': 'dnspython' if HAS_DNSPYTHON else 'getaddrinfo',
+                'entries': len(self._entries),
+                'negative_entries': sum(1 for entry in self._entries.values() if entry.error),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'errors': self.errors,
+                'hit_ratio': round(hit_count / lookups, 4) if lookups else None
+            }
+
+# Cache global de DNS (um por processo)
+dns_cache = DNSCache()
+
+class CachedDNSMixin:
+    """Mixin para conexões urllib3 que resolvem o host pelo cache de DNS"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        if not dns_cache.config.is_dns_cache_enabled():
+            return super()._new_conn()
+
+        try:
+            addresses = dns_cache.resolve(host)
+        except socket.gaierror as e:
+            raise NewConnectionError(self, f"Failed to resolve '{host}' ({e})") from e
+
+        # TLS/SNI e o header Host continuam usando self.host; só o connect usa o IP
+        last_error = NewConnectionError(self, f"No addresses cached for '{host}'")
+        for address in addresses[:2]:
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except NewConnectionError as e:
+                last_error = e
+            finally:
+                self._dns_host = host
+
+        # Endereços em cache não respondem: resolver novamente na próxima conexão
+        dns_cache.invalidate(host)
+        raise last_error
+
+class CachedDNSHTTPConnection(CachedDNSMixin, HTTPConnection):
+    """Conexão HTTP com cache de DNS"""
+
+class CachedDNSHTTPSConnection(CachedDNSMixin, HTTPSConnection):
+    """Conexão HTTPS com cache de DNS"""
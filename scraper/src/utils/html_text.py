@@ -0,0 +1,61 @@
+"""
+Conversão rápida de HTML para texto (sem árvore)
+Tokenizador por regex: remove tags, script/style e comentários, quebra linha
+nos elementos de bloco e decodifica entidades
+"""
+
+import re
+from html import unescape
+
+# Elementos que iniciam/terminam um bloco de texto
+BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'details', 'div',
+    'dl', 'dt', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre',
+    'section', 'summary', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead',
+    'tr', 'ul',
+})
+
+# Conteúdo descartado inteiro (inclusive o texto interno)
+_SKIP = r'<(script|style|noscript|template|svg|iframe)\b[^>]*>.*?</\1\s*>'
+_COMMENT = r'<!--.*?-->'
+# Tag de abertura/fechamento com atributos possivelmente entre aspas
+_TAG = r'<(/?)([a-zA-Z][a-zA-Z0-9]*)[^\'">]*(?:(?:"[^"]*"|\'[^\']*\')[^\'">]*)*>'
+# Doctype, CDATA, instruções de processamento
+_OTHER = r'<[!?][^>]*>'
+
+_TOKEN_RE = re.compile(
+    f'{_COMMENT}|{_SKIP}|{_TAG}|{_OTHER}',
+    re.DOTALL | re.IGNORECASE
+)
+
+def _replace_token(match: re.Match) -> str:
+    tag = match.group(3)
+    if tag and tag.lower() in BLOCK_TAGS:
+        return '\n'
+    return ''
+
+def html_to_text(html: str, block_separator: str = '\n') -> str:
+    """
+    Converter HTML em texto
+
+    Args:
+        html: Fragmento ou documento HTML (ex.: summary/content de um feed)
+        block_separator: Separador entre blocos ('\\n' para texto, ' ' para uma linha)
+
+    Returns:
+        Texto com espaços normalizados e sem linhas vazias
+    """
+    if not html:
+        return ''
+
+    # Texto puro (comum em summaries): só normalizar espaços
+    if '<' in html:
+        # Em HTML, quebras de linha do código-fonte são apenas espaço
+        html = _TOKEN_RE.sub(_replace_token, html.replace('\n', ' '))
+    if '&' in html:
+        html = unescape(html)
+
+    # split() sem argumento também trata &nbsp; (\xa0) como espaço
+    lines = (' '.join(line.split()) for line in html.split('\n'))
+    return block_separator.join(line for line in lines if line)
@@ -0,0 +1,63 @@
+"""
+Leitura de arquivos OPML (listas de feeds exportadas por leitores RSS)
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+def _is_http_url(url: Optional[str]) -> bool:
+    if not url:
+        return False
+    parsed = urlparse(url.strip())
+    return parsed.scheme in ('http', 'https') and bool(parsed.netloc)
+
+def parse_opml(opml: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Extrair os feeds de um documento OPML
+
+    Outlines aninhados (pastas/categorias) são percorridos; a categoria é o
+    título da pasta mais próxima.
+
+    Args:
+        opml: Conteúdo XML do OPML
+
+    Returns:
+        Lista de feeds com title, xml_url, html_url e category (sem duplicatas)
+
+    Raises:
+        ValueError: Se o documento não for um OPML válido
+    """
+    try:
+        root = ET.fromstring(opml.strip().encode('utf-8'))
+    except ET.ParseError as e:
+        raise ValueError(f"OPML inválido: {e}") from e
+
+    body = root.find('body')
+    if root.tag.lower() != 'opml' or body is None:
+        raise ValueError("OPML inválido: elemento <opml><body> não encontrado")
+
+    feeds = []
+    seen = set()
+
+    def walk(element: ET.Element, category: Optional[str]):
+        for outline in element.findall('outline'):
+            xml_url = outline.get('xmlUrl') or outline.get('xmlurl')
+            title = outline.get('title') or outline.get('text')
+
+            if _is_http_url(xml_url):
+                xml_url = xml_url.strip()
+                if xml_url not in seen:
+                    seen.add(xml_url)
+                    feeds.append({
+                        'title': title or xml_url,
+                        'xml_url': xml_url,
+                        'html_url': outline.get('htmlUrl') or outline.get('htmlurl'),
+                        'category': category
+                    })
+            else:
+                # Pasta: continuar nos filhos
+                walk(outline, title or category)
+
+    walk(body, None)
+    return feeds
@@ -0,0 +1,280 @@
+"""
+Camada de resiliência HTTP compartilhada pelos scrapers
+Retentativas com backoff exponencial e circuit breaker por domínio
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from utils.config import Config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Status HTTP considerados transitórios (vale a pena tentar novamente)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class CircuitOpenError(requests.RequestException):
+    """Requisição bloqueada porque o circuito do domínio está aberto"""
+
+class CircuitBreaker:
+    """Circuit breaker de um único domínio"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, domain: str, failure_threshold: int, cooldown: float):
+        """
+        Inicializar o circuit breaker
+
+        Args:
+            domain: Domínio protegido
+            failure_threshold: Falhas consecutivas para abrir o circuito
+            cooldown: Segundos com o circuito aberto antes de testar novamente
+        """
+        self.domain = domain
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.total_successes = 0
+        self.rejected_requests = 0
+        self.opened_at: Optional[float] = None
+        self.last_failure_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Verificar se uma requisição pode ser feita para o domínio"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    self.rejected_requests += 1
+                    return False
+                # Cool-down expirado: liberar uma requisição de teste
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            # HALF_OPEN: apenas uma requisição de teste por vez
+            if self._probe_in_flight:
+                self.rejected_requests += 1
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        """Registrar requisição bem-sucedida"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"🟢 Circuito fechado para {self.domain}")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.total_successes += 1
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Registrar falha (timeout, erro de conexão ou 5xx)"""
+        with self._lock:
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            self.last_failure_at = time.monotonic()
+            self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"🔴 Circuito aberto para {self.domain} "
+                        f"({self.consecutive_failures} falhas consecutivas, cool-down de {self.cooldown:.0f}s)"
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """Liberar a requisição de teste sem registrar sucesso ou falha"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def is_open(self) -> bool:
+        """Verificar se o circuito está aberto e ainda em cool-down"""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - self.opened_at < self.cooldown
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Estado do circuito em formato serializável"""
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+            return {
+                'domain': self.domain,
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'total_failures': self.total_failures,
+                'total_successes': self.total_successes,
+                'rejected_requests': self.rejected_requests,
+                'retry_in_seconds': round(retry_in, 1) if retry_in is not None else None
+            }
+
+class CircuitBreakerRegistry:
+    """Registro de circuit breakers por domínio, compartilhado entre scrapers"""
+
+    def __init__(self):
+        """Inicializar o registro"""
+        self.config = Config()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, domain: str) -> CircuitBreaker:
+        """Obter (ou criar) o circuit breaker de um domínio"""
+        domain = domain.lower()
+        with self._lock:
+            breaker = self._breakers.get(domain)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    domain,
+                    failure_threshold=self.config.get_circuit_failure_threshold(),
+                    cooldown=self.config.get_circuit_cooldown()
+                )
+                self._breakers[domain] = breaker
+            return breaker
+
+    def is_open(self, url: str) -> bool:
+        """Verificar se o circuito do domínio da URL está aberto"""
+        domain = urlparse(url).netloc.lower()
+        with self._lock:
+            breaker = self._breakers.get(domain)
+        return breaker.is_open() if breaker else False
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Estado de todos os circuitos conhecidos"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.to_dict() for breaker in breakers]
+
+    def reset(self, domain: Optional[str] = None):
+        """Reiniciar um circuito específico ou todos"""
+        with self._lock:
+            if domain:
+                self._breakers.pop(domain.lower(), None)
+            else:
+                self._breakers.clear()
+
+# Registro global de circuitos (um por processo)
+circuit_breakers = CircuitBreakerRegistry()
+
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Backoff exponencial com full jitter"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def _retry_after_delay(response: requests.Response) -> Optional[float]:
+    """
+    Ler o header Retry-After (segundos ou data HTTP)
+
+    Returns:
+        Segundos de espera ou None se ausente/inválido
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def request_with_retry(session: requests.Session, method: str, url: str,
+                       max_retries: Optional[int] = None, **kwargs) -> requests.Response:
+    """
+    Fazer requisição HTTP com retentativas e circuit breaker por domínio
+
+    Erros de conexão, timeouts e status transitórios (429/5xx) são tentados
+    novamente com backoff exponencial; o header Retry-After é respeitado.
+
+    Args:
+        session: Sessão requests usada na requisição
+        method: Método HTTP
+        url: URL de destino
+        max_retries: Número de retentativas (default: MAX_RETRIES)
+        **kwargs: Argumentos repassados para session.request
+
+    Returns:
+        Resposta da última tentativa
+
+    Raises:
+        CircuitOpenError: Se o circuito do domínio estiver aberto
+        requests.RequestException: Se todas as tentativas falharem
+    """
+    config = Config()
+    if max_retries is None:
+        max_retries = config.get_max_retries()
+    backoff_base = config.get_retry_backoff_base()
+    backoff_max = config.get_retry_backoff_max()
+
+    domain = urlparse(url).netloc.lower()
+    breaker = circuit_breakers.get(domain)
+
+    attempt = 0
+    while True:
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuito aberto para {domain}, requisição ignorada: {url}")
+
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            breaker.record_failure()
+            if attempt >= max_retries or breaker.is_open():
+                raise
+            delay = _backoff_delay(attempt, backoff_base, backoff_max)
+            logger.warning(f"🔁 Falha em {url} ({e.__class__.__name__}), nova tentativa em {delay:.1f}s")
+        except Exception:
+            # Erros não transitórios (URL inválida, etc.) não afetam o circuito
+            breaker.release()
+            raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                breaker.record_success()
+                return response
+
+            # 429 indica host ativo limitando taxa: não conta para o circuito
+            if response.status_code == 429:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+            if attempt >= max_retries or breaker.is_open():
+                return response
+
+            delay = _retry_after_delay(response)
+            if delay is None:
+                delay = _backoff_delay(attempt, backoff_base, backoff_max)
+            elif delay > backoff_max:
+                logger.warning(f"⚠️  Retry-After de {delay:.0f}s excede o limite para {url}")
+                return response
+
+            response.close()
+            logger.warning(f"🔁 HTTP {response.status_code} em {url}, nova tentativa em {delay:.1f}s")
+
+        time.sleep(delay)
+        attempt += 1
@@ -0,0 +1,208 @@
+"""
+Cache de robots.txt por host e ritmo de requisições por domínio
+Respeita Disallow e Crawl-delay declarados por cada site
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from utils.config import Config
+from utils.logger import setup_logger
+from utils.resilience import request_with_retry
+from utils.sessions import session_provider
+
+logger = setup_logger()
+
+def _origin(url: str) -> Optional[str]:
+    """Obter esquema + host de uma URL (chave do cache)"""
+    parsed = urlparse(url)
+    if not parsed.scheme or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+class RobotsCache:
+    """Cache de robots.txt por host com TTL"""
+
+    def __init__(self):
+        """Inicializar o cache"""
+        self.config = Config()
+        self._entries: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+
+    def _fetch(self, origin: str) -> Tuple[RobotFileParser, float]:
+        """
+        Baixar e parsear o robots.txt de um host
+
+        Segue a RFC 9309: 4xx libera tudo, 5xx ou falha de rede bloqueia
+        temporariamente (cache com TTL curto).
+
+        Returns:
+            Parser e instante de expiração
+        """
+        parser = RobotFileParser(origin + '/robots.txt')
+        now = time.monotonic()
+
+        try:
+            response = request_with_retry(
+                session_provider.get_session(), 'GET', origin + '/robots.txt',
+                max_retries=1,
+                timeout=self.config.get_timeout()
+            )
+        except requests.RequestException as e:
+            logger.warning(f"⚠️  robots.txt inacessível em {origin}: {e}")
+            parser.disallow_all = True
+            return parser, now + self.config.get_robots_error_ttl()
+
+        if response.status_code >= 500:
+            logger.warning(f"⚠️  robots.txt retornou {response.status_code} em {origin}")
+            parser.disallow_all = True
+            return parser, now + self.config.get_robots_error_ttl()
+
+        if response.status_code >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(response.text.splitlines())
+
+        parser.modified()
+        return parser, now + self.config.get_robots_cache_ttl()
+
+    def _get_parser(self, url: str) -> Optional[RobotFileParser]:
+        """Obter o parser do host da URL, baixando se necessário"""
+        origin = _origin(url)
+        if origin is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(origin)
+            if entry and entry[1] > time.monotonic():
+                return entry[0]
+            fetch_lock = self._fetch_locks.setdefault(origin, threading.Lock())
+
+        # Apenas uma thread baixa o robots.txt de cada host
+        with fetch_lock:
+            with self._lock:
+                entry = self._entries.get(origin)
+                if entry and entry[1] > time.monotonic():
+                    return entry[0]
+
+            entry = self._fetch(origin)
+            with self._lock:
+                self._entries[origin] = entry
+            return entry[0]
+
+    def can_fetch(self, url: str) -> bool:
+        """
+        Verificar se o robots.txt permite acessar a URL
+
+        Args:
+            url: URL a verificar
+
+        Returns:
+            True se permitido (ou se a verificação estiver desativada)
+        """
+        if not self.config.is_robots_enabled():
+            return True
+
+        parser = self._get_parser(url)
+        if parser is None:
+            return True
+
+        allowed = parser.can_fetch(self.config.get_robots_user_agent(), url)
+        if not allowed:
+            logger.debug(f"🚫 Bloqueado pelo robots.txt: {url}")
+        return allowed
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """
+        Obter o Crawl-delay (ou Request-rate) declarado para o host
+
+        Returns:
+            Segundos entre requisições ou None se não declarado
+        """
+        if not self.config.is_robots_enabled():
+            return None
+
+        parser = self._get_parser(url)
+        if parser is None:
+            return None
+
+        user_agent = self.config.get_robots_user_agent()
+        delay = parser.crawl_delay(user_agent)
+        if delay is not None:
+            return float(delay)
+
+        rate = parser.request_rate(user_agent)
+        if rate and rate.requests:
+            return rate.seconds / rate.requests
+
+        return None
+
+    def site_maps(self, url: str) -> List[str]:
+        """Obter as URLs de sitemap declaradas no robots.txt do host"""
+        if not self.config.is_robots_enabled():
+            return []
+
+        parser = self._get_parser(url)
+        if parser is None:
+            return []
+        return parser.site_maps() or []
+
+    def clear(self):
+        """Limpar o cache"""
+        with self._lock:
+            self._entries.clear()
+
+class HostPacer:
+    """Espaçamento de requisições por host usando o Crawl-delay de cada site"""
+
+    def __init__(self, robots: RobotsCache):
+        """
+        Inicializar o pacer
+
+        Args:
+            robots: Cache de robots.txt usado para obter o Crawl-delay
+        """
+        self.config = Config()
+        self.robots = robots
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get_delay(self, url: str) -> float:
+        """Intervalo entre requisições para o host da URL"""
+        delay = self.robots.crawl_delay(url)
+        if delay is None:
+            return self.config.get_request_delay()
+
+        max_delay = self.config.get_robots_max_crawl_delay()
+        if delay > max_delay:
+            logger.debug(f"⚠️  Crawl-delay de {delay}s limitado a {max_delay}s: {url}")
+            delay = max_delay
+        return delay
+
+    def wait(self, url: str):
+        """
+        Aguardar até que uma nova requisição ao host da URL seja permitida
+
+        Hosts diferentes não esperam uns pelos outros.
+        """
+        host = urlparse(url).netloc.lower()
+        delay = self.get_delay(url)
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + delay
+
+        wait_time = slot - now
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+# Instâncias globais (compartilhadas pelos scrapers)
+robots_cache = RobotsCache()
+host_pacer = HostPacer(robots_cache)
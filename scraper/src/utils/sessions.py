@@ -0,0 +1,245 @@
+"""
+Provedor de sessões HTTP para os scrapers
+Sessões requests por thread com pools de conexão dimensionados por host
+"""
+
+import threading
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+from utils.config import Config
+from utils.dns_cache import CachedDNSHTTPConnection, CachedDNSHTTPSConnection
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+class HTTPPoolStats:
+    """Contadores de requisições e conexões abertas, por host"""
+
+    def __init__(self):
+        """Inicializar contadores"""
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, int]] = {}
+        self.sessions_created = 0
+        self.sessions_recycled = 0
+
+    def _host(self, host: str) -> Dict[str, int]:
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = {'requests': 0, 'connections': 0}
+            self._hosts[host] = entry
+        return entry
+
+    def record_request(self, host: str):
+        """Registrar uma requisição enviada"""
+        with self._lock:
+            self._host(host)['requests'] += 1
+
+    def record_connection(self, host: str):
+        """Registrar uma nova conexão TCP aberta"""
+        with self._lock:
+            self._host(host)['connections'] += 1
+
+    def record_session(self, recycled: bool = False):
+        """Registrar criação (ou reciclagem) de uma sessão"""
+        with self._lock:
+            self.sessions_created += 1
+            if recycled:
+                self.sessions_recycled += 1
+
+    @staticmethod
+    def _reuse_ratio(requests_count: int, connections: int) -> Optional[float]:
+        if not requests_count:
+            return None
+        return round(max(0.0, 1 - connections / requests_count), 4)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estatísticas agregadas e por host"""
+        with self._lock:
+            hosts = {host: dict(entry) for host, entry in self._hosts.items()}
+            sessions_created = self.sessions_created
+            sessions_recycled = self.sessions_recycled
+
+        total_requests = sum(entry['requests'] for entry in hosts.values())
+        total_connections = sum(entry['connections'] for entry in hosts.values())
+        for entry in hosts.values():
+            entry['reuse_ratio'] = self._reuse_ratio(entry['requests'], entry['connections'])
+
+        return {
+            'requests': total_requests,
+            'connections': total_connections,
+            'reuse_ratio': self._reuse_ratio(total_requests, total_connections),
+            'sessions_created': sessions_created,
+            'sessions_recycled': sessions_recycled,
+            'hosts': hosts
+        }
+
+# Estatísticas globais (um conjunto por processo)
+http_stats = HTTPPoolStats()
+
+class CountingConnectionMixin:
+    """
+    Contabiliza cada connect TCP real
+
+    Fica na conexão, não no pool: quando o servidor fecha a conexão, o
+    urllib3 reconecta reaproveitando o mesmo objeto, sem passar pelo pool.
+    """
+
+    def _new_conn(self):
+        sock = super()._new_conn()
+        http_stats.record_connection(self.host)
+        return sock
+
+class CountingHTTPConnection(CountingConnectionMixin, CachedDNSHTTPConnection):
+    """Conexão HTTP contabilizada, com cache de DNS"""
+
+class CountingHTTPSConnection(CountingConnectionMixin, CachedDNSHTTPSConnection):
+    """Conexão HTTPS contabilizada, com cache de DNS"""
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    """Pool HTTP de conexões contabilizadas e com cache de DNS"""
+
+    ConnectionCls = CountingHTTPConnection
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """Pool HTTPS de conexões contabilizadas e com cache de DNS"""
+
+    ConnectionCls = CountingHTTPSConnection
+
+class SizedPoolManager(PoolManager):
+    """PoolManager com tamanho de pool configurável por host"""
+
+    def __init__(self, host_pool_sizes: Dict[str, int], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.host_pool_sizes = host_pool_sizes
+        self.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        if request_context is None:
+            request_context = self.connection_pool_kw.copy()
+        size = self.host_pool_sizes.get(host)
+        if size:
+            request_context['maxsize'] = size
+        return super()._new_pool(scheme, host, port, request_context)
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """Adapter com pools por host e contagem de requisições"""
+
+    def __init__(self, host_pool_sizes: Optional[Dict[str, int]] = None, **kwargs):
+        # init_poolmanager é chamado dentro do __init__ do HTTPAdapter
+        self.host_pool_sizes = host_pool_sizes or {}
+        self.requests_sent = 0
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = SizedPoolManager(
+            self.host_pool_sizes,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs
+        )
+
+    def send(self, request, **kwargs):
+        self.requests_sent += 1
+        http_stats.record_request(urlparse(request.url).hostname or '')
+        return super().send(request, **kwargs)
+
+class _ThreadSession:
+    """Sessão de uma thread e seus metadados de uso"""
+
+    def __init__(self, session: requests.Session, adapter: PooledHTTPAdapter):
+        self.session = session
+        self.adapter = adapter
+        self.last_used = time.monotonic()
+
+class SessionProvider:
+    """Fornece uma sessão requests por thread, com keep-alive limitado"""
+
+    def __init__(self):
+        """Inicializar o provedor"""
+        self.config = Config()
+        self._local = threading.local()
+
+    def _create_session(self) -> _ThreadSession:
+        """Criar sessão com adapter de pools dimensionados"""
+        adapter = PooledHTTPAdapter(
+            host_pool_sizes=self.config.get_http_pool_host_sizes(),
+            pool_connections=self.config.get_http_pool_connections(),
+            pool_maxsize=self.config.get_http_pool_maxsize(),
+            pool_block=self.config.get_http_pool_block()
+        )
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'User-Agent': self.config.get_user_agent()
+        })
+        return _ThreadSession(session, adapter)
+
+    def _is_expired(self, state: _ThreadSession, now: float) -> bool:
+        """Sessão ociosa demais (conexões provavelmente fechadas pelo servidor) ou muito usada"""
+        if now - state.last_used > self.config.get_http_session_max_idle():
+            return True
+        return state.adapter.requests_sent >= self.config.get_http_session_max_requests()
+
+    def get_session(self) -> requests.Session:
+        """
+        Obter a sessão da thread atual
+
+        Returns:
+            Sessão requests exclusiva da thread
+        """
+        state: Optional[_ThreadSession] = getattr(self._local, 'state', None)
+        now = time.monotonic()
+
+        if state is not None and self._is_expired(state, now):
+            state.session.close()
+            state = None
+            recycled = True
+        else:
+            recycled = False
+
+        if state is None:
+            state = self._create_session()
+            self._local.state = state
+            http_stats.record_session(recycled=recycled)
+
+        state.last_used = now
+        return state.session
+
+    def close(self):
+        """Fechar a sessão da thread atual"""
+        state = getattr(self._local, 'state', None)
+        if state is not None:
+            state.session.close()
+            self._local.state = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas de conexões e configuração dos pools"""
+        stats = http_stats.snapshot()
+        stats['config'] = {
+            'pool_connections': self.config.get_http_pool_connections(),
+            'pool_maxsize': self.config.get_http_pool_maxsize(),
+            'pool_block': self.config.get_http_pool_block(),
+            'host_pool_sizes': self.config.get_http_pool_host_sizes(),
+            'session_max_idle': self.config.get_http_session_max_idle(),
+            'session_max_requests': self.config.get_http_session_max_requests()
+        }
+        return stats
+
+# Provedor global de sessões (compartilhado pelos scrapers)
+session_provider = SessionProvider()
@@ -0,0 +1,90 @@
+"""
+Parser incremental de sitemaps (sitemaps.org, índices de sitemap e Google News)
+Lê o XML em streaming com iterparse, liberando cada <url> depois de processado
+"""
+
+import gzip
+import io
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO, Iterator, Optional
+from xml.etree import ElementTree as ET
+
+from utils.dates import parse_date
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+@dataclass
+class SitemapEntry:
+    """Entrada de um sitemap: URL de página ou de sitemap filho (índice)"""
+    loc: str
+    lastmod: Optional[datetime] = None
+    is_sitemap: bool = False
+
+def _local_name(tag: str) -> str:
+    """Nome da tag sem o namespace ('{ns}url' -> 'url')"""
+    return tag.rsplit('}', 1)[-1]
+
+def open_sitemap_stream(stream: BinaryIO) -> BinaryIO:
+    """
+    Preparar o corpo de um sitemap para leitura, descompactando .xml.gz
+
+    A detecção é pelos bytes mágicos: servidores servem .xml.gz tanto como
+    arquivo gzip quanto com Content-Encoding (já descompactado pelo requests).
+    """
+    buffered = stream if isinstance(stream, io.BufferedReader) else io.BufferedReader(stream)
+    if buffered.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=buffered)
+    return buffered
+
+def iter_sitemap(stream: BinaryIO) -> Iterator[SitemapEntry]:
+    """
+    Iterar as entradas de um sitemap ou índice de sitemaps
+
+    Args:
+        stream: Corpo do sitemap (arquivo, resposta HTTP em streaming ou gzip)
+
+    Returns:
+        Iterador de SitemapEntry; lastmod usa <lastmod> ou, em sitemaps de
+        notícias, <news:publication_date> (o mais recente dos dois)
+
+    Raises:
+        xml.etree.ElementTree.ParseError: Se o XML for inválido
+    """
+    root = None
+    for event, elem in ET.iterparse(open_sitemap_stream(stream), events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            continue
+
+        name = _local_name(elem.tag)
+        if name not in ('url', 'sitemap'):
+            continue
+
+        loc = None
+        dates = []
+        # Só filhos diretos: <image:image> e <video:video> também têm <loc>
+        for child in elem:
+            child_name = _local_name(child.tag)
+            if child_name == 'loc' and child.text:
+                loc = child.text.strip()
+            elif child_name == 'lastmod':
+                dates.append(child.text)
+            elif child_name == 'news':
+                dates.extend(
+                    item.text for item in child if _local_name(item.tag) == 'publication_date'
+                )
+        dates = [parsed for parsed in (parse_date(d.strip()) for d in dates if d) if parsed]
+
+        if loc:
+            yield SitemapEntry(
+                loc=loc,
+                lastmod=max(dates, key=lambda d: d.timestamp()) if dates else None,
+                is_sitemap=name == 'sitemap'
+            )
+
+        # Liberar a entrada já processada (e a referência que a raiz mantém)
+        elem.clear()
+        if root is not None:
+            root.clear()
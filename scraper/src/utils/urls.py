@@ -0,0 +1,42 @@
+"""
+Normalização de URLs e IDs determinísticos de conteúdos
+O mesmo artigo gera o mesmo ID em qualquer processo (hash() do Python muda a cada execução)
+"""
+
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Parâmetros de rastreamento: não mudam o artigo
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', 'ref_src'}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizar a URL de um artigo para comparação
+
+    Esquema e host em minúsculas, sem porta padrão, sem fragmento, sem
+    parâmetros de rastreamento (utm_*, fbclid...), demais parâmetros
+    ordenados e sem barra final no caminho.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+def content_id(client_id: str, url: str) -> str:
+    """ID estável de um conteúdo: hash do cliente e da URL normalizada"""
+    digest = hashlib.sha256(f"{client_id}\n{normalize_url(url)}".encode('utf-8')).hexdigest()
+    return f"content_{digest[:32]}"
+
+def body_hash(text: str) -> str:
+    """Hash do texto de um conteúdo (chave do armazenamento de corpos)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()